@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import data_manager as dm
 import visualization as viz
+from shop_analysis import ShopAnalysis
 
 # 페이지 설정
 st.set_page_config(page_title="Naver API Insight Dashboard", layout="wide", initial_sidebar_state="expanded")
@@ -20,6 +21,7 @@ st.sidebar.info("네이버 API 데이터를 활용한 실시간 분석 대시보
 trend_df = dm.load_trend_data(selected_keywords)
 shop_df = dm.load_shopping_data(main_keyword)
 blog_df = dm.load_blog_data(main_keyword)
+shop = ShopAnalysis(shop_df)
 
 # 메인 타이틀
 st.title("📊 Naver API 데이터 통찰 대시보드")
@@ -59,12 +61,12 @@ with tab2:
         col_left, col_right = st.columns(2)
         
         with col_left:
-            st.plotly_chart(viz.plot_price_distribution(shop_df, main_keyword), use_container_width=True)
-            st.plotly_chart(viz.plot_category_share(shop_df, main_keyword), use_container_width=True)
+            st.plotly_chart(viz.plot_price_distribution(shop, main_keyword), use_container_width=True)
+            st.plotly_chart(viz.plot_category_share(shop, main_keyword), use_container_width=True)
             
         with col_right:
-            st.plotly_chart(viz.plot_brand_share(shop_df, main_keyword), use_container_width=True)
-            st.plotly_chart(viz.plot_brand_price_box(shop_df, main_keyword), use_container_width=True)
+            st.plotly_chart(viz.plot_brand_share(shop, main_keyword), use_container_width=True)
+            st.plotly_chart(viz.plot_brand_price_box(shop, main_keyword), use_container_width=True)
 
         st.markdown("---")
         
@@ -75,18 +77,18 @@ with tab2:
         
         with t_col1:
             st.markdown("#### 최저가 상품 TOP 10 (Table 2/5)")
-            top_cheap = shop_df.sort_values('lprice').head(10)[['title', 'lprice', 'mallName']]
+            top_cheap = shop.cheapest[['title', 'lprice', 'mallName']].copy()
             top_cheap.columns = ['상품명', '최저가', '판매처']
             st.dataframe(top_cheap, use_container_width=True, hide_index=True)
 
             st.markdown("#### 브랜드 점유율 순위 (Table 4/5)")
-            brand_rank = shop_df['brand'].value_counts().reset_index()
+            brand_rank = shop.brand_counts.reset_index()
             brand_rank.columns = ['브랜드', '노출 빈도']
             st.dataframe(brand_rank.head(10), use_container_width=True, hide_index=True)
 
         with t_col2:
             st.markdown("#### 카테고리별 상품 수 및 평균가 (Table 5/5)")
-            cat_stats = shop_df.groupby('category3')['lprice'].agg(['count', 'mean']).reset_index()
+            cat_stats = shop.category_price_stats[['count', 'mean']].reset_index()
             cat_stats.columns = ['카테고리', '상품 수', '평균 가격']
             st.dataframe(cat_stats.sort_values('count', ascending=False), use_container_width=True, hide_index=True)
     else:
@@ -96,9 +98,8 @@ with tab2:
 with tab3:
     if not blog_df.empty:
         st.subheader(f"[{main_keyword}] 최신 블로그 리뷰 리스트 (Table 3/5)")
-        # HTML 태그 제거 및 데이터 정리
+        # HTML 태그/엔티티는 수집 시점(preprocess)에 이미 정리됨
         display_blog = blog_df[['title', 'description', 'postdate', 'bloggername', 'link']].copy()
-        display_blog['title'] = display_blog['title'].str.replace('<b>', '').str.replace('</b>', '')
         display_blog.columns = ['제목', '내용 요약', '작성일', '블로거', '링크']
         st.dataframe(display_blog.head(20), use_container_width=True, hide_index=True)
         
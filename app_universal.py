@@ -1,9 +1,21 @@
+import os
+import time
+import contextvars
 import streamlit as st
 import pandas as pd
 import data_manager_universal as dmu
 import visualization as viz
+import preprocess
+import instrumentation
+import prewarm
+import blog_index
+import quota
+from shop_analysis import ShopAnalysis
+from trend_analysis import TrendAnalysis
+from market_comparison import MarketComparison, combine
 import plotly.express as px
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # ==========================================
 # 1. 페이지 초기 설정 (Premium UI)
@@ -81,7 +93,118 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==========================================
-# 2. 사이드바 (필터 및 설정)
+# 2. 데이터 로드 / 캐시 함수 (사이드바 새로고침에서 캐시를 비우므로 먼저 정의)
+# ==========================================
+@st.cache_resource
+def dashboard_executor():
+    """모든 세션이 공유하는 대시보드 로드용 스레드 풀 (동시 로드 작업 수 상한)"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="dashboard-load")
+
+def load_all_dashboard_data(kws, start, end, depth=100):
+    """
+    트렌드/쇼핑/블로그 로드를 동시에 시작하고 작업(Future)을 세션에 보관
+    같은 조건의 재실행(탭 전환, 위젯 조작)은 진행 중이거나 끝난 작업을 그대로 재사용
+    제출 후 dmu.FETCH_TTL이 지나면 세션을 열어둔 채여도 새 데이터를 받도록 다시 제출
+    """
+    signature = (tuple(kws), start, end, depth)
+    loads = st.session_state.get("dashboard_loads")
+    if (loads is None or loads["signature"] != signature
+            or time.monotonic() - loads["submitted"] >= dmu.FETCH_TTL):
+        executor = dashboard_executor()
+
+        def submit(fn, *args):
+            # 작업 스레드의 API/로드 측정도 이번 실행 기록에 합산되도록 컨텍스트 복사
+            return executor.submit(contextvars.copy_context().run, fn, *args)
+
+        main_kw = kws[0]
+        loads = {
+            "signature": signature,
+            "submitted": time.monotonic(),
+            # 트렌드 데이터 (3개 키워드 단위 배치 호출, 앵커 기준 비율 환산)
+            "trend": submit(dmu.fetch_shopping_trends, tuple(kws),
+                            start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")),
+            # 상세 데이터 (첫 번째 키워드 중심)
+            "shop": submit(dmu.fetch_shopping_search, main_kw, depth),
+            "blog": submit(dmu.fetch_blog_search, main_kw, depth),
+        }
+        if len(kws) > 1:
+            # 멀티 키워드 비교: 나머지 키워드의 쇼핑/블로그도 키워드별 작업으로 동시에 수집
+            loads["shop_all"] = {kw: loads["shop"] if kw == main_kw else submit(dmu.fetch_shopping_search, kw, depth)
+                                 for kw in kws}
+            loads["blog_all"] = {kw: loads["blog"] if kw == main_kw else submit(dmu.fetch_blog_search, kw, depth)
+                                 for kw in kws}
+        st.session_state["dashboard_loads"] = loads
+    return loads
+
+DATA_LABELS = {"trend": "쇼핑 트렌드", "shop": "쇼핑 검색", "blog": "블로그 검색"}
+
+def dashboard_data(name):
+    """
+    해당 데이터의 로드만 기다려 반환 (다른 데이터는 계속 로드)
+    작업 스레드에는 Streamlit 실행 컨텍스트가 없으므로 오류 표시는 여기(메인 스크립트 스레드)에서 수행
+    실패 시 빈 데이터프레임 반환 (새로고침 시 다시 요청)
+    """
+    future = st.session_state["dashboard_loads"][name]
+    if not future.done():
+        with st.spinner("네이버 빅데이터 분석 중..."):
+            wait([future])
+    try:
+        return future.result()
+    except Exception as e:
+        st.error(f"{DATA_LABELS[name]} API 오류: {e}")
+        return pd.DataFrame()
+
+@st.cache_resource(max_entries=8)
+def get_shop_analysis(df):
+    """데이터셋별 분석 객체를 재실행 간에 유지해 파생 집계를 한 번만 계산"""
+    return ShopAnalysis(df)
+
+@st.cache_resource(max_entries=4, ttl=dmu.FETCH_TTL)
+def get_market_comparison(signature, loaded, _shop_frames, _blog_frames):
+    """
+    키워드별 수집 결과를 keyword 컬럼이 붙은 하나의 비교 객체로 병합 (조회 조건별로 재실행 간 유지)
+    loaded(데이터별 수집 성공 키워드)도 키에 포함해 일부 키워드가 빠진 결과를 다른 세션에 재사용하지 않음
+    """
+    return MarketComparison(combine(_shop_frames, "shop_products"), combine(_blog_frames, "blog_posts"))
+
+def dashboard_market():
+    """
+    모든 키워드의 쇼핑/블로그 로드를 기다려 비교 객체 반환
+    오류가 났거나 결과가 비어 있는 키워드는 실패로 보고 경고와 함께 해당 데이터(쇼핑/블로그)에서 제외
+    """
+    loads = st.session_state["dashboard_loads"]
+    futures = {(kind, kw): future for kind in ("shop_all", "blog_all") for kw, future in loads[kind].items()}
+    with st.spinner("키워드별 시장 데이터 수집 중..."):
+        wait(futures.values())
+    frames = {"shop_all": {}, "blog_all": {}}
+    failed = set()
+    for (kind, kw), future in futures.items():
+        try:
+            df = future.result()
+        except Exception:
+            df = None
+        if df is None or df.empty:
+            failed.add(kw)
+        else:
+            frames[kind][kw] = df
+    if failed:
+        st.warning(f"일부 키워드 수집 실패 (오류 또는 결과 없음): {', '.join(sorted(failed))}")
+    loaded = tuple((kind, tuple(sorted(dfs))) for kind, dfs in frames.items())
+    return get_market_comparison(loads["signature"], loaded, frames["shop_all"], frames["blog_all"])
+
+@st.cache_resource(max_entries=8)
+def get_trend_analysis(df):
+    """키워드 전체를 한 행렬로 계산하는 트렌드 지표를 재실행 간에 유지"""
+    return TrendAnalysis(df)
+
+@st.cache_resource
+def start_prewarm_scheduler():
+    """인기 키워드 사전 갱신 스레드를 서버 프로세스당 한 번만 시작 (NAVER_PREWARM=0이면 비활성)"""
+    if os.getenv("NAVER_PREWARM", "1") == "1":
+        return prewarm.start_scheduler()
+
+# ==========================================
+# 3. 사이드바 (필터 및 설정)
 # ==========================================
 with st.sidebar:
     st.image("https://img.icons8.com/fluency/96/artificial-intelligence.png", width=80)
@@ -105,16 +228,37 @@ with st.sidebar:
     d_col1, d_col2 = st.columns(2)
     start_date = d_col1.date_input("시작일", datetime(2025, 1, 1))
     end_date = d_col2.date_input("종료일", datetime(2025, 12, 31))
+
+    # 수집 깊이: 높을수록 표본이 정확해지지만 로딩 시간이 늘어남
+    search_depth = st.select_slider("검색 수집 깊이 (상품/블로그 건수)",
+                                    options=[100, 200, 300, 500, 1000], value=100)
     
     st.markdown("---")
     if st.button("🚀 데이터 새로고침", use_container_width=True):
+        # 디스크 캐시는 현재 분석 키워드만 무효화하고, 메모리 캐시는 비워 다시 읽도록 함
+        dmu.invalidate_cache(keywords)
         st.cache_data.clear()
+        st.session_state.pop("dashboard_loads", None)
+        get_market_comparison.clear()
         st.rerun()
 
+    debug_mode = st.checkbox("🛠 성능 디버그 패널", value=instrumentation.is_enabled())
+    # 측정 활성 여부는 이 세션의 실행에만 적용 (다른 세션/사전 갱신 스레드는 영향 없음)
+    metrics_run = instrumentation.start_run(enabled=debug_mode)
+
+    st.markdown("---")
+    st.subheader("📊 오늘 API 잔여 한도")
+    # 배치 수집기는 대시보드 예약분을 쓰지 않으므로 잔여량 전부가 대시보드 조회에 사용 가능
+    quota_usage = quota.usage()
+    for endpoint, label in (("search", "검색 API"), ("datalab", "데이터랩")):
+        info = quota_usage[endpoint]
+        st.progress(info["remaining"] / info["limit"] if info["limit"] else 0.0,
+                    text=f"{label} {info['remaining']:,} / {info['limit']:,} (배치 {info['batch']:,}회 사용)")
+
     st.sidebar.caption("© 2026 Antigravity AI")
 
 # ==========================================
-# 3. 데이터 로드 로직
+# 4. 데이터 로드 로직
 # ==========================================
 if not keywords:
     st.warning("분석할 키워드를 입력해주세요.")
@@ -125,29 +269,21 @@ if not dmu.CLIENT_ID or not dmu.CLIENT_SECRET:
     st.error("API 키가 설정되지 않았습니다. .env 파일 또는 Streamlit Secrets를 확인하세요.")
     st.stop()
 
-@st.cache_data(ttl=3600)
-def load_all_dashboard_data(kws, start, end):
-    with st.spinner("네이버 빅데이터 분석 중..."):
-        # 트렌드 데이터
-        trends = []
-        for k in kws:
-            df_t = dmu.fetch_shopping_trend(k, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
-            if not df_t.empty:
-                trends.append(df_t)
-        
-        trend_df = pd.concat(trends, ignore_index=True) if trends else pd.DataFrame()
-        
-        # 상세 데이터 (첫 번째 키워드 중심)
-        main_kw = kws[0]
-        shop_df = dmu.fetch_shopping_search(main_kw)
-        blog_df = dmu.fetch_blog_search(main_kw)
-        
-        return trend_df, shop_df, blog_df
+start_prewarm_scheduler()
+load_all_dashboard_data(keywords, start_date, end_date, search_depth)
 
-trend_df, shop_df, blog_df = load_all_dashboard_data(keywords, start_date, end_date)
+# 세션당 조합별 1회만 조회 빈도로 기록 (위젯 조작으로 인한 재실행은 제외)
+request_sig = (tuple(keywords), start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), search_depth)
+recorded = st.session_state.setdefault("prewarm_recorded", set())
+if request_sig not in recorded:
+    prewarm.record_request(*request_sig)
+    recorded.add(request_sig)
+# 트렌드가 도착하면 바로 헤더/트렌드 탭을 그리고, 쇼핑/블로그는 해당 탭에서 필요할 때 기다림
+trend_df = dashboard_data("trend")
+trend = get_trend_analysis(trend_df)
 
 # ==========================================
-# 4. 메인 대시보드 화면
+# 5. 메인 대시보드 화면
 # ==========================================
 main_kw = keywords[0]
 
@@ -160,30 +296,37 @@ with header_col1:
 # 핵심 지표 (Metrics)
 m_cols = st.columns(len(keywords) if len(keywords) <= 4 else 4)
 if not trend_df.empty:
+    latest = trend.latest
     for i, kw in enumerate(keywords[:4]):
-        k_data = trend_df[trend_df['keyword'] == kw]
-        if not k_data.empty:
-            current_val = k_data.iloc[-1]['ratio']
-            prev_val = k_data.iloc[-2]['ratio'] if len(k_data) > 1 else current_val
-            delta = current_val - prev_val
-            m_cols[i].metric(label=f"{kw} 지수", value=f"{current_val:.1f}", delta=f"{delta:.2f}")
-
-# 탭 메뉴 구성
-tab_trend, tab_shop, tab_social, tab_eda = st.tabs([
-    "📈 트렌드 분석", 
-    "🛒 마켓 & 가격", 
-    "💬 소셜 보이스",
-    "🔬 심층 EDA & 인사이트"
-])
+        if kw in latest.index:
+            m_cols[i].metric(label=f"{kw} 지수", value=f"{latest.at[kw, 'current']:.1f}",
+                             delta=f"{latest.at[kw, 'delta']:.2f}")
+
+def cached_figure(analysis, plot, *args):
+    """차트를 데이터셋별 분석 객체에 보관해 탭을 다시 열 때 재생성하지 않음"""
+    return analysis.memo((plot.__name__,) + args, lambda: plot(analysis, *args))
 
+# 각 탭은 프래그먼트로 분리: 탭 내부 위젯 조작 시 해당 탭만 다시 실행
 # --- [TAB 1: 트렌드 분석] ---
-with tab_trend:
+@st.fragment
+def render_trend_tab():
     st.markdown('<div class="premium-card">', unsafe_allow_html=True)
     st.subheader("연간 검색 트렌드 타임라인")
     if not trend_df.empty:
-        fig_trend = viz.plot_trend_comparison(trend_df)
+        # 확대 구간을 좁히면 서버에서 해당 구간만 다시 샘플링하므로 원본 해상도로 표시됨
+        period_min, period_max = trend_df['period'].min().to_pydatetime(), trend_df['period'].max().to_pydatetime()
+        zoom = (period_min, period_max)
+        if period_min < period_max:
+            zoom = st.slider("확대 구간", min_value=period_min, max_value=period_max,
+                             value=(period_min, period_max), format="YYYY-MM-DD")
+        zoomed = trend_df[trend_df['period'].between(*zoom)]
+        raw_mode = st.toggle("원본 해상도", value=False)
+        fig_trend = viz.plot_trend_comparison(zoomed, raw=raw_mode)
         fig_trend.update_layout(height=500, margin=dict(l=20, r=20, t=40, b=20))
         st.plotly_chart(fig_trend, use_container_width=True)
+        if debug_mode:
+            st.caption(f"표시 포인트 {fig_trend.layout.meta['rendered_points']:,} / 원본 "
+                       f"{fig_trend.layout.meta['raw_points']:,} · 전송량 {len(fig_trend.to_json()) / 1024:.0f}KB")
     st.markdown('</div>', unsafe_allow_html=True)
     
     col_t1, col_t2 = st.columns([1, 1.5])
@@ -191,7 +334,7 @@ with tab_trend:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("키워드 성과 요약 (Table 1/5)")
         if not trend_df.empty:
-            stats = trend_df.groupby('keyword')['ratio'].agg(['mean', 'max', 'std']).reset_index()
+            stats = trend.summary[['mean', 'max', 'std']].reset_index()
             stats.columns = ['키워드', '평균 지수', '최고 피크', '변동성(STD)']
             st.table(stats.style.background_gradient(cmap='Blues').format(precision=2))
         st.markdown('</div>', unsafe_allow_html=True)
@@ -201,33 +344,38 @@ with tab_trend:
         st.subheader("트렌드 주요 변곡점 분석")
         st.info("💡 2025년 데이터 기준, 각 키워드별 최고 검색량 시점과 평균 대비 상승폭을 분석합니다.")
         if not trend_df.empty:
-            for kw in keywords:
-                sorted_kw = trend_df[trend_df['keyword'] == kw].sort_values('ratio', ascending=False)
-                if not sorted_kw.empty:
-                    max_point = sorted_kw.iloc[0]
-                    st.write(f"- **{kw}**: `{max_point['period'].strftime('%Y-%m-%d')}`에 지수 **{max_point['ratio']:.1f}**로 정점 기록")
+            for kw, row in trend.summary.dropna(subset=['peak_period']).iterrows():
+                st.write(f"- **{kw}**: `{row['peak_period'].strftime('%Y-%m-%d')}`에 지수 **{row['max']:.1f}**로 정점 기록 "
+                         f"(평균 대비 +{row['peak_lift']:.0%}, 이상치 {row['anomalies']}건)")
+                if pd.notna(row['change_period']):
+                    st.caption(f"  `{row['change_period'].strftime('%Y-%m-%d')}` 전후 평균 수준 {row['change_shift']:+.1f}, "
+                               f"최근 주간 증감 {row['wow_delta']:+.1f}")
         st.markdown('</div>', unsafe_allow_html=True)
 
 # --- [TAB 2: 마켓 & 가격 분석] ---
-with tab_shop:
+@st.fragment
+def render_shop_tab():
+    shop_df = dashboard_data("shop")
+    shop = get_shop_analysis(shop_df)
     if not shop_df.empty:
+        st.caption(f"쇼핑 데이터 메모리: {preprocess.memory_summary(shop_df)}")
         c1, c2 = st.columns(2)
         with c1:
             st.markdown('<div class="premium-card">', unsafe_allow_html=True)
-            st.plotly_chart(viz.plot_price_distribution(shop_df, main_kw), use_container_width=True)
+            st.plotly_chart(cached_figure(shop, viz.plot_price_distribution, main_kw), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
             
             st.markdown('<div class="premium-card">', unsafe_allow_html=True)
-            st.plotly_chart(viz.plot_category_share(shop_df, main_kw), use_container_width=True)
+            st.plotly_chart(cached_figure(shop, viz.plot_category_share, main_kw), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
             
         with c2:
             st.markdown('<div class="premium-card">', unsafe_allow_html=True)
-            st.plotly_chart(viz.plot_brand_share(shop_df, main_kw), use_container_width=True)
+            st.plotly_chart(cached_figure(shop, viz.plot_brand_share, main_kw), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
             
             st.markdown('<div class="premium-card">', unsafe_allow_html=True)
-            st.plotly_chart(viz.plot_brand_price_box(shop_df, main_kw), use_container_width=True)
+            st.plotly_chart(cached_figure(shop, viz.plot_brand_price_box, main_kw), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown("---")
@@ -236,34 +384,53 @@ with tab_shop:
         
         with tc1:
             st.markdown("##### 최저가 리스트 TOP 10 (Table 2/5)")
-            cheap_df = shop_df.sort_values('lprice').head(10)[['title', 'lprice', 'mallName']]
-            cheap_df['title'] = cheap_df['title'].str.replace('<b>', '').str.replace('</b>', '')
+            cheap_df = shop.cheapest[['title', 'lprice', 'mallName']]
             st.dataframe(cheap_df, use_container_width=True, hide_index=True)
             
         with tc2:
             st.markdown("##### 주요 브랜드 노출 순위 (Table 4/5)")
-            brand_rank = shop_df['brand'].value_counts().reset_index().head(10)
+            brand_rank = shop.brand_counts.head(10).reset_index()
             brand_rank.columns = ['브랜드', '노출 수']
             st.dataframe(brand_rank, use_container_width=True, hide_index=True)
             
         with tc3:
             st.markdown("##### 카테고리별 마켓 분석 (Table 5/5)")
-            cat_table = shop_df.groupby('category3')['lprice'].agg(['count', 'mean']).reset_index()
+            cat_table = shop.category_price_stats[['count', 'mean']].reset_index()
             cat_table.columns = ['카테고리', '상품 수', '평균가']
             st.dataframe(cat_table.sort_values('상품 수', ascending=False), use_container_width=True, hide_index=True)
     else:
         st.error("쇼핑 상품 데이터를 로드할 수 없습니다.")
 
 # --- [TAB 3: 소셜 보이스] ---
-with tab_social:
+@st.fragment
+def render_social_tab():
+    blog_df = dashboard_data("blog")
     if not blog_df.empty:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader(f"최신 블로그 여론 리스트 (Table 3/5)")
-        social_df = blog_df[['title', 'description', 'bloggername', 'postdate', 'link']].copy()
-        social_df['title'] = social_df['title'].str.replace('<b>', '').str.replace('</b>', '')
-        social_df['description'] = social_df['description'].str.replace('<b>', '').str.replace('</b>', '')
+        social_df = blog_df[['title', 'description', 'bloggername', 'postdate', 'link']]
         st.dataframe(social_df.head(30), use_container_width=True, hide_index=True)
         st.markdown('</div>', unsafe_allow_html=True)
+
+        st.markdown('<div class="premium-card">', unsafe_allow_html=True)
+        st.subheader("블로그 본문 검색")
+        # 대시보드에서 불러온 게시물도 색인에 반영 (이미 색인된 링크는 건너뜀)
+        indexed = st.session_state.setdefault("blog_indexed", set())
+        if (main_kw, len(blog_df)) not in indexed:
+            blog_index.index_posts(blog_df, main_kw)
+            indexed.add((main_kw, len(blog_df)))
+        q_col, d_col = st.columns([2, 1])
+        query = q_col.text_input("검색어 (구문은 \"큰따옴표\"로 묶기)", value=main_kw)
+        date_range = d_col.date_input("게시일 범위", value=(start_date, end_date))
+        if len(date_range) == 2:
+            found, total, co_terms = blog_index.search(query, *date_range)
+            st.caption(f"수집된 전체 게시물 중 일치 {total:,}건 (최신 50건 표시)")
+            r_col, t_col = st.columns([2, 1])
+            r_col.dataframe(found[['postdate', 'title', 'bloggername', 'link']],
+                            use_container_width=True, hide_index=True)
+            t_col.dataframe(co_terms.rename(columns={'term': '함께 언급된 단어', 'posts': '게시물 수'}),
+                            use_container_width=True, hide_index=True)
+        st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("블로그 포스팅 타임라인")
@@ -276,7 +443,9 @@ with tab_social:
         st.markdown('</div>', unsafe_allow_html=True)
 
 # --- [TAB 4: 심층 EDA & 인사이트] ---
-with tab_eda:
+@st.fragment
+def render_eda_tab():
+    shop = get_shop_analysis(dashboard_data("shop"))
     st.markdown('<div class="premium-card">', unsafe_allow_html=True)
     st.title("🔬 데이터 사이언스 & 심층 분석 리포트")
     st.write("데이터 전처리 후 결측치, 상관관계, 피봇 분석을 통해 비즈니스 인사이트를 도출합니다.")
@@ -287,14 +456,14 @@ with tab_eda:
     with eda_col1:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("1. 데이터 품질 및 결측치 현황")
-        st.plotly_chart(viz.plot_missing_values(shop_df), use_container_width=True)
+        st.plotly_chart(cached_figure(shop, viz.plot_missing_values), use_container_width=True)
         st.write("**[해석]** 주요 상품 정보 중 브랜드/제조사의 결측치 비율을 확인하여 데이터 신뢰도를 평가합니다.")
         st.markdown('</div>', unsafe_allow_html=True)
         
     with eda_col2:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("2. 주요 변수 상관관계 (Heatmap)")
-        st.plotly_chart(viz.plot_correlation_heatmap(shop_df), use_container_width=True)
+        st.plotly_chart(cached_figure(shop, viz.plot_correlation_heatmap), use_container_width=True)
         st.write("**[해석]** 상품명 길이, 브랜드명 존재 유무와 가격 간의 상관계수를 분석합니다.")
         st.markdown('</div>', unsafe_allow_html=True)
         
@@ -305,12 +474,12 @@ with tab_eda:
     
     with p_col1:
         st.markdown("##### [Pivot 1] 브랜드 x 카테고리별 평균가")
-        pivot1 = shop_df.pivot_table(index='brand', columns='category3', values='lprice', aggfunc='mean').head(10).fillna(0)
+        pivot1 = shop.brand_category_price_pivot.head(10).fillna(0)
         st.dataframe(pivot1.style.background_gradient(cmap='YlGn'), use_container_width=True)
         
     with p_col2:
         st.markdown("##### [Pivot 2] 판매처 x 브랜드 상품 노출 빈도")
-        pivot2 = shop_df.pivot_table(index='mallName', columns='brand', values='productId', aggfunc='count').head(10).fillna(0)
+        pivot2 = shop.mall_brand_count_pivot.head(10).fillna(0)
         st.dataframe(pivot2.style.background_gradient(cmap='Purples'), use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -319,13 +488,13 @@ with tab_eda:
     with eda_col3:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("4. 카테고리-브랜드 밀집도 (Heatmap)")
-        st.plotly_chart(viz.plot_category_brand_heatmap(shop_df), use_container_width=True)
+        st.plotly_chart(cached_figure(shop, viz.plot_category_brand_heatmap), use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
         
     with eda_col4:
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.subheader("5. 판매처별 가격 경쟁력 분석 (Bar)")
-        st.plotly_chart(viz.plot_mall_price_bar(shop_df), use_container_width=True)
+        st.plotly_chart(cached_figure(shop, viz.plot_mall_price_bar), use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
         
     # 4. 분석 인사이트 리포트
@@ -334,7 +503,7 @@ with tab_eda:
     info_cols = st.columns(3)
     with info_cols[0]:
         st.success("**시장 세분화**")
-        st.write(f"{main_kw} 시장은 특정 브랜드가 점유율의 약 {len(shop_df['brand'].unique())/2:.0f}% 이상을 차지하는 과점적 형태를 띠고 있습니다.")
+        st.write(f"{main_kw} 시장은 특정 브랜드가 점유율의 약 {shop.brand_nunique/2:.0f}% 이상을 차지하는 과점적 형태를 띠고 있습니다.")
     with info_cols[1]:
         st.info("**가격 전략**")
         st.write("상관관계 분석 결과, 브랜드 인지도가 가격 결정의 핵심 요인이며 판매처별로 최대 20% 이상의 가격 편차가 발생합니다.")
@@ -343,6 +512,65 @@ with tab_eda:
         st.write("일부 중소 브랜드의 경우 제조사 정보 결측치가 존재하며, 이는 데이터 정제 시 주의가 필요함을 시사합니다.")
     st.markdown('</div>', unsafe_allow_html=True)
 
+# --- [TAB 5: 키워드 시장 비교 (멀티 키워드 모드)] ---
+@st.fragment
+def render_compare_tab():
+    comp = dashboard_market()
+    if comp.empty:
+        st.error("비교할 쇼핑 상품 데이터를 로드할 수 없습니다.")
+        return
+    st.markdown('<div class="premium-card">', unsafe_allow_html=True)
+    st.subheader(f"키워드별 시장 요약 ({len(comp.keywords)}개 키워드)")
+    summary = comp.summary.reset_index()
+    summary = summary.rename(columns={'keyword': '키워드', 'count': '상품 수', 'mean': '평균가', 'median': '중앙가',
+                                      'brands': '브랜드 수', 'top_brand': '1위 브랜드',
+                                      'top_brand_share': '1위 점유율', 'malls': '판매처 수',
+                                      'blog_posts': '블로그 게시물'})
+    st.dataframe(summary.style.format({'평균가': '{:,.0f}', '중앙가': '{:,.0f}', '1위 점유율': '{:.1%}'}),
+                 use_container_width=True, hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    cc1, cc2 = st.columns(2)
+    with cc1:
+        st.plotly_chart(cached_figure(comp, viz.plot_market_price_box), use_container_width=True)
+        st.plotly_chart(cached_figure(comp, viz.plot_market_price_histogram), use_container_width=True)
+        st.plotly_chart(cached_figure(comp, viz.plot_market_mall_heatmap), use_container_width=True)
+    with cc2:
+        st.plotly_chart(cached_figure(comp, viz.plot_market_brand_share), use_container_width=True)
+        st.plotly_chart(cached_figure(comp, viz.plot_market_category_bar), use_container_width=True)
+        blog_fig = cached_figure(comp, viz.plot_market_blog_timeline)
+        if blog_fig is not None:
+            st.plotly_chart(blog_fig, use_container_width=True)
+
+# 탭 메뉴 구성: 선택된 탭만 계산/렌더링 (탭 전환 시 재실행)
+tab_renders = [
+    ("📈 트렌드 분석", render_trend_tab),
+    ("🛒 마켓 & 가격", render_shop_tab),
+    ("💬 소셜 보이스", render_social_tab),
+    ("🔬 심층 EDA & 인사이트", render_eda_tab),
+]
+if "shop_all" in st.session_state["dashboard_loads"]:
+    tab_renders.insert(1, ("⚖️ 키워드 시장 비교", render_compare_tab))
+tabs = st.tabs([label for label, _ in tab_renders], key="active_tab", on_change="rerun")
+
+for tab, (_, render) in zip(tabs, tab_renders):
+    with tab:
+        if tab.open:
+            render()
+
+# 성능 디버그 패널 (이번 재실행의 구간별 소요 시간)
+if debug_mode:
+    with st.expander("🛠 이번 실행 성능 분석 (API / 로드 / 집계 / 차트)"):
+        breakdown = pd.DataFrame(instrumentation.summarize_run(metrics_run))
+        if breakdown.empty:
+            st.write("측정된 구간이 없습니다. (모든 결과가 캐시에서 제공됨)")
+        else:
+            breakdown['ms'] = (breakdown['seconds'] * 1000).round(1)
+            st.dataframe(breakdown.groupby('stage')['ms'].sum().sort_values(ascending=False),
+                         use_container_width=True)
+            st.dataframe(breakdown[['stage', 'name', 'calls', 'ms', 'rows']], use_container_width=True,
+                         hide_index=True)
+
 # 푸터
 st.markdown("---")
 st.caption("© 2026 Antigravity Advanced Analytics Interface. All rights reserved.")
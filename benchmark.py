@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import numpy as np
+
+# 라이브 자격 증명/쿼터 없이 모의 서버를 대상으로 수집기와 대시보드 로더 성능을 측정
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def summarize(latencies, elapsed, peak_bytes, **extra):
+    """호출별 지연 시간(초) 목록을 처리량/백분위/최대 메모리 요약으로 변환"""
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    result = {
+        "calls": len(latencies),
+        "elapsed_sec": round(elapsed, 4),
+        "throughput_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(ms, 50)), 3),
+            "p90": round(float(np.percentile(ms, 90)), 3),
+            "p99": round(float(np.percentile(ms, 99)), 3),
+            "max": round(float(ms.max()), 3),
+        },
+        "peak_memory_mb": round(peak_bytes / 1e6, 3),
+    }
+    result.update(extra)
+    return result
+
+
+@contextlib.contextmanager
+def measured():
+    """블록 실행 시간과 Python 할당 최대 메모리를 측정"""
+    box = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield box
+    finally:
+        box["elapsed"] = time.perf_counter() - started
+        box["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+
+def timed_calls(calls):
+    latencies = []
+    for fn, args in calls:
+        started = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def trend_render_scenarios(keywords, years, seed):
+    """기존 px.line(SVG, 전체 포인트) 대비 LTTB + WebGL 렌더링의 전송량/생성 시간 비교"""
+    import pandas as pd
+    import plotly.express as px
+    import visualization as viz
+
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2025-12-31", periods=365 * years, freq="-1D")[::-1]
+    df = pd.concat([pd.DataFrame({"period": days, "ratio": rng.random(len(days)) * 100, "keyword": f"kw{i}"})
+                    for i in range(keywords)], ignore_index=True)
+    builders = {
+        "trend_render_baseline": lambda: px.line(df, x="period", y="ratio", color="keyword"),
+        "trend_render_downsampled": lambda: viz.plot_trend_comparison(df),
+    }
+    results = {}
+    for name, build in builders.items():
+        with measured() as m:
+            started = time.perf_counter()
+            fig = build()
+            build_sec = time.perf_counter() - started
+            payload = fig.to_json()
+        results[name] = {
+            "points": sum(len(trace.x) for trace in fig.data),
+            "trace_type": type(fig.data[0]).__name__,
+            "payload_kb": round(len(payload) / 1024, 1),
+            "build_ms": round(build_sec * 1000, 2),
+            "peak_memory_mb": round(m["peak"] / 1e6, 3),
+        }
+    return results
+
+
+def run(args):
+    from mock_naver_server import MockNaverServer
+
+    server = MockNaverServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                             error_rate=args.error_rate, seed=args.seed).start()
+    workdir = tempfile.mkdtemp(prefix="naver_bench_")
+    # naver_api는 import 시점에 엔드포인트를 결정하므로 import 전에 환경 변수 지정
+    os.environ.update({
+        "NAVER_API_BASE": server.url,
+        "NAVER_CLIENT_ID": "bench",
+        "NAVER_CLIENT_SECRET": "bench",
+        "NAVER_CACHE_PATH": os.path.join(workdir, "responses.sqlite"),
+    })
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+
+    import naver_data_collector as collector
+    import data_manager as dm
+
+    keywords = [f"{args.keyword_prefix}{i}" for i in range(args.keywords)]
+    targets = [{"keyword": kw, "cat_id": "50000008"} for kw in keywords]
+    scenarios = {}
+
+    try:
+        with measured() as m:
+            latencies = timed_calls(
+                [(collector.get_shopping_trends_batched, (targets,))]
+                + [(collector.get_blog_posts, (kw, None, args.max_results)) for kw in keywords]
+                + [(collector.get_shop_products, (kw, None, args.max_results)) for kw in keywords])
+        scenarios["collector_sequential"] = summarize(latencies, m["elapsed"], m["peak"],
+                                                      keywords_per_min=round(len(keywords) / m["elapsed"] * 60, 2))
+
+        with measured() as m:
+            stats = collector.collect_concurrently(targets, max_workers=args.workers, rate_per_sec=args.rate,
+                                                   max_results=args.max_results)
+        scenarios["collector_concurrent"] = {
+            "elapsed_sec": stats["elapsed_sec"],
+            "requests_per_sec": stats["requests_per_sec"],
+            "keywords_per_min": stats["keywords_per_min"],
+            "http_requests": stats["http_requests"],
+            "reused_connections": stats["reused_connections"],
+            "retries": stats["retries"],
+            "peak_memory_mb": round(m["peak"] / 1e6, 3),
+        }
+
+        for name, fn, arg in [("loader_trend", dm.load_trend_data, lambda kw: ([kw],)),
+                              ("loader_shop", dm.load_shopping_data, lambda kw: (kw,)),
+                              ("loader_blog", dm.load_blog_data, lambda kw: (kw,))]:
+            with measured() as m:
+                latencies = timed_calls([(fn, arg(kw)) for _ in range(args.repeat) for kw in keywords])
+            scenarios[name] = summarize(latencies, m["elapsed"], m["peak"])
+
+        import data_manager_universal as dmu
+        cached = [dmu.fetch_shopping_trends, dmu.fetch_shopping_search, dmu.fetch_blog_search]
+        calls = ([(dmu.fetch_shopping_trends, (tuple(keywords),))]
+                 + [(dmu.fetch_shopping_search, (kw, args.max_results)) for kw in keywords]
+                 + [(dmu.fetch_blog_search, (kw, args.max_results)) for kw in keywords])
+        for name, reset_disk in [("dashboard_fetch_cold", True), ("dashboard_fetch_disk_cache", False)]:
+            if reset_disk:
+                dmu.invalidate_cache()
+            for fn in cached:
+                fn.clear()
+            with measured() as m:
+                latencies = timed_calls(calls)
+            scenarios[name] = summarize(latencies, m["elapsed"], m["peak"])
+        with measured() as m:
+            latencies = timed_calls(calls)
+        scenarios["dashboard_fetch_memory_cache"] = summarize(latencies, m["elapsed"], m["peak"])
+    finally:
+        server.stop()
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    scenarios.update(trend_render_scenarios(args.keywords, args.trend_years, args.seed))
+    return {
+        "config": vars(args),
+        "server": dict(server.stats),
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모의 네이버 API 서버 기반 오프라인 벤치마크")
+    parser.add_argument("--keywords", type=int, default=10, help="측정할 키워드 수")
+    parser.add_argument("--keyword-prefix", default="런닝화")
+    parser.add_argument("--max-results", type=int, default=100, help="블로그/쇼핑 검색 수집 건수")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=50, help="동시 수집 초당 호출 한도")
+    parser.add_argument("--repeat", type=int, default=5, help="로더 반복 측정 횟수")
+    parser.add_argument("--trend-years", type=int, default=3, help="렌더링 비교용 트렌드 기간(년)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
@@ -0,0 +1,207 @@
+import os
+import re
+import sqlite3
+import argparse
+from contextlib import contextmanager
+import pandas as pd
+import manifest
+from data_manager import load_entry
+from instrumentation import timed
+from snapshot_store import DATA_DIR
+
+# 블로그 게시물 역색인 (data 디렉터리 mtime을 건드리지 않도록 인덱스 하위 디렉터리에 둠)
+INDEX_PATH = os.path.join(DATA_DIR, ".index", "blog_index.sqlite")
+# 한글/영문/숫자 연속 구간을 단어로 보고, 단어 내부에서만 글자 2-gram 생성 (띄어쓰기를 넘는 gram은 만들지 않음)
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+# 공동 출현 단어 집계 시 떼어낼 조사 (긴 것부터 비교)
+_JOSA = sorted(["은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "으로", "에서", "와", "과", "만", "까지", "부터", "보다"],
+               key=len, reverse=True)
+MAX_QUERY_GRAMS = 32
+STOP_TERMS = {"있음", "있는", "하는", "그리고", "정말", "너무", "이번", "같은", "the", "and"}
+
+
+def words(text):
+    return _WORD.findall(str(text).lower())
+
+
+def ngrams(text):
+    """단어별 글자 2-gram 집합 (한 글자 단어는 gram이 없음)"""
+    grams = set()
+    for word in words(text):
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def terms(text):
+    """공동 출현 집계용 단어 집합 (끝 조사 제거, 2글자 이상)"""
+    found = set()
+    for word in words(text):
+        for josa in _JOSA:
+            if word.endswith(josa) and len(word) - len(josa) >= 2:
+                word = word[:-len(josa)]
+                break
+        if len(word) >= 2 and word not in STOP_TERMS:
+            found.add(word)
+    return found
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            doc_id INTEGER PRIMARY KEY,
+            link TEXT NOT NULL UNIQUE,
+            keyword TEXT,
+            postdate TEXT,
+            title TEXT,
+            description TEXT,
+            bloggername TEXT,
+            body TEXT NOT NULL
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS posts_postdate ON posts (postdate)")
+    conn.execute("CREATE TABLE IF NOT EXISTS postings (gram TEXT NOT NULL, doc_id INTEGER NOT NULL, "
+                 "PRIMARY KEY (gram, doc_id)) WITHOUT ROWID")
+    conn.execute("CREATE TABLE IF NOT EXISTS doc_terms (doc_id INTEGER NOT NULL, term TEXT NOT NULL, "
+                 "PRIMARY KEY (doc_id, term)) WITHOUT ROWID")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _date_text(value):
+    if pd.isna(value):
+        return None
+    return pd.Timestamp(value).strftime("%Y%m%d") if not isinstance(value, str) else value
+
+
+@timed("save")
+def index_posts(df, keyword):
+    """
+    정제된 블로그 데이터프레임을 색인에 추가하고 새로 색인한 게시물 수를 반환
+    이미 색인된 링크는 건너뛰므로 같은 스냅샷을 다시 넣어도 새 게시물만 처리됨
+    """
+    if df is None or df.empty or "link" not in df.columns:
+        return 0
+    with _connect() as conn:
+        links = df["link"].astype(str).tolist()
+        known = set()
+        for i in range(0, len(links), 500):
+            chunk = links[i:i + 500]
+            known.update(row[0] for row in conn.execute(
+                f"SELECT link FROM posts WHERE link IN ({', '.join('?' * len(chunk))})", chunk))
+        fresh = df[~df["link"].astype(str).isin(known)].drop_duplicates("link")
+        postings, doc_terms = [], []
+        for row in fresh.itertuples(index=False):
+            title, description = str(getattr(row, "title", "") or ""), str(getattr(row, "description", "") or "")
+            body = f"{title} {description}".lower()
+            cur = conn.execute("INSERT INTO posts (link, keyword, postdate, title, description, bloggername, body) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (str(row.link), keyword, _date_text(getattr(row, "postdate", None)), title,
+                                description, str(getattr(row, "bloggername", "") or ""), body))
+            postings.extend((gram, cur.lastrowid) for gram in ngrams(body))
+            doc_terms.extend((cur.lastrowid, term) for term in terms(body))
+        conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+        conn.executemany("INSERT OR IGNORE INTO doc_terms VALUES (?, ?)", doc_terms)
+    return len(fresh)
+
+
+def backfill(keyword):
+    """기존 블로그 스냅샷(CSV/Parquet)을 모두 색인 (같은 날짜는 Parquet 우선)"""
+    added, done = 0, set()
+    for entry in manifest.snapshots("blog_posts", keyword):
+        if entry["collected"] in done:
+            continue
+        done.add(entry["collected"])
+        added += index_posts(load_entry(entry, "blog_posts"), keyword)
+    return added
+
+
+def parse_query(query):
+    """큰따옴표로 묶은 구간은 구문, 나머지는 개별 단어 (모두 포함해야 일치)"""
+    phrases = [p.lower().strip() for p in re.findall(r'"([^"]+)"', query) if p.strip()]
+    rest = re.sub(r'"[^"]*"', " ", query)
+    return phrases + words(rest)
+
+
+def _match(conn, query, start=None, end=None, keyword=None):
+    """
+    질의와 일치하는 doc_id 목록 (최신 게시일 순)
+    n-gram 게시 목록 교집합으로 후보를 좁힌 뒤, 후보 본문에서 단어/구문 포함 여부를 확인해 오탐 제거
+    """
+    needles = parse_query(query)
+    # 후보 축소에는 일부 gram만 써도 충분 (최종 일치는 본문 확인으로 보장, 복합 SELECT 개수 제한 대비)
+    # 한 글자 단어는 더 긴 단어의 일부로만 나올 수 있어 gram으로 찾을 수 없음: 2-gram이 없는 검색어는 본문 부분 문자열로 거름
+    grams = sorted(set().union(*(ngrams(n) for n in needles)))[:MAX_QUERY_GRAMS] if needles else []
+    where, params = [], []
+    if grams:
+        where.append("doc_id IN (" + " INTERSECT ".join("SELECT doc_id FROM postings WHERE gram = ?"
+                                                        for _ in grams) + ")")
+        params += grams
+    for needle in needles:
+        if not ngrams(needle):
+            where.append("instr(body, ?) > 0")
+            params.append(needle)
+    if start:
+        where.append("postdate >= ?")
+        params.append(_date_text(start))
+    if end:
+        where.append("postdate <= ?")
+        params.append(_date_text(end))
+    if keyword:
+        where.append("keyword = ?")
+        params.append(keyword)
+    sql = "SELECT doc_id, body FROM posts" + (" WHERE " + " AND ".join(where) if where else "")
+    rows = conn.execute(sql + " ORDER BY postdate DESC, doc_id DESC", params).fetchall()
+    return [doc_id for doc_id, body in rows if all(n in body for n in needles)]
+
+
+@timed("load")
+def search(query, start=None, end=None, keyword=None, limit=50, n_terms=20):
+    """
+    (일치 게시물 데이터프레임(최신 순 limit건), 전체 일치 수, 공동 출현 단어 상위 n_terms개) 반환
+    공동 출현 단어는 일치한 전체 게시물 기준이며 질의 단어 자체는 제외
+    """
+    with _connect() as conn:
+        ids = _match(conn, query, start, end, keyword)
+        shown = ids[:limit]
+        posts = pd.read_sql_query(
+            f"SELECT keyword, postdate, title, description, bloggername, link FROM posts "
+            f"WHERE doc_id IN ({', '.join('?' * len(shown))}) ORDER BY postdate DESC, doc_id DESC", conn, params=shown)
+        conn.execute("CREATE TEMP TABLE matched (doc_id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO matched VALUES (?)", [(i,) for i in ids])
+        excluded = set(parse_query(query)) | {t for part in parse_query(query) for t in terms(part)}
+        co_terms = pd.read_sql_query(
+            "SELECT term, COUNT(*) AS posts FROM doc_terms JOIN matched USING (doc_id) "
+            "GROUP BY term ORDER BY posts DESC LIMIT ?", conn, params=(n_terms + len(excluded),))
+    posts["postdate"] = pd.to_datetime(posts["postdate"], format="%Y%m%d", errors="coerce")
+    co_terms = co_terms[~co_terms["term"].isin(excluded)].head(n_terms).reset_index(drop=True)
+    return posts, len(ids), co_terms
+
+
+def stats():
+    with _connect() as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("posts", "postings", "doc_terms")}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="블로그 게시물 전문 검색 색인")
+    parser.add_argument("--backfill", nargs="+", metavar="KEYWORD", help="기존 블로그 스냅샷 색인")
+    parser.add_argument("--query", help='검색어 (구문은 "큰따옴표")')
+    parser.add_argument("--start", help="게시일 시작 (YYYYMMDD)")
+    parser.add_argument("--end", help="게시일 종료 (YYYYMMDD)")
+    args = parser.parse_args()
+
+    for kw in args.backfill or []:
+        print(f"{kw}: 새 게시물 {backfill(kw)}건 색인")
+    if args.query:
+        found, total, co_terms = search(args.query, args.start, args.end, limit=20)
+        print(f"일치 {total}건")
+        print(found[["postdate", "title"]].to_string(index=False))
+        print(co_terms.to_string(index=False))
+    print(stats())
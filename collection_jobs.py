@@ -0,0 +1,257 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import manifest
+from snapshot_store import DATA_DIR
+
+# 작업 파일 기본 경로 및 대상별 수집 항목 (trend: 데이터랩 트렌드, shop: 쇼핑 검색, blog: 블로그 검색)
+DEFAULT_JOB_FILE = "targets.json"
+DATASETS = ("trend", "shop", "blog")
+# 스냅샷 저장소 이름 (오늘 이미 수집된 검색 결과 확인용)
+SNAPSHOT_DATASETS = {"trend": "shopping_trend", "shop": "shop_products", "blog": "blog_posts"}
+# 대상별 완료 기록 (data 디렉터리 mtime을 건드리지 않도록 하위 디렉터리에 둠)
+CHECKPOINT_PATH = os.path.join(DATA_DIR, ".jobs", "checkpoints.sqlite")
+# 처리량 측정 구간(초): 최근 완료 속도로 남은 시간을 추정
+THROUGHPUT_WINDOW = 60
+REPORT_INTERVAL = 5
+
+
+def _datasets(value):
+    """'trend|shop', 'trend;shop', ['trend', 'shop'] 형태를 항목 튜플로 변환 (비어 있으면 전체)"""
+    if isinstance(value, str):
+        value = value.replace(";", "|").replace(",", "|").split("|")
+    found = tuple(d.strip() for d in value or () if d and d.strip())
+    unknown = set(found) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"알 수 없는 수집 항목: {', '.join(sorted(unknown))} (가능: {', '.join(DATASETS)})")
+    return found or DATASETS
+
+
+def _target(row, defaults):
+    merged = {**defaults, **{k: v for k, v in row.items() if v not in (None, "")}}
+    if not merged.get("keyword") or not merged.get("cat_id"):
+        raise ValueError(f"keyword와 cat_id는 필수입니다: {row}")
+    target = {
+        "keyword": str(merged["keyword"]).strip(),
+        "cat_id": str(merged["cat_id"]).strip(),
+        "start": merged.get("start"),
+        "end": merged.get("end"),
+        "datasets": _datasets(merged.get("datasets")),
+    }
+    if "priority" in merged:
+        target["priority"] = int(merged["priority"])
+    return target
+
+
+def load_jobs(path=DEFAULT_JOB_FILE):
+    """
+    작업 파일(JSON/CSV)에서 수집 대상 목록을 읽음
+    - JSON: 대상 객체 배열, 또는 {"defaults": {...}, "targets": [...]} (defaults는 모든 대상에 적용)
+    - CSV: keyword, cat_id[, start, end, datasets, priority] 헤더 (datasets는 'trend|shop|blog')
+    start/end(YYYY-MM-DD)는 트렌드 조회 구간이며, 없으면 수집기 기본 구간을 사용
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows, defaults = list(csv.DictReader(f)), {}
+    else:
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+        rows, defaults = (spec, {}) if isinstance(spec, list) else (spec["targets"], spec.get("defaults", {}))
+    return [_target(row, defaults) for row in rows]
+
+
+def target_key(target):
+    """체크포인트 식별자: 같은 키워드라도 카테고리/구간이 다르면 별도 대상"""
+    return "|".join(str(target.get(k) or "") for k in ("keyword", "cat_id", "start", "end"))
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+    conn = sqlite3.connect(CHECKPOINT_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            target TEXT NOT NULL,
+            dataset TEXT NOT NULL,
+            collected TEXT NOT NULL,
+            finished_at TEXT NOT NULL,
+            PRIMARY KEY (target, dataset)
+        )""")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def mark_done(target, dataset, collected):
+    with _connect() as conn:
+        conn.execute("INSERT INTO checkpoints VALUES (?, ?, ?, ?) ON CONFLICT (target, dataset) DO UPDATE SET "
+                     "collected = excluded.collected, finished_at = excluded.finished_at",
+                     (target_key(target), dataset, collected, datetime.now().isoformat(timespec="seconds")))
+
+
+def pending_units(targets, collected=None):
+    """
+    (대상, 항목) 작업 단위 중 오늘 아직 완료되지 않은 것만 작업 파일 순서대로 반환
+    체크포인트에 오늘 완료로 기록되었거나, 검색 결과(쇼핑/블로그) 스냅샷이 오늘 이미 저장된 경우 건너뜀
+    """
+    collected = collected or datetime.now().strftime("%Y%m%d")
+    with _connect() as conn:
+        done = set(conn.execute("SELECT target, dataset FROM checkpoints WHERE collected = ?", (collected,)))
+    units = []
+    for target in targets:
+        for dataset in target["datasets"]:
+            if (target_key(target), dataset) in done:
+                continue
+            # 트렌드 스냅샷은 조회 구간별로 구분되지 않으므로 체크포인트로만 판단
+            if dataset != "trend":
+                entry = manifest.latest(SNAPSHOT_DATASETS[dataset], target["keyword"])
+                if entry and entry["collected"] == collected:
+                    continue
+            units.append((target, dataset))
+    return units
+
+
+def format_duration(seconds):
+    """남은 시간 표시 (하루 이상이면 일 수를 따로 표시: '2일 03:04:05')"""
+    days, rest = divmod(int(round(seconds)), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    clock = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{days}일 {clock}" if days else clock
+
+
+class Progress:
+    """완료 시각을 기록해 최근 THROUGHPUT_WINDOW초의 실측 처리량으로 남은 시간을 추정 (여러 스레드에서 갱신)"""
+
+    def __init__(self, total, window=THROUGHPUT_WINDOW):
+        self.total = total
+        self.done = self.failed = 0
+        self.window = window
+        self.started = time.monotonic()
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def update(self, ok):
+        with self._lock:
+            now = time.monotonic()
+            self.done += 1
+            self.failed += 0 if ok else 1
+            self._finished.append(now)
+            while self._finished and now - self._finished[0] > self.window:
+                self._finished.popleft()
+
+    def rate(self):
+        """초당 완료 작업 수 (측정 구간이 짧으면 실행 시작 이후 평균)"""
+        with self._lock:
+            now = time.monotonic()
+            span = min(self.window, now - self.started)
+            recent = sum(1 for t in self._finished if now - t <= self.window)
+        return recent / span if span > 0 else 0.0
+
+    def eta(self):
+        if self.done >= self.total:
+            return 0.0
+        rate = self.rate()
+        return (self.total - self.done) / rate if rate else None
+
+    def report(self):
+        eta = self.eta()
+        eta_text = format_duration(eta) if eta is not None else "측정 중"
+        percent = self.done / self.total * 100 if self.total else 100.0
+        return (f"진행 {self.done}/{self.total} ({percent:.1f}%), 실패 {self.failed}건, "
+                f"{self.rate() * 60:.1f}건/분, 남은 시간 {eta_text}")
+
+
+def run_jobs(targets, collect, max_workers=8, report_interval=REPORT_INTERVAL, should_stop=None,
+             collect_batch=None):
+    """
+    오늘 남은 (대상, 항목) 작업을 스레드 풀로 실행하고 성공한 작업만 체크포인트에 기록
+    - collect(target, dataset): 성공 시 결과, 실패 시 None 반환 (실패한 작업은 다음 실행 때 다시 시도)
+    - should_stop(dataset): True면 해당 항목의 새 작업 제출을 멈춤 (예: 일일 한도 소진)
+    - collect_batch: {항목: fn(대상 목록) -> 성공한 대상 목록} 여러 대상을 한 번에 수집하는 항목
+      (예: 트렌드 앵커 배치), 해당 항목의 남은 작업을 먼저 모아 실행하고 성공한 대상별로 체크포인트 기록
+    중단 후 다시 실행하면 완료 기록이 없는 작업부터 이어서 수집
+    """
+    collected = datetime.now().strftime("%Y%m%d")
+    units = pending_units(targets, collected)
+    total_units = sum(len(t["datasets"]) for t in targets)
+    print(f"작업 {total_units}건 중 오늘 완료 {total_units - len(units)}건 건너뜀, {len(units)}건 수집 시작")
+    progress = Progress(len(units))
+    skipped = []
+
+    collect_batch = collect_batch or {}
+    for dataset, fn in collect_batch.items():
+        group = [target for target, d in units if d == dataset]
+        if not group:
+            continue
+        if should_stop and should_stop(dataset):
+            skipped += [(target, dataset) for target in group]
+            progress.total -= len(group)
+            continue
+        try:
+            done = {target_key(target) for target in fn(group)}
+        except Exception as e:
+            print(f"수집 중 예외 발생 ({dataset} 일괄 {len(group)}건): {e}")
+            done = set()
+        for target in group:
+            if target_key(target) in done:
+                mark_done(target, dataset, collected)
+            progress.update(target_key(target) in done)
+        print(progress.report())
+    units = [(target, dataset) for target, dataset in units if dataset not in collect_batch]
+
+    def run(unit):
+        target, dataset = unit
+        try:
+            result = collect(target, dataset)
+        except Exception as e:
+            print(f"수집 중 예외 발생 ({target['keyword']}/{dataset}): {e}")
+            result = None
+        if result is not None:
+            mark_done(target, dataset, collected)
+        progress.update(result is not None)
+
+    # 제출 대기 중인 작업 수를 제한해 대상이 수천 건이어도 future가 한꺼번에 쌓이지 않도록 함
+    queue = deque(units)
+    last_report = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = set()
+        while queue or running:
+            while queue and len(running) < max_workers * 2:
+                target, dataset = queue.popleft()
+                if should_stop and should_stop(dataset):
+                    skipped.append((target, dataset))
+                    progress.total -= 1
+                    continue
+                running.add(executor.submit(run, (target, dataset)))
+            if not running:
+                break
+            _, running = wait(running, timeout=report_interval, return_when=FIRST_COMPLETED)
+            if time.monotonic() - last_report >= report_interval:
+                print(progress.report())
+                last_report = time.monotonic()
+
+    print(progress.report())
+    if skipped:
+        print(f"{len(skipped)}건은 이번 실행에서 제출하지 않음 (다음 실행 때 이어서 수집)")
+    return {"units": len(units), "succeeded": progress.done - progress.failed, "failed": progress.failed,
+            "skipped": len(skipped), "elapsed_sec": round(time.monotonic() - progress.started, 3)}
+
+
+def reset(targets=None):
+    """체크포인트 삭제 (targets를 주면 해당 대상만)"""
+    with _connect() as conn:
+        if targets is None:
+            conn.execute("DELETE FROM checkpoints")
+        else:
+            conn.executemany("DELETE FROM checkpoints WHERE target = ?", [(target_key(t),) for t in targets])
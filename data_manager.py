@@ -1,52 +1,56 @@
-import os
 import pandas as pd
-import glob
+import manifest
+from instrumentation import timed
 from dotenv import load_dotenv
+from preprocess import normalize_frame
+from snapshot_store import read_parquet
 
 load_dotenv()
 
-DATA_DIR = "data"
-
 def get_latest_csv(prefix, keyword):
-    """지정된 접두사와 키워드에 해당하는 가장 최근 CSV 파일을 반환"""
-    safe_keyword = keyword.replace("/", "_").replace(" ", "")
-    pattern = os.path.join(DATA_DIR, f"{prefix}_{safe_keyword}*.csv")
-    files = glob.glob(pattern)
-    if not files:
-        return None
-    # 파일명 기반 정렬 (날짜가 포함되어 있으므로 최신 파일이 뒤로 감)
-    return sorted(files)[-1]
+    """지정된 접두사와 키워드에 해당하는 가장 최근 CSV 파일을 반환 (매니페스트 인덱스 조회)"""
+    entry = manifest.latest(prefix, keyword, fmt="csv")
+    return entry["path"] if entry else None
+
+def load_latest(dataset, keyword, columns=None):
+    """
+    최신 스냅샷 로드: 매니페스트에서 경로를 찾아 Parquet은 필요한 컬럼만, CSV는 타입 변환 후 반환
+    반환되는 데이터프레임은 저장소와 동일한 타입 규칙이 적용된 상태
+    """
+    entry = manifest.latest(dataset, keyword)
+    return load_entry(entry, dataset, columns) if entry else None
 
+def load_entry(entry, dataset, columns=None):
+    """매니페스트 항목 하나를 형식에 맞게 읽어 저장소 타입 규칙이 적용된 데이터프레임으로 반환"""
+    if entry["format"] == "parquet":
+        return read_parquet(entry["path"], columns)
+    # 빈 문자열(브랜드 없음 등)은 결측이 아니라 값이므로 그대로 유지 (수치/날짜 컬럼은 변환 시 결측 처리)
+    df = pd.read_csv(entry["path"], usecols=lambda c: columns is None or c in columns, keep_default_na=False)
+    return normalize_frame(df, dataset)
+
+@timed("load")
 def load_trend_data(keywords):
     """여러 키워드의 트렌드 데이터를 불러와 통합 데이터프레임 생성"""
     all_data = []
     for kw in keywords:
-        file = get_latest_csv("shopping_trend", kw)
-        if file:
-            df = pd.read_csv(file)
+        df = load_latest("shopping_trend", kw, columns=['period', 'ratio'])
+        if df is not None:
             df['keyword'] = kw
             all_data.append(df)
-    
+
     if not all_data:
         return pd.DataFrame(columns=['period', 'ratio', 'keyword'])
-    
-    combined = pd.concat(all_data, ignore_index=True)
-    combined['period'] = pd.to_datetime(combined['period'])
-    return combined
-
-def load_shopping_data(keyword):
-    """쇼핑 검색 결과 데이터 로드"""
-    file = get_latest_csv("shop_products", keyword)
-    if file:
-        df = pd.read_csv(file)
-        # 가격 전처리
-        df['lprice'] = pd.to_numeric(df['lprice'], errors='coerce')
-        return df
-    return pd.DataFrame()
-
-def load_blog_data(keyword):
+
+    return pd.concat(all_data, ignore_index=True)
+
+@timed("load")
+def load_shopping_data(keyword, columns=None):
+    """쇼핑 검색 결과 데이터 로드 (가격 등 수치형 컬럼은 저장 시점에 변환됨)"""
+    df = load_latest("shop_products", keyword, columns=columns)
+    return df if df is not None else pd.DataFrame()
+
+@timed("load")
+def load_blog_data(keyword, columns=None):
     """블로그 검색 결과 데이터 로드"""
-    file = get_latest_csv("blog_posts", keyword)
-    if file:
-        return pd.read_csv(file)
-    return pd.DataFrame()
+    df = load_latest("blog_posts", keyword, columns=columns)
+    return df if df is not None else pd.DataFrame()
@@ -1,9 +1,12 @@
 import os
-import requests
-import json
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
+from datalab import fetch_trend_range
+from naver_api import BLOG_URL, SHOP_URL, MAX_DISPLAY, get_client, iter_search_pages
+from instrumentation import timed
+from preprocess import normalize_frame
+from response_cache import CachedClient, ResponseCache
 
 def get_api_keys():
     """자격 증명 로드 (Streamlit Cloud Secrets 또는 로컬 .env)"""
@@ -20,73 +23,52 @@ def get_api_keys():
 
 CLIENT_ID, CLIENT_SECRET = get_api_keys()
 
-@st.cache_data(ttl=3600)
-def fetch_shopping_trend(keyword, start_date="2025-01-01", end_date="2025-12-31"):
-    """실시간 쇼핑 트렌드 API 호출 (카테고리 ID가 없는 범용 검색은 '스포츠/레저' 50000008 기본값 사용)"""
-    url = "https://openapi.naver.com/v1/datalab/shopping/categories"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET,
-        "Content-Type": "application/json"
-    }
-    # 범용 검색을 위해 카테고리는 최상위 대분류 중 하나를 선택하거나 검색어와 매칭 필요
-    # 여기서는 예시로 스포츠/레저(50000008)를 사용하거나, 실제로는 검색어별 매징 로직이 필요함
-    body = {
-        "startDate": start_date,
-        "endDate": end_date,
-        "timeUnit": "date",
-        "category": [{"name": keyword, "param": ["50000008"]}], # 범용 예시 ID
-        "device": "",
-        "gender": "",
-        "ages": []
-    }
-    try:
-        response = requests.post(url, headers=headers, data=json.dumps(body))
-        if response.status_code == 200:
-            data = response.json()["results"][0]["data"]
-            df = pd.DataFrame(data)
-            df['period'] = pd.to_datetime(df['period'])
-            df['keyword'] = keyword
-            return df
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Trend API Error: {e}")
-        return pd.DataFrame()
+# 대시보드 조회 결과를 메모리에 유지하는 시간(초): 지나면 다시 요청해 새 데이터를 반영
+FETCH_TTL = 3600
 
-@st.cache_data(ttl=3600)
-def fetch_shopping_search(keyword):
-    """실시간 쇼핑 상품 검색 API 호출"""
-    url = f"https://openapi.naver.com/v1/search/shop.json?query={keyword}&display=100"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET
-    }
-    try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            items = response.json().get("items", [])
-            df = pd.DataFrame(items)
-            df['lprice'] = pd.to_numeric(df['lprice'], errors='coerce')
-            return df
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Shopping API Error: {e}")
-        return pd.DataFrame()
+# 서버 재시작/여러 워커 프로세스 간에도 유지되는 디스크 응답 캐시
+response_cache = ResponseCache()
 
-@st.cache_data(ttl=3600)
-def fetch_blog_search(keyword):
-    """실시간 블로그 검색 API 호출"""
-    url = f"https://openapi.naver.com/v1/search/blog.json?query={keyword}&display=100"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET
-    }
-    try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            items = response.json().get("items", [])
-            return pd.DataFrame(items)
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Blog API Error: {e}")
-        return pd.DataFrame()
+def api_client():
+    """커넥션 풀 기반 API 클라이언트를 디스크 응답 캐시로 감싸 반환"""
+    return CachedClient(get_client(CLIENT_ID, CLIENT_SECRET), response_cache)
+
+def invalidate_cache(keywords=None):
+    """지정 키워드의 디스크 캐시 응답만 무효화 (None이면 전체)"""
+    response_cache.invalidate(keywords)
+
+def trend_groups(keywords):
+    """트렌드 요청 그룹 구성 (사전 갱신 워커도 같은 요청 본문을 만들도록 공유)"""
+    return [{"name": k, "param": ["50000008"]} for k in dict.fromkeys(keywords)] # 범용 예시 ID
+
+@st.cache_data(ttl=FETCH_TTL)
+@timed("fetch")
+def fetch_shopping_trends(keywords, start_date="2025-01-01", end_date="2025-12-31"):
+    """
+    여러 키워드의 쇼핑 트렌드를 3개 그룹 단위 배치로 호출
+    첫 키워드를 앵커로 모든 배치에 포함시켜 배치 간 비율을 비교 가능하게 환산
+    긴 구간은 분기 단위 청크로 병렬 요청해 이어붙이고, 청크 응답은 디스크 캐시에서 재사용
+    대시보드 작업 스레드에서 실행되므로 오류는 잡지 않고 전달 (메인 스크립트 스레드에서 표시, 실패는 캐시되지 않음)
+    """
+    return fetch_trend_range(api_client(), trend_groups(keywords), start_date, end_date)
+
+def _fetch_search_frame(url, keyword, max_results, dedup_key):
+    """검색 API를 페이지 병렬로 호출하여 검색 순위 순의 단일 데이터프레임으로 병합"""
+    pages = {}
+    for start, items in iter_search_pages(api_client(), url, keyword, max_results=max_results, dedup_key=dedup_key):
+        pages[start] = pd.DataFrame(items)
+    return pd.concat([pages[start] for start in sorted(pages)], ignore_index=True)
+
+@st.cache_data(ttl=FETCH_TTL)
+@timed("fetch")
+def fetch_shopping_search(keyword, max_results=MAX_DISPLAY):
+    """실시간 쇼핑 상품 검색 API 호출 (최대 max_results개, 최대 1000, 오류는 호출 측으로 전달)"""
+    df = _fetch_search_frame(SHOP_URL, keyword, max_results, "productId")
+    # 수집 시점에 타입을 정리해 세션 메모리와 캐시 직렬화 비용을 줄임
+    return normalize_frame(df, "shop_products")
+
+@st.cache_data(ttl=FETCH_TTL)
+@timed("fetch")
+def fetch_blog_search(keyword, max_results=MAX_DISPLAY):
+    """실시간 블로그 검색 API 호출 (최대 max_results개, 최대 1000, 오류는 호출 측으로 전달)"""
+    return normalize_frame(_fetch_search_frame(BLOG_URL, keyword, max_results, "link"), "blog_posts")
@@ -0,0 +1,161 @@
+import contextvars
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from naver_api import TREND_URL
+
+# 쇼핑인사이트 분야별 트렌드 API는 요청당 최대 3개의 category 그룹을 허용
+MAX_GROUPS = 3
+# 장기 구간 분할 시 인접 청크와 겹치게 요청할 일수 (비율 환산 기준 구간)
+CHUNK_OVERLAP_DAYS = 7
+
+
+def pack_batches(groups, max_groups=MAX_GROUPS):
+    """
+    category 그룹 목록을 요청 단위 배치로 묶음
+    그룹 수가 한 요청에 들어가지 않으면 첫 그룹(앵커)을 모든 배치에 반복 포함
+    """
+    if len(groups) <= max_groups:
+        return [list(groups)]
+    anchor, rest = groups[0], groups[1:]
+    step = max_groups - 1
+    return [[anchor] + rest[i:i + step] for i in range(0, len(rest), step)]
+
+
+def request_trend(client, groups, start_date, end_date, limiter=None, time_unit="date", priority=None):
+    """단일 DataLab 요청을 보내고 (period, ratio, keyword) 형태의 long 데이터프레임 반환"""
+    body = {
+        "startDate": start_date,
+        "endDate": end_date,
+        "timeUnit": time_unit,
+        "category": groups,
+        "device": "",
+        "gender": "",
+        "ages": []
+    }
+    frames = []
+    for result in client.fetch_json("POST", TREND_URL, body=body, limiter=limiter, priority=priority).get("results", []):
+        df = pd.DataFrame(result.get("data", []), columns=["period", "ratio"])
+        df["keyword"] = result["title"]
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["period", "ratio", "keyword"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def rescale_to_anchor(batch_frames, anchor):
+    """
+    배치별 상대 비율(ratio)을 첫 배치의 앵커 시계열 기준으로 환산해 하나로 병합
+    환산 후 전체 최대값이 100이 되도록 다시 정규화 (DataLab과 동일한 척도 유지)
+    """
+    if not batch_frames:
+        return pd.DataFrame(columns=["period", "ratio", "keyword"])
+    if len(batch_frames) == 1:
+        return batch_frames[0].copy()
+
+    base = batch_frames[0]
+    base_total = base.loc[base["keyword"] == anchor, "ratio"].sum()
+    merged = [base]
+    for frame in batch_frames[1:]:
+        total = frame.loc[frame["keyword"] == anchor, "ratio"].sum()
+        scale = base_total / total if total else 1.0
+        scaled = frame[frame["keyword"] != anchor].copy()
+        scaled["ratio"] = scaled["ratio"] * scale
+        merged.append(scaled)
+
+    combined = pd.concat(merged, ignore_index=True)
+    peak = combined["ratio"].max()
+    if peak:
+        combined["ratio"] = combined["ratio"] * (100.0 / peak)
+    return combined
+
+
+def merge_with_overlap(base, fresh):
+    """
+    기존 시계열(base) 뒤에 새 시계열(fresh)을 이어붙임
+    두 구간이 겹치는 날짜의 ratio 합 비율로 fresh를 base 척도에 맞춘 뒤 base 이후 구간만 추가
+    (겹치는 구간이 없으면 환산 없이 이어붙임)
+    keyword 컬럼이 있으면 키워드별로 겹치는 값을 맞추되 배율은 하나로 적용해 키워드 간 비율을 유지
+    """
+    if base is None or base.empty:
+        return fresh.copy()
+    if fresh is None or fresh.empty:
+        return base.copy()
+    keys = ["period", "keyword"] if "keyword" in base.columns and "keyword" in fresh.columns else ["period"]
+    overlap = base[keys + ["ratio"]].merge(fresh[keys + ["ratio"]], on=keys, suffixes=("_base", "_fresh"))
+    fresh_total = overlap["ratio_fresh"].sum()
+    scale = overlap["ratio_base"].sum() / fresh_total if fresh_total else 1.0
+
+    tail = fresh[fresh["period"] > base["period"].max()].copy()
+    tail["ratio"] = tail["ratio"] * scale
+    merged = pd.concat([base, tail], ignore_index=True)
+    peak = merged["ratio"].max()
+    if peak > 100:
+        merged["ratio"] = merged["ratio"] * (100.0 / peak)
+    return merged
+
+
+def quarter_chunks(start_date, end_date, overlap_days=CHUNK_OVERLAP_DAYS, today=None):
+    """
+    요청 구간을 달력 분기 단위 청크로 분할 (캐시 재사용을 위해 경계는 항상 분기 기준으로 고정)
+    각 청크는 앞 분기와 overlap_days일 겹치며, 미래 날짜는 오늘까지로 자름
+    """
+    start, end = date.fromisoformat(str(start_date)[:10]), date.fromisoformat(str(end_date)[:10])
+    today = today or date.today()
+    chunks = []
+    q_start = date(start.year, 3 * ((start.month - 1) // 3) + 1, 1)
+    while q_start <= end:
+        month = q_start.month + 3
+        next_start = date(q_start.year + (month > 12), (month - 1) % 12 + 1, 1)
+        chunk_end = min(next_start - timedelta(days=1), today)
+        chunk_start = q_start - timedelta(days=overlap_days)
+        if chunk_start <= chunk_end:
+            chunks.append((chunk_start.isoformat(), chunk_end.isoformat()))
+        q_start = next_start
+    return chunks
+
+
+def fetch_trend_batched(client, groups, start_date, end_date, limiter=None, max_workers=4, priority=None):
+    """
+    여러 키워드 그룹을 최대 크기 배치로 묶어 병렬 요청하고 앵커 기준으로 비율을 맞춘 결과 반환
+    groups: [{"name": 키워드, "param": [카테고리 ID]}, ...]
+    """
+    if not groups:
+        return pd.DataFrame(columns=["period", "ratio", "keyword"])
+    batches = pack_batches(groups)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        # 작업 스레드의 API 측정도 호출한 실행 기록에 남도록 요청마다 컨텍스트 복사
+        futures = [executor.submit(contextvars.copy_context().run,
+                                   request_trend, client, batch, start_date, end_date, limiter, "date", priority)
+                   for batch in batches]
+        frames = [future.result() for future in futures]
+    return rescale_to_anchor(frames, groups[0]["name"])
+
+
+def fetch_trend_range(client, groups, start_date, end_date, limiter=None, max_workers=4, priority=None):
+    """
+    긴 구간을 분기 청크로 나눠 병렬 요청한 뒤 겹치는 날짜로 비율을 맞춰 하나의 시계열로 연결
+    청크 경계가 고정되어 있어 날짜 선택을 조금 옮겨도 새 분기 청크만 다시 요청됨 (나머지는 응답 캐시 재사용)
+    """
+    chunks = quarter_chunks(start_date, end_date)
+    if not groups or not chunks:
+        return pd.DataFrame(columns=["period", "ratio", "keyword"])
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run,
+                                   fetch_trend_batched, client, groups, chunk_start, chunk_end, limiter, max_workers, priority)
+                   for chunk_start, chunk_end in chunks]
+        frames = [future.result() for future in futures]
+
+    stitched = None
+    for frame in frames:
+        frame = frame.assign(period=pd.to_datetime(frame["period"]))
+        stitched = merge_with_overlap(stitched, frame)
+    if stitched is None or stitched.empty:
+        return pd.DataFrame(columns=["period", "ratio", "keyword"])
+
+    # 요청 구간으로 자른 뒤 DataLab과 동일하게 구간 내 최대값을 100으로 정규화
+    trimmed = stitched[stitched["period"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))].copy()
+    peak = trimmed["ratio"].max()
+    if peak:
+        trimmed["ratio"] = trimmed["ratio"] * (100.0 / peak)
+    return trimmed.sort_values(["keyword", "period"]).reset_index(drop=True)
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+# 비활성 상태에서는 플래그 확인 한 번만 하고 원래 함수를 그대로 호출
+# 프로세스 기본값 (수집기 CLI 등), 대시보드는 세션마다 실행 단위로 켜고 끔
+_enabled = os.getenv("NAVER_METRICS", "0") == "1"
+# 현재 실행(Streamlit 재실행 1회 / 수집 작업 1회)의 측정 기록과 활성 여부 (None이면 프로세스 기본값)
+_current_run = contextvars.ContextVar("naver_metrics_run", default=None)
+_run_enabled = contextvars.ContextVar("naver_metrics_enabled", default=None)
+# 프로세스 누적 집계: (stage, name) -> [호출 수, 누적 초, 누적 행 수]
+_totals = {}
+_lock = threading.Lock()
+
+
+def set_enabled(enabled):
+    """프로세스 기본 활성 여부 (실행 단위 설정이 없는 스레드에 적용)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    run_enabled = _run_enabled.get()
+    return _enabled if run_enabled is None else run_enabled
+
+
+def start_run(enabled=None):
+    """
+    새 실행 구간을 시작하고 이번 실행의 기록 리스트를 반환
+    enabled를 주면 이 실행(과 컨텍스트를 복사한 작업 스레드)에서만 측정을 켜고 끔
+    다른 세션이나 사전 갱신 스레드의 설정에는 영향 없음
+    """
+    records = []
+    _current_run.set(records)
+    _run_enabled.set(None if enabled is None else bool(enabled))
+    return records
+
+
+def _rows(obj):
+    """데이터프레임/시리즈/ShopAnalysis 등 행 수를 가진 객체면 행 수, 아니면 None"""
+    if hasattr(obj, "empty") and hasattr(obj, "__len__"):
+        return len(obj)
+    return None
+
+
+def record(stage, name, seconds, rows=None):
+    records = _current_run.get()
+    if records is not None:
+        records.append({"stage": stage, "name": name, "seconds": seconds, "rows": rows})
+    with _lock:
+        total = _totals.setdefault((stage, name), [0, 0.0, 0])
+        total[0] += 1
+        total[1] += seconds
+        total[2] += rows or 0
+
+
+@contextmanager
+def span(stage, name):
+    """코드 블록 단위 측정 (비활성 시 즉시 통과)"""
+    if not is_enabled():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, name, time.perf_counter() - started)
+
+
+def timed(stage, name=None):
+    """
+    함수 호출 시간과 행 수(반환값, 없으면 첫 인자 기준)를 기록하는 데코레이터
+    stage: api | load | aggregate | plot 등 구간 분류
+    """
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            rows = _rows(result)
+            if rows is None and args:
+                rows = _rows(args[0])
+            record(stage, label, time.perf_counter() - started, rows)
+            return result
+        return wrapper
+    return decorator
+
+
+def summarize_run(records):
+    """실행 기록을 (stage, name)별 호출 수/총 시간/행 수로 집계"""
+    summary = {}
+    for r in records:
+        item = summary.setdefault((r["stage"], r["name"]), {"stage": r["stage"], "name": r["name"],
+                                                             "calls": 0, "seconds": 0.0, "rows": 0})
+        item["calls"] += 1
+        item["seconds"] += r["seconds"]
+        item["rows"] += r["rows"] or 0
+    return sorted(summary.values(), key=lambda item: item["seconds"], reverse=True)
+
+
+def snapshot():
+    with _lock:
+        return [{"stage": stage, "name": name, "calls": calls, "seconds": round(seconds, 6), "rows": rows}
+                for (stage, name), (calls, seconds, rows) in sorted(_totals.items())]
+
+
+def prometheus_text():
+    """프로세스 누적 집계를 Prometheus 텍스트 노출 형식으로 변환"""
+    lines = [
+        "# HELP naver_stage_seconds Time spent per instrumented stage.",
+        "# TYPE naver_stage_seconds summary",
+    ]
+    items = snapshot()
+    for item in items:
+        labels = f'stage="{item["stage"]}",name="{item["name"]}"'
+        lines.append(f"naver_stage_seconds_sum{{{labels}}} {item['seconds']}")
+        lines.append(f"naver_stage_seconds_count{{{labels}}} {item['calls']}")
+    lines += ["# HELP naver_stage_rows_total Rows processed per instrumented stage.",
+              "# TYPE naver_stage_rows_total counter"]
+    for item in items:
+        labels = f'stage="{item["stage"]}",name="{item["name"]}"'
+        lines.append(f"naver_stage_rows_total{{{labels}}} {item['rows']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path):
+    """확장자에 따라 JSON(.json) 또는 Prometheus 텍스트 형식으로 누적 집계 저장"""
+    content = json.dumps(snapshot(), ensure_ascii=False, indent=2) if path.endswith(".json") else prometheus_text()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
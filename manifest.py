@@ -0,0 +1,144 @@
+import os
+import re
+import json
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+import pyarrow.parquet as pq
+from snapshot_store import DATA_DIR, STORE_DIR, safe_keyword
+
+# data 디렉터리의 mtime으로 인덱스 불일치를 감지하므로 인덱스 파일은 하위 디렉터리에 둠
+MANIFEST_PATH = os.path.join(DATA_DIR, ".index", "manifest.sqlite")
+DATASETS = ("shopping_trend", "shop_products", "blog_posts")
+# CSV 파일명: [내용]_[키워드](_[기간])_[수집날짜].csv
+CSV_NAME = re.compile(r"^(?P<dataset>%s)_(?P<keyword>.+?)(?:_\d{4})?_(?P<date>\d{8})\.csv$" % "|".join(DATASETS))
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    conn = sqlite3.connect(MANIFEST_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            dataset TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            collected TEXT NOT NULL,
+            format TEXT NOT NULL,
+            path TEXT NOT NULL,
+            rows INTEGER,
+            schema TEXT,
+            PRIMARY KEY (dataset, keyword, collected, format)
+        )""")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _data_dir_mtime():
+    return str(os.stat(DATA_DIR).st_mtime_ns) if os.path.isdir(DATA_DIR) else ""
+
+
+def _upsert(conn, dataset, keyword, collected, fmt, path, rows, schema):
+    conn.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                 (dataset, safe_keyword(keyword), collected, fmt, path, rows,
+                  json.dumps(schema, ensure_ascii=False) if schema is not None else None))
+
+
+def _touch(conn):
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('data_mtime', ?)", (_data_dir_mtime(),))
+
+
+def register(dataset, keyword, collected, fmt, path, df=None, rows=None, schema=None):
+    """
+    수집기가 스냅샷을 저장할 때마다 호출: 행 수와 스키마(컬럼별 dtype)를 함께 기록
+    스트리밍 저장처럼 데이터프레임이 없으면 rows/schema를 직접 전달
+    """
+    if df is not None:
+        rows, schema = len(df), {col: str(dtype) for col, dtype in df.dtypes.items()}
+    with _connect() as conn:
+        initialized = conn.execute("SELECT 1 FROM meta WHERE key = 'data_mtime'").fetchone()
+    if not initialized:
+        # 인덱스 최초 생성 시에는 기존 파일까지 함께 색인
+        rebuild()
+    with _connect() as conn:
+        _upsert(conn, dataset, keyword, collected, fmt, path, rows, schema)
+        _touch(conn)
+
+
+def rebuild():
+    """data 디렉터리를 한 번 스캔해 인덱스를 다시 생성 (인덱스 누락/불일치 시 자동 호출)"""
+    with _connect() as conn:
+        conn.execute("DELETE FROM snapshots")
+        if os.path.isdir(DATA_DIR):
+            for name in os.listdir(DATA_DIR):
+                m = CSV_NAME.match(name)
+                if not m:
+                    continue
+                path = os.path.join(DATA_DIR, name)
+                schema = {col: "object" for col in pd.read_csv(path, nrows=0).columns}
+                _upsert(conn, m["dataset"], m["keyword"], m["date"], "csv", path, None, schema)
+        for dataset in DATASETS:
+            base = os.path.join(STORE_DIR, f"dataset={dataset}")
+            if not os.path.isdir(base):
+                continue
+            for kw_dir in os.listdir(base):
+                for date_dir in os.listdir(os.path.join(base, kw_dir)):
+                    path = os.path.join(base, kw_dir, date_dir, "part-0.parquet")
+                    if not os.path.exists(path):
+                        continue
+                    meta = pq.read_metadata(path)
+                    schema = {f.name: str(f.type) for f in meta.schema.to_arrow_schema()}
+                    _upsert(conn, dataset, kw_dir[len("keyword="):], date_dir[len("date="):], "parquet",
+                            path, meta.num_rows, schema)
+        _touch(conn)
+
+
+def _rows_to_dicts(cursor):
+    cols = [c[0] for c in cursor.description]
+    records = []
+    for row in cursor.fetchall():
+        record = dict(zip(cols, row))
+        record["schema"] = json.loads(record["schema"]) if record["schema"] else None
+        records.append(record)
+    return records
+
+
+def _query(sql, params):
+    with _connect() as conn:
+        stored = conn.execute("SELECT value FROM meta WHERE key = 'data_mtime'").fetchone()
+    if stored is None or stored[0] != _data_dir_mtime():
+        rebuild()
+    with _connect() as conn:
+        return _rows_to_dicts(conn.execute(sql, params))
+
+
+def snapshots(dataset, keyword, fmt=None):
+    """(dataset, keyword)의 스냅샷 목록 (수집일 오름차순)"""
+    sql = "SELECT * FROM snapshots WHERE dataset = ? AND keyword = ?"
+    params = [dataset, safe_keyword(keyword)]
+    if fmt:
+        sql += " AND format = ?"
+        params.append(fmt)
+    return _query(sql + " ORDER BY collected, format DESC", params)
+
+
+def latest(dataset, keyword, fmt=None):
+    """
+    (dataset, keyword)의 최신 스냅샷 정보 반환 (같은 날짜면 Parquet 우선), 없으면 None
+    기록된 파일이 사라졌으면 인덱스를 재생성한 뒤 다시 조회
+    """
+    sql = "SELECT * FROM snapshots WHERE dataset = ? AND keyword = ?"
+    params = [dataset, safe_keyword(keyword)]
+    if fmt:
+        sql += " AND format = ?"
+        params.append(fmt)
+    sql += " ORDER BY collected DESC, format DESC LIMIT 1"
+    found = _query(sql, params)
+    if found and not os.path.exists(found[0]["path"]):
+        rebuild()
+        found = _query(sql, params)
+    return found[0] if found else None
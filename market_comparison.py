@@ -0,0 +1,137 @@
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from instrumentation import timed
+from preprocess import CATEGORY_COLUMNS
+
+# 가격 분포 비교용 공통 구간 수
+PRICE_BINS = 30
+
+
+def combine(frames, dataset):
+    """
+    키워드별 데이터프레임을 keyword 컬럼이 붙은 하나의 데이터프레임으로 병합
+    키워드마다 범주가 달라 object로 풀린 컬럼은 다시 category로 변환
+    """
+    frames = {kw: df for kw, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return pd.DataFrame(columns=['keyword'])
+    combined = pd.concat(frames, names=['keyword', None]).reset_index(level=0).reset_index(drop=True)
+    for col in CATEGORY_COLUMNS.get(dataset, []) + ['keyword']:
+        if col in combined.columns:
+            combined[col] = combined[col].astype('category')
+    combined['keyword'] = combined['keyword'].cat.reorder_categories(list(frames))
+    return combined
+
+
+class MarketComparison:
+    """
+    여러 키워드의 쇼핑/블로그 데이터를 keyword 컬럼 기준 그룹 집계 한 번으로 비교
+    키워드 수만큼 ShopAnalysis를 만드는 대신 (keyword, 항목) 단위 groupby로 모든 키워드를 함께 계산
+    """
+
+    def __init__(self, shop_df, blog_df=None):
+        self.shop = shop_df
+        self.blog = blog_df if blog_df is not None else pd.DataFrame(columns=['keyword'])
+        self._memo = {}
+
+    @property
+    def empty(self):
+        return self.shop.empty
+
+    def __len__(self):
+        return len(self.shop)
+
+    def memo(self, key, compute):
+        """임의 파생 결과(차트 등)를 key 단위로 한 번만 계산해 보관"""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def keywords(self):
+        return list(self.shop['keyword'].cat.categories) if not self.shop.empty else []
+
+    # --- 가격 ---
+    @cached_property
+    @timed("aggregate")
+    def price_stats(self):
+        """키워드별 상품 수, 평균/최소/최대 및 사분위 가격"""
+        grouped = self.shop.groupby('keyword', observed=True)['lprice']
+        stats = grouped.agg(['count', 'mean', 'min', 'max'])
+        quantiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        quantiles.columns = ['q1', 'median', 'q3']
+        return stats.join(quantiles)
+
+    @cached_property
+    @timed("aggregate")
+    def price_histogram(self):
+        """모든 키워드에 같은 가격 구간을 적용한 키워드 x 구간 상품 비율"""
+        prices = self.shop['lprice'].astype(float)
+        edges = np.histogram_bin_edges(prices.dropna(), bins=PRICE_BINS)
+        bins = pd.cut(prices, edges, include_lowest=True)
+        counts = pd.crosstab(self.shop['keyword'], bins, normalize='index')
+        counts.columns = [interval.mid for interval in counts.columns]
+        return counts
+
+    # --- 브랜드 / 판매처 / 카테고리 ---
+    def _share(self, column):
+        counts = self.shop.groupby(['keyword', column], observed=True).size().rename('count').reset_index()
+        counts['share'] = counts['count'] / counts.groupby('keyword', observed=True)['count'].transform('sum')
+        return counts
+
+    @cached_property
+    @timed("aggregate")
+    def brand_share(self):
+        """(keyword, brand)별 노출 수와 키워드 내 점유율"""
+        return self._share('brand')
+
+    def top_brand_share(self, n=5):
+        """키워드별 상위 n개 브랜드 점유율 (나머지는 '기타'로 합산)"""
+        share = self.brand_share.sort_values(['keyword', 'count'], ascending=[True, False])
+        rank = share.groupby('keyword', observed=True).cumcount()
+        top = share[rank < n].copy()
+        top['brand'] = top['brand'].astype(str).replace('', '(브랜드 없음)')
+        rest = (share[rank >= n].groupby('keyword', observed=True)[['count', 'share']].sum().reset_index()
+                .assign(brand='기타'))
+        return pd.concat([top, rest[rest['count'] > 0]], ignore_index=True)
+
+    @cached_property
+    @timed("aggregate")
+    def mall_stats(self):
+        """(keyword, mallName)별 상품 수와 평균가"""
+        return (self.shop.groupby(['keyword', 'mallName'], observed=True)['lprice']
+                .agg(['count', 'mean']).reset_index())
+
+    @cached_property
+    @timed("aggregate")
+    def category_stats(self):
+        """(keyword, category3)별 상품 수와 평균가"""
+        return (self.shop.groupby(['keyword', 'category3'], observed=True)['lprice']
+                .agg(['count', 'mean']).reset_index())
+
+    @cached_property
+    @timed("aggregate")
+    def summary(self):
+        """키워드별 시장 요약: 가격 통계, 브랜드 수, 1위 브랜드 점유율, 판매처 수, 블로그 게시물 수"""
+        brands = self.brand_share[self.brand_share['brand'].astype(str) != '']
+        leader = brands.sort_values('share', ascending=False).drop_duplicates('keyword').set_index('keyword')
+        summary = self.price_stats[['count', 'mean', 'median']].join(pd.DataFrame({
+            'brands': brands.groupby('keyword', observed=True).size(),
+            'top_brand': leader['brand'].astype(str),
+            'top_brand_share': leader['share'],
+            'malls': self.mall_stats.groupby('keyword', observed=True).size(),
+        }))
+        if not self.blog.empty:
+            summary['blog_posts'] = self.blog.groupby('keyword', observed=True).size()
+        return summary
+
+    # --- 블로그 ---
+    @cached_property
+    @timed("aggregate")
+    def blog_weekly(self):
+        """키워드 x 주간 블로그 게시물 수"""
+        if self.blog.empty or 'postdate' not in self.blog.columns:
+            return pd.DataFrame()
+        week = self.blog['postdate'].dt.to_period('W').dt.start_time
+        return pd.crosstab(week, self.blog['keyword'])
@@ -0,0 +1,190 @@
+import json
+import random
+import hashlib
+import argparse
+import threading
+import time
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# openapi.naver.com 검색/데이터랩 엔드포인트를 흉내 내는 로컬 테스트 서버
+BRANDS = ["나이키", "아디다스", "뉴발란스", "아식스", "호카", "삼성전자", "애플", "가민", "샤오미", ""]
+MALLS = ["네이버", "쿠팡", "11번가", "G마켓", "SSG닷컴", "무신사", "ABC마트", "하이마트"]
+CATEGORIES = [("스포츠/레저", "러닝", "런닝화", ""), ("패션잡화", "남성신발", "운동화", "러닝화"),
+              ("디지털/가전", "휴대폰액세서리", "스마트워치", ""), ("디지털/가전", "웨어러블", "스마트밴드", "")]
+
+
+def _seed(*parts):
+    return int(hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:12], 16)
+
+
+def shop_item(query, rank):
+    """검색 순위별로 항상 같은 값을 돌려주는 쇼핑 검색 항목 (실제 응답과 같은 필드 구성)"""
+    rng = random.Random(_seed("shop", query, rank))
+    cats = rng.choice(CATEGORIES)
+    brand = rng.choice(BRANDS)
+    price = rng.randrange(9_900, 450_000, 100)
+    return {
+        "title": f"<b>{query}</b> {brand} 정품 {rng.choice(['남성', '여성', '공용'])} 모델 {rank} &amp; 한정판",
+        "link": f"https://search.shopping.naver.com/catalog/{_seed('pid', query, rank) % 10**11}",
+        "image": f"https://shopping-phinf.pstatic.net/main_{rank}/{rank}.jpg",
+        "lprice": str(price),
+        "hprice": rng.choice(["", str(price + rng.randrange(0, 50_000, 100))]),
+        "mallName": rng.choice(MALLS),
+        "productId": str(_seed("pid", query, rank) % 10**11),
+        "productType": str(rng.choice([1, 2, 3])),
+        "brand": brand,
+        "maker": brand,
+        "category1": cats[0], "category2": cats[1], "category3": cats[2], "category4": cats[3],
+    }
+
+
+def blog_item(query, rank):
+    rng = random.Random(_seed("blog", query, rank))
+    day = date(2025, 12, 31) - timedelta(days=rng.randrange(0, 365))
+    blogger = f"blogger{rng.randrange(0, 300)}"
+    return {
+        "title": f"<b>{query}</b> 실사용 후기 {rank}편 &quot;한 달 사용기&quot;",
+        "link": f"https://blog.naver.com/{blogger}/{_seed('post', query, rank) % 10**12}",
+        "description": f"{query} 구매 후 {rng.randrange(1, 90)}일 사용해 본 솔직한 <b>{query}</b> 리뷰입니다. "
+                       f"착용감, 가격, 배송 모두 {rng.choice(['만족', '보통', '아쉬움'])} &amp; 재구매 의사 있음.",
+        "bloggername": f"{blogger}의 일상",
+        "bloggerlink": f"blog.naver.com/{blogger}",
+        "postdate": day.strftime("%Y%m%d"),
+    }
+
+
+def trend_results(body):
+    """요청 구간의 일자별 ratio (요청 내 최대값 100 기준 상대값)"""
+    start = date.fromisoformat(body["startDate"])
+    end = date.fromisoformat(body["endDate"])
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    series = []
+    for group in body.get("category", []):
+        rng = random.Random(_seed("trend", group["name"]))
+        level = rng.uniform(20, 80)
+        # 날짜에만 의존하는 값이라 구간을 나눠 요청해도 같은 날은 같은 절대값
+        values = [level * (1.3 if d.weekday() >= 5 else 1.0)
+                  * (1 + 0.3 * random.Random(_seed("day", group["name"], d)).random()) for d in days]
+        series.append((group["name"], values))
+    peak = max((max(v) for _, v in series if v), default=1.0)
+    return [{"title": name, "keyword": [name], "data": [
+        {"period": d.isoformat(), "ratio": round(v * 100 / peak, 5)} for d, v in zip(days, values)]}
+        for name, values in series]
+
+
+class MockNaverServer:
+    """
+    지연 시간(latency_ms ± jitter_ms)과 429 응답 비율(error_rate)을 설정할 수 있는 모의 API 서버
+    seed를 고정하면 지연/오류 발생 순서까지 재현 가능
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=50, jitter_ms=20, error_rate=0.0,
+                 total_results=1000, seed=42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.total_results = total_results
+        self.stats = {"requests": 0, "throttled": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            throttled = self._rng.random() < self.error_rate
+            if throttled:
+                self.stats["throttled"] += 1
+        return delay, throttled
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _throttle(self):
+                delay, throttled = server._draw()
+                time.sleep(delay)
+                if throttled:
+                    self._send(429, {"errorMessage": "Rate limit exceeded.", "errorCode": "012"},
+                               {"Retry-After": "0"})
+                return throttled
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if self._throttle():
+                    return
+                make = {"/v1/search/shop.json": shop_item, "/v1/search/blog.json": blog_item}.get(parsed.path)
+                if make is None:
+                    self._send(404, {"errorMessage": "Not Found"})
+                    return
+                keyword = query.get("query", [""])[0]
+                start = int(query.get("start", ["1"])[0])
+                display = int(query.get("display", ["10"])[0])
+                end = min(start + display - 1, server.total_results)
+                self._send(200, {
+                    "lastBuildDate": time.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+                    "total": server.total_results, "start": start, "display": max(0, end - start + 1),
+                    "items": [make(keyword, rank) for rank in range(start, end + 1)],
+                })
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self._throttle():
+                    return
+                if urlparse(self.path).path != "/v1/datalab/shopping/categories":
+                    self._send(404, {"errorMessage": "Not Found"})
+                    return
+                self._send(200, {"startDate": body["startDate"], "endDate": body["endDate"],
+                                 "timeUnit": body.get("timeUnit", "date"), "results": trend_results(body)})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="네이버 오픈 API 모의 서버")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    mock = MockNaverServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, seed=args.seed)
+    print(f"모의 서버 실행 중: {mock.url} (NAVER_API_BASE로 지정해 사용)")
+    mock.httpd.serve_forever()
@@ -0,0 +1,214 @@
+import os
+import random
+import threading
+import time
+import contextvars
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from instrumentation import span
+import quota
+
+load_dotenv()
+
+# 엔드포인트 기본 주소 (로컬 모의 서버 테스트 시 NAVER_API_BASE로 교체)
+API_BASE = os.getenv("NAVER_API_BASE", "https://openapi.naver.com").rstrip("/")
+TREND_URL = f"{API_BASE}/v1/datalab/shopping/categories"
+BLOG_URL = f"{API_BASE}/v1/search/blog.json"
+SHOP_URL = f"{API_BASE}/v1/search/shop.json"
+
+# 네이버 오픈 API 초당 호출 제한 기본값
+DEFAULT_RATE_PER_SEC = float(os.getenv("NAVER_RATE_PER_SEC", "10"))
+
+# 커넥션 풀 / 재시도 기본값
+DEFAULT_POOL_SIZE = int(os.getenv("NAVER_POOL_SIZE", "16"))
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 검색 API 페이지네이션 한도 (display 최대 100, start 최대 1000)
+MAX_DISPLAY = 100
+MAX_RESULTS = 1000
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 속도 제한기 (여러 스레드에서 공유 가능)
+    """
+
+    def __init__(self, rate_per_sec=DEFAULT_RATE_PER_SEC, capacity=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate_per_sec))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """토큰이 생길 때까지 대기한 뒤 소비"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+
+def _retry_after_seconds(response):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환, 없으면 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class NaverClient:
+    """
+    모든 네이버 API 호출이 공유하는 HTTP 클라이언트
+    - keep-alive 커넥션 풀을 가진 단일 requests.Session 사용 (TLS 핸드셰이크 재사용)
+    - 인증 헤더는 세션 생성 시 한 번만 구성
+    - 429/5xx 및 네트워크 오류는 지수 백오프 + 지터로 재시도하며 Retry-After를 우선 적용
+    - 매 시도 전에 엔드포인트별 일일 한도를 차감 (한도 초과 시 quota.QuotaExceeded)
+    """
+
+    def __init__(self, client_id, client_secret, pool_size=DEFAULT_POOL_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.retries = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "X-Naver-Client-Id": client_id or "",
+            "X-Naver-Client-Secret": client_secret or "",
+        })
+
+    def _sleep_before_retry(self, attempt, response=None):
+        delay = _retry_after_seconds(response) if response is not None else None
+        if delay is None:
+            # full jitter: 0 ~ backoff * 2^attempt
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+        with self._lock:
+            self.retries += 1
+        time.sleep(delay)
+
+    def request(self, method, url, limiter=None, priority=None, **kwargs):
+        """
+        재시도 정책을 적용해 요청을 보내고 마지막 응답을 반환 (재시도 소진 시 오류 응답 그대로 반환)
+        priority: 일일 한도 우선순위 (quota.INTERACTIVE | quota.BATCH, 없으면 interactive)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            quota.consume(url, priority)
+            if limiter:
+                limiter.acquire()
+            try:
+                with span("api", urlparse(url).path):
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            self._sleep_before_retry(attempt, response)
+        return response
+
+    def fetch_json(self, method, url, params=None, body=None, limiter=None, priority=None):
+        """요청 후 HTTP 오류는 예외로 올리고 파싱된 JSON 본문을 반환"""
+        response = self.request(method, url, limiter=limiter, priority=priority, params=params, json=body)
+        response.raise_for_status()
+        return response.json()
+
+    def connection_stats(self):
+        """커넥션 풀 기준 요청 수 / 신규 연결 수 / 재사용 횟수 / 재시도 횟수"""
+        requests_made = connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "http_requests": requests_made,
+            "new_connections": connections,
+            "reused_connections": max(0, requests_made - connections),
+            "retries": self.retries,
+        }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(client_id, client_secret, **kwargs):
+    """자격 증명별로 프로세스 내에서 하나의 NaverClient를 공유"""
+    key = (client_id, client_secret)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = NaverClient(client_id, client_secret, **kwargs)
+        return _clients[key]
+
+
+def iter_search_pages(client, url, query, max_results=MAX_DISPLAY, dedup_key="link",
+                      limiter=None, max_workers=10, priority=None):
+    """
+    검색 API를 start 파라미터로 페이지네이션하며 페이지가 도착하는 대로 (start, 항목 리스트)를 생성
+    - 첫 페이지의 total로 실제 필요한 페이지 수를 계산한 뒤 나머지 페이지는 병렬 요청
+    - dedup_key(productId/link) 기준으로 페이지 간 중복 항목 제거
+    """
+    max_results = max(1, min(int(max_results), MAX_RESULTS))
+    seen = set()
+
+    def fetch(start):
+        params = {"query": query, "display": min(MAX_DISPLAY, max_results - start + 1), "start": start}
+        return client.fetch_json("GET", url, params=params, limiter=limiter, priority=priority)
+
+    def unique(items):
+        fresh = []
+        for item in items:
+            key = item.get(dedup_key)
+            if key in seen:
+                continue
+            seen.add(key)
+            fresh.append(item)
+        return fresh
+
+    first = fetch(1)
+    yield 1, unique(first.get("items", []))
+
+    total = min(max_results, int(first.get("total", 0)))
+    starts = list(range(1 + MAX_DISPLAY, total + 1, MAX_DISPLAY))
+    if not starts:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(starts))) as executor:
+        # 작업 스레드의 API 측정도 호출한 실행 기록에 남도록 페이지마다 컨텍스트 복사
+        futures = {executor.submit(contextvars.copy_context().run, fetch, start): start for start in starts}
+        for future in as_completed(futures):
+            yield futures[future], unique(future.result().get("items", []))
@@ -1,108 +1,464 @@
 import os
+import argparse
+import time
 import requests
-import json
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from datalab import fetch_trend_batched, merge_with_overlap, request_trend
+import manifest
+import quota
+import collection_jobs
+import blog_index
+import product_history
+import instrumentation
+from data_manager import load_latest
+from preprocess import normalize_frame
+from snapshot_store import SnapshotWriter, publish, safe_keyword, snapshot_file, staging_file, write_snapshot
+from naver_api import (BLOG_URL, SHOP_URL, DEFAULT_RATE_PER_SEC, MAX_DISPLAY,
+                       TokenBucket, get_client, iter_search_pages)
 
 # .env 로드
 load_dotenv()
 CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
+# 저장 형식: parquet(기본) | csv | both
+SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT", "parquet")
+# 트렌드 수집 시작일 및 증분 수집 시 재요청할 겹침 구간(일)
+TREND_START_DATE = "2025-01-01"
+TREND_OVERLAP_DAYS = 14
+# 수집기 호출은 모두 priority=quota.BATCH로 일일 한도를 차감 (대시보드 예약분은 사용하지 않음)
 
-def save_to_csv(df, prefix, keyword, year=""):
+def api_client():
+    """수집기 전체가 공유하는 커넥션 풀 기반 API 클라이언트"""
+    return get_client(CLIENT_ID, CLIENT_SECRET)
+
+def csv_path(prefix, keyword, year=""):
     """
-    데이터프레임을 지시서 규칙에 따라 CSV로 저장
+    지시서 규칙에 따른 CSV 경로
     파일명 형식: [내용]_[기간]_[수집날짜].csv
     """
     today = datetime.now().strftime("%Y%m%d")
     year_str = f"_{year}" if year else ""
-    # 키워드 특수문자 제거 (파일명 안전용)
-    safe_keyword = keyword.replace("/", "_").replace(" ", "")
-    filename = f"{prefix}_{safe_keyword}{year_str}_{today}.csv"
-    
-    # data 폴더가 없으면 생성
-    if not os.path.exists("data"):
-        os.makedirs("data")
-        
-    path = os.path.join("data", filename)
-    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return os.path.join("data", f"{prefix}_{safe_keyword(keyword)}{year_str}_{today}.csv")
+
+def save_to_csv(df, prefix, keyword, year=""):
+    """데이터프레임을 CSV로 저장 (임시 파일에 쓴 뒤 rename해 읽는 쪽이 쓰는 중인 파일을 보지 않도록 함)"""
+    today = datetime.now().strftime("%Y%m%d")
+    tmp = staging_file(".csv")
+    df.to_csv(tmp, index=False, encoding="utf-8-sig")
+    path = publish(tmp, csv_path(prefix, keyword, year))
+    manifest.register(prefix, keyword, today, "csv", path, df)
     print(f"성공적으로 저장됨: {path}")
 
-def get_shopping_trend(keyword, cat_id):
-    """네이버 쇼핑인사이트 분야별 트렌드 API 호출 (2025년 데이터)"""
-    url = "https://openapi.naver.com/v1/datalab/shopping/categories"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET,
-        "Content-Type": "application/json"
-    }
-    body = {
-        "startDate": "2025-01-01",
-        "endDate": "2025-12-31",
-        "timeUnit": "date",
-        "category": [{"name": keyword, "param": [cat_id]}],
-        "device": "",
-        "gender": "",
-        "ages": []
-    }
-    response = requests.post(url, headers=headers, data=json.dumps(body))
-    if response.status_code == 200:
-        res_json = response.json()
-        if "results" in res_json and len(res_json["results"]) > 0:
-            data = res_json["results"][0]["data"]
-            df = pd.DataFrame(data)
-            save_to_csv(df, "shopping_trend", keyword, "2025")
-        else:
-            print(f"데이터 결과가 없습니다: {keyword}")
+@instrumentation.timed("save")
+def save_snapshot(df, prefix, keyword, year=""):
+    """SNAPSHOT_FORMAT에 따라 Parquet 스냅샷 저장소 및/또는 CSV로 저장"""
+    if SNAPSHOT_FORMAT in ("parquet", "both"):
+        today = datetime.now().strftime("%Y%m%d")
+        path = write_snapshot(df, prefix, keyword, today)
+        manifest.register(prefix, keyword, today, "parquet", path, df)
+        print(f"성공적으로 저장됨: {path}")
+    if SNAPSHOT_FORMAT in ("csv", "both"):
+        save_to_csv(df, prefix, keyword, year)
+
+def trend_range(target):
+    """대상의 트렌드 조회 구간 (작업 파일에 start/end가 없으면 TREND_START_DATE부터 어제까지)"""
+    return (target.get("start") or TREND_START_DATE,
+            target.get("end") or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"))
+
+def get_shopping_trends_batched(targets, limiter=None):
+    """
+    여러 대상의 쇼핑 트렌드를 요청당 최대 3개 그룹으로 묶어 호출 (대상별 start/end 구간)
+    배치 간 비율은 첫 키워드(앵커) 기준으로 환산되어 키워드 간 직접 비교 가능
+    한 요청의 그룹은 같은 구간이어야 하므로 조회 구간이 같은 대상끼리 묶어 배치
+    """
+    by_range = {}
+    for t in targets:
+        by_range.setdefault(trend_range(t), []).append(t)
+
+    results = {}
+    for (start_date, end_date), batch in by_range.items():
+        groups = [{"name": t["keyword"], "param": [t["cat_id"]]} for t in batch]
+        try:
+            combined = fetch_trend_batched(api_client(), groups, start_date, end_date, limiter=limiter,
+                                           priority=quota.BATCH)
+        except requests.RequestException as e:
+            print(f"쇼핑 트렌드 API 오류 (배치 {start_date}~{end_date}): {e}")
+            continue
+        for kw, df in combined.groupby("keyword", sort=False):
+            df = df[["period", "ratio"]].reset_index(drop=True)
+            save_snapshot(df, "shopping_trend", kw, start_date[:4])
+            results[kw] = df
+    for t in targets:
+        if t["keyword"] not in results:
+            print(f"데이터 결과가 없습니다: {t['keyword']}")
+    return results
+
+def get_shopping_trend_incremental(keyword, cat_id, end_date=None, limiter=None):
+    """
+    저장된 최신 트렌드 스냅샷 이후 날짜만 요청해 기존 시계열에 병합 (일일 갱신용)
+    - DataLab ratio는 요청 구간 기준 상대값이므로 마지막 TREND_OVERLAP_DAYS일을 함께 재요청해 척도를 맞춤
+    - 저장된 스냅샷이 없으면 TREND_START_DATE부터 전체 구간을 수집
+    """
+    end_date = end_date or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    stored = load_latest("shopping_trend", keyword, columns=["period", "ratio"])
+    if stored is not None and not stored.empty:
+        last = stored["period"].max()
+        if last.strftime("%Y-%m-%d") >= end_date:
+            print(f"이미 최신 상태입니다: {keyword} ({last:%Y-%m-%d})")
+            return stored
+        start_date = (last - timedelta(days=TREND_OVERLAP_DAYS - 1)).strftime("%Y-%m-%d")
     else:
-        print(f"쇼핑 트렌드 API 오류 ({keyword}): {response.status_code} - {response.text}")
-
-def get_blog_posts(keyword):
-    """네이버 블로그 검색 API 호출 (최근 게시물 100개)"""
-    url = f"https://openapi.naver.com/v1/search/blog.json?query={keyword}&display=100"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET
+        stored, start_date = None, TREND_START_DATE
+
+    try:
+        fresh = request_trend(api_client(), [{"name": keyword, "param": [cat_id]}], start_date, end_date,
+                              limiter=limiter, priority=quota.BATCH)
+    except requests.RequestException as e:
+        print(f"쇼핑 트렌드 API 오류 ({keyword}): {e}")
+        return None
+    if fresh.empty:
+        print(f"데이터 결과가 없습니다: {keyword}")
+        return stored
+    fresh = fresh[["period", "ratio"]].assign(period=lambda d: pd.to_datetime(d["period"]))
+
+    merged = merge_with_overlap(stored, fresh)
+    added = len(merged) - (len(stored) if stored is not None else 0)
+    print(f"증분 수집: {keyword} {start_date}~{end_date} 요청, 신규 {added}일 추가")
+    save_snapshot(merged, "shopping_trend", keyword, start_date[:4])
+    return merged
+
+def get_shopping_trend_range(keyword, cat_id, start_date=None, end_date=None, limiter=None):
+    """키워드 하나의 쇼핑 트렌드를 지정 구간으로 수집 (구간이 없으면 TREND_START_DATE부터 어제까지)"""
+    start_date = start_date or TREND_START_DATE
+    end_date = end_date or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        df = request_trend(api_client(), [{"name": keyword, "param": [cat_id]}], start_date, end_date,
+                           limiter=limiter, priority=quota.BATCH)
+    except requests.RequestException as e:
+        print(f"쇼핑 트렌드 API 오류 ({keyword}): {e}")
+        return None
+    if df.empty:
+        print(f"데이터 결과가 없습니다: {keyword}")
+        return None
+    df = df[["period", "ratio"]].reset_index(drop=True)
+    save_snapshot(df, "shopping_trend", keyword, start_date[:4])
+    return df
+
+def ordered_pages(pages):
+    """
+    도착 순서대로 들어오는 (start, 항목) 페이지를 start 순서(검색 순위 순)로 내보냄
+    앞 페이지보다 먼저 도착한 페이지만 잠시 보관하므로 전체 결과를 모아 두지 않음
+    """
+    pending, next_start = {}, 1
+    for start, items in pages:
+        pending[start] = items
+        while next_start in pending:
+            yield pending.pop(next_start)
+            next_start += MAX_DISPLAY
+    for start in sorted(pending):
+        yield pending[start]
+
+def stream_search(prefix, url, keyword, dedup_key, limiter=None, max_results=MAX_DISPLAY, on_page=None):
+    """
+    검색 결과를 페이지 단위로 정제해 도착하는 대로 스냅샷(SNAPSHOT_FORMAT)에 이어 쓰고 저장 통계를 반환
+    - 메모리에는 처리 중인 페이지(최대 100건)와 순서를 기다리는 페이지만 있어 수집량과 무관하게 일정
+    - on_page(정제된 페이지)로 색인 등 페이지 단위 후처리를 함께 수행
+    - API 오류 시 임시 파일을 지우고 예외를 그대로 전달 (기존 스냅샷은 그대로 유지)
+    """
+    today = datetime.now().strftime("%Y%m%d")
+    writers = []
+    if SNAPSHOT_FORMAT in ("parquet", "both"):
+        writers.append(("parquet", SnapshotWriter(snapshot_file(prefix, keyword, today), prefix, "parquet")))
+    if SNAPSHOT_FORMAT in ("csv", "both"):
+        writers.append(("csv", SnapshotWriter(csv_path(prefix, keyword), prefix, "csv")))
+    stats = {"rows": 0, "before_bytes": 0, "after_bytes": 0}
+    try:
+        for items in ordered_pages(iter_search_pages(api_client(), url, keyword, max_results=max_results,
+                                                     dedup_key=dedup_key, limiter=limiter,
+                                                     priority=quota.BATCH)):
+            raw = pd.DataFrame(items)
+            page = normalize_frame(raw, prefix)
+            for _, writer in writers:
+                writer.write(raw, page)
+            if on_page and not page.empty:
+                on_page(page)
+            stats["rows"] += len(page)
+            stats["before_bytes"] += page.attrs["memory"]["before_bytes"]
+            stats["after_bytes"] += page.attrs["memory"]["after_bytes"]
+    except BaseException:
+        for _, writer in writers:
+            writer.abort()
+        raise
+    for fmt, writer in writers:
+        path = writer.close()
+        if path:
+            manifest.register(prefix, keyword, today, fmt, path, rows=writer.rows, schema=writer.schema)
+            print(f"성공적으로 저장됨: {path}")
+    stats["peak_page_bytes"] = max((writer.peak_page_bytes for _, writer in writers), default=0)
+    return stats
+
+def _stream_summary(stats):
+    return (f"{stats['rows']}건, 정제 전후 {stats['before_bytes'] / 1e6:.1f}MB → {stats['after_bytes'] / 1e6:.1f}MB "
+            f"(페이지 최대 {stats['peak_page_bytes'] / 1e6:.2f}MB)")
+
+def get_blog_posts(keyword, limiter=None, max_results=MAX_DISPLAY):
+    """
+    네이버 블로그 검색 API 호출 (최근 게시물 최대 max_results개, 페이지 병렬 수집)
+    페이지를 받는 대로 저장/색인하고 저장한 게시물 수를 반환 (실패 시 None)
+    """
+    indexed = 0
+
+    def index(page):
+        # 전문 검색 색인에는 처음 보는 게시물만 추가
+        nonlocal indexed
+        indexed += blog_index.index_posts(page, keyword)
+
+    try:
+        stats = stream_search("blog_posts", BLOG_URL, keyword, "link", limiter, max_results, on_page=index)
+    except requests.RequestException as e:
+        print(f"블로그 검색 API 오류 ({keyword}): {e}")
+        return None
+    print(f"블로그 데이터 저장 ({keyword}): {_stream_summary(stats)}")
+    print(f"블로그 색인 반영 ({keyword}): 새 게시물 {indexed}건")
+    return stats["rows"]
+
+def get_shop_products(keyword, limiter=None, max_results=MAX_DISPLAY):
+    """
+    네이버 쇼핑 검색 API 호출 (최근 상품 최대 max_results개, 페이지 병렬 수집)
+    페이지를 받는 대로 저장하고 저장한 상품 수를 반환 (실패 시 None)
+    """
+    columns = ["productId"] + product_history.STATIC_COLUMNS + ["lprice", "hprice"]
+    pages = []
+
+    def keep(page):
+        # 가격 이력에 필요한 컬럼만 저장한 페이지 그대로(검색 순위 순) 모아 둠
+        # (같은 날 다른 형식의 스냅샷이 있어도 이번 수집 결과만 반영)
+        pages.append(page[[col for col in columns if col in page.columns]])
+
+    try:
+        stats = stream_search("shop_products", SHOP_URL, keyword, "productId", limiter, max_results, on_page=keep)
+    except requests.RequestException as e:
+        print(f"쇼핑 검색 API 오류 ({keyword}): {e}")
+        return None
+    print(f"쇼핑 데이터 저장 ({keyword}): {_stream_summary(stats)}")
+    if pages:
+        # 상품 속성은 한 번만, 가격/판매처/브랜드는 직전 수집 대비 변경분만 이력 저장소에 기록 (순위는 큰 변동만)
+        df = pd.concat(pages, ignore_index=True)
+        products, changes = product_history.record_snapshot(df, keyword, datetime.now().strftime("%Y%m%d"))
+        print(f"가격 이력 반영 ({keyword}): 신규 상품 {products}개, 변경 {changes}건")
+    return stats["rows"]
+
+# 작업 종류별 기본 우선순위 (작을수록 먼저, 0은 한도가 부족해도 실행)
+TASK_PRIORITY = {"trend": 0, "shop": 1, "blog": 2}
+
+def make_task(target, kind, max_results=MAX_DISPLAY):
+    """
+    (대상, 항목) 하나를 한도 계획용 작업으로 변환
+    대상에 priority가 있으면 작업 우선순위에 더함 (예: 1이면 해당 대상 작업 전체를 한 단계 뒤로)
+    """
+    # 트렌드는 배치 요청이라 대상당 1회 이하로 추정
+    calls = 1 if kind == "trend" else quota.estimate_search_calls(max_results)
+    return {
+        "kind": kind, "keyword": target["keyword"], "cat_id": target["cat_id"],
+        "endpoint": "datalab" if kind == "trend" else "search",
+        "start": target.get("start"), "end": target.get("end"),
+        "calls": calls, "priority": TASK_PRIORITY[kind] + target.get("priority", 0),
     }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        items = response.json().get("items", [])
-        df = pd.DataFrame(items)
-        save_to_csv(df, "blog_posts", keyword)
-    else:
-        print(f"블로그 검색 API 오류 ({keyword}): {response.status_code}")
-
-def get_shop_products(keyword):
-    """네이버 쇼핑 검색 API 호출 (최근 상품 100개)"""
-    url = f"https://openapi.naver.com/v1/search/shop.json?query={keyword}&display=100"
-    headers = {
-        "X-Naver-Client-Id": CLIENT_ID,
-        "X-Naver-Client-Secret": CLIENT_SECRET
+
+def plan_tasks(targets, max_results=MAX_DISPLAY):
+    """대상별 트렌드/쇼핑/블로그 작업을 만들고 이전 실행에서 미룬 작업과 합쳐 남은 배치 한도에 맞게 선별"""
+    tasks = {}
+    for task in quota.pop_deferred():
+        tasks[(task["kind"], task["keyword"])] = task
+    for target in targets:
+        for kind in collection_jobs.DATASETS:
+            if kind in target.get("datasets", collection_jobs.DATASETS):
+                tasks[(kind, target["keyword"])] = make_task(target, kind, max_results)
+    admitted, deferred = quota.plan(list(tasks.values()))
+    if deferred:
+        quota.defer(deferred)
+        print(f"일일 한도 부족으로 {len(deferred)}개 작업을 다음 실행으로 미룸: "
+              + ", ".join(f"{t['kind']}:{t['keyword']}" for t in deferred))
+    return admitted, deferred
+
+def plan_jobs(targets, max_results=MAX_DISPLAY):
+    """
+    --resume 실행 전 오늘 남은 (대상, 항목) 작업을 남은 배치 한도와 우선순위에 맞게 선별
+    항목(datasets)을 이번에 실행할 것만 남긴 대상 목록을 반환 (체크포인트 식별자는 그대로)
+    미룬 작업은 체크포인트가 없으므로 다음 실행 때 다시 대상이 됨
+    """
+    units = collection_jobs.pending_units(targets)
+    admitted, deferred = quota.plan([dict(make_task(target, dataset, max_results), unit=i)
+                                     for i, (target, dataset) in enumerate(units)])
+    if deferred:
+        print(f"일일 한도 부족으로 {len(deferred)}개 작업을 다음 실행으로 미룸: "
+              + ", ".join(f"{t['kind']}:{t['keyword']}" for t in deferred))
+    datasets = {}
+    for task in admitted:
+        target, dataset = units[task["unit"]]
+        datasets.setdefault(collection_jobs.target_key(target), set()).add(dataset)
+    return [{**target, "datasets": tuple(d for d in target["datasets"]
+                                         if d in datasets.get(collection_jobs.target_key(target), ()))}
+            for target in targets]
+
+def collect_target(target, dataset, limiter=None, max_results=MAX_DISPLAY, incremental=False):
+    """
+    작업 파일의 (대상, 항목) 하나를 수집 (트렌드는 대상의 start/end 구간 사용)
+    incremental이면 트렌드는 저장된 스냅샷 이후 날짜만 수집해 병합 (종료일은 대상의 end)
+    """
+    kw = target["keyword"]
+    if dataset == "trend" and incremental:
+        return get_shopping_trend_incremental(kw, target["cat_id"], target.get("end"), limiter)
+    if dataset == "trend":
+        return get_shopping_trend_range(kw, target["cat_id"], target.get("start"), target.get("end"), limiter)
+    if dataset == "shop":
+        return get_shop_products(kw, limiter, max_results)
+    return get_blog_posts(kw, limiter, max_results)
+
+def collect_trend_targets(targets, limiter=None):
+    """작업 파일의 트렌드 항목 여러 개를 구간별 앵커 배치로 한 번에 수집하고 성공한 대상 목록 반환"""
+    results = get_shopping_trends_batched(targets, limiter)
+    return [target for target in targets if target["keyword"] in results]
+
+def quota_exhausted(dataset):
+    """해당 항목이 쓰는 엔드포인트의 배치 한도가 모두 소진되었는지 여부"""
+    endpoint = "datalab" if dataset == "trend" else "search"
+    return quota.usage()[endpoint]["batch_remaining"] <= 0
+
+def collect_concurrently(targets, max_workers=8, rate_per_sec=DEFAULT_RATE_PER_SEC, max_results=MAX_DISPLAY,
+                         incremental=False):
+    """
+    모든 대상의 트렌드/블로그/쇼핑 호출을 스레드 풀로 동시에 실행
+    공유 토큰 버킷으로 초당 호출 수를 제한하고, 처리량 통계를 반환
+    배치 작업이므로 대시보드 예약분을 제외한 일일 한도 안에서 우선순위가 높은 작업부터 실행
+    """
+    limiter = TokenBucket(rate_per_sec)
+    admitted, deferred = plan_tasks(targets, max_results)
+    conn_before = api_client().connection_stats()
+    started = time.monotonic()
+    succeeded = failed = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 트렌드는 키워드 3개씩 묶은 배치 요청으로 한 번에 처리 (증분 모드는 키워드별 요청)
+        trend_targets = [{"keyword": t["keyword"], "cat_id": t["cat_id"], "start": t.get("start"), "end": t.get("end")}
+                         for t in admitted if t["kind"] == "trend"]
+        trend_future = None
+        if trend_targets and not incremental:
+            trend_future = executor.submit(get_shopping_trends_batched, trend_targets, limiter)
+        futures = {}
+        for task in admitted:
+            kw = task["keyword"]
+            if task["kind"] == "trend" and incremental:
+                futures[executor.submit(get_shopping_trend_incremental, kw, task["cat_id"], None, limiter)] = kw
+            elif task["kind"] == "blog":
+                futures[executor.submit(get_blog_posts, kw, limiter, max_results)] = kw
+            elif task["kind"] == "shop":
+                futures[executor.submit(get_shop_products, kw, limiter, max_results)] = kw
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"수집 중 예외 발생 ({futures[future]}): {e}")
+                result = None
+            if result is None:
+                failed += 1
+            else:
+                succeeded += 1
+
+        if trend_future is not None:
+            trends = trend_future.result()
+            succeeded += len(trends)
+            failed += len(trend_targets) - len(trends)
+
+    elapsed = time.monotonic() - started
+    conn = api_client().connection_stats()
+    http_requests = conn["http_requests"] - conn_before["http_requests"]
+    stats = {
+        "keywords": len(targets),
+        "tasks": succeeded + failed,
+        "succeeded": succeeded,
+        "failed": failed,
+        "deferred": len(deferred),
+        "http_requests": http_requests,
+        "new_connections": conn["new_connections"] - conn_before["new_connections"],
+        "reused_connections": conn["reused_connections"] - conn_before["reused_connections"],
+        "retries": conn["retries"] - conn_before["retries"],
+        "elapsed_sec": round(elapsed, 3),
+        "requests_per_sec": round(http_requests / elapsed, 2) if elapsed else 0.0,
+        "keywords_per_min": round(len(targets) / elapsed * 60, 2) if elapsed else 0.0,
     }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        items = response.json().get("items", [])
-        df = pd.DataFrame(items)
-        save_to_csv(df, "shop_products", keyword)
-    else:
-        print(f"쇼핑 검색 API 오류 ({keyword}): {response.status_code}")
+    print(f"\n처리량: {stats['requests_per_sec']} req/s, {stats['keywords_per_min']} keywords/min "
+          f"(작업 {stats['tasks']}건, 실패 {failed}건, {stats['elapsed_sec']}초)")
+    print(f"커넥션 재사용: HTTP 요청 {http_requests}건 중 {stats['reused_connections']}건 "
+          f"(신규 연결 {stats['new_connections']}건, 재시도 {stats['retries']}건)")
+    return stats
 
 if __name__ == "__main__":
-    # 수집 대상 정의 (키워드 및 관련 카테고리 ID)
-    targets = [
-        {"keyword": "런닝화", "cat_id": "50000008"},  # 스포츠/레저
-        {"keyword": "스마트워치", "cat_id": "50000262"}  # 디지털/가전 > 휴대폰액세서리 > 스마트워치
-    ]
-    
+    parser = argparse.ArgumentParser(description="네이버 API 데이터 수집기")
+    parser.add_argument("--concurrent", action="store_true", help="스레드 풀 기반 동시 수집 모드")
+    parser.add_argument("--workers", type=int, default=8, help="동시 실행 스레드 수")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_SEC, help="초당 최대 API 호출 수")
+    parser.add_argument("--format", choices=["parquet", "csv", "both"], default=SNAPSHOT_FORMAT,
+                        help="스냅샷 저장 형식")
+    parser.add_argument("--incremental", action="store_true",
+                        help="트렌드는 저장된 스냅샷 이후 날짜만 수집해 병합")
+    parser.add_argument("--metrics-file", help="구간별 측정 결과 저장 경로 (.prom 또는 .json)")
+    parser.add_argument("--max-results", type=int, default=MAX_DISPLAY, help="블로그/쇼핑 검색 수집 건수 (최대 1000)")
+    parser.add_argument("--jobs", default=collection_jobs.DEFAULT_JOB_FILE,
+                        help="수집 대상 작업 파일 (JSON/CSV: keyword, cat_id, start, end, datasets)")
+    parser.add_argument("--resume", action="store_true",
+                        help="체크포인트 기반 작업 실행 (중단 지점부터 이어서, 오늘 수집한 대상은 건너뜀)")
+    parser.add_argument("--reset-checkpoints", action="store_true", help="작업 파일 대상의 체크포인트 초기화")
+    args = parser.parse_args()
+    SNAPSHOT_FORMAT = args.format
+    if args.metrics_file:
+        instrumentation.set_enabled(True)
+        instrumentation.start_run()
+
+    # 수집 대상 정의 (키워드 및 관련 카테고리 ID)는 작업 파일에서 읽음
+    targets = collection_jobs.load_jobs(args.jobs)
+    if args.reset_checkpoints:
+        collection_jobs.reset(targets)
+
     if not CLIENT_ID or not CLIENT_SECRET:
         print("에러: .env 파일에 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET이 설정되어야 합니다.")
+    elif args.resume:
+        limiter = TokenBucket(args.rate)
+        # 트렌드는 남은 대상을 모아 앵커 배치로 요청 (증분 모드는 대상별로 새 날짜만 요청)
+        collect_batch = {} if args.incremental else {"trend": lambda group: collect_trend_targets(group, limiter)}
+        collection_jobs.run_jobs(plan_jobs(targets, args.max_results), lambda target, dataset: collect_target(target, dataset, limiter,
+                                                                                 args.max_results, args.incremental),
+                                 max_workers=args.workers, should_stop=quota_exhausted, collect_batch=collect_batch)
+        print("\n모든 데이터 수집 작업이 완료되었습니다.")
+    elif args.concurrent:
+        collect_concurrently(targets, max_workers=args.workers, rate_per_sec=args.rate,
+                             max_results=args.max_results, incremental=args.incremental)
+        print("\n모든 데이터 수집 작업이 완료되었습니다.")
     else:
-        for target in targets:
-            kw = target["keyword"]
-            cid = target["cat_id"]
-            print(f"\n=== {kw} 데이터 수집 시작 ===")
-            get_shopping_trend(kw, cid)
-            get_blog_posts(kw)
-            get_shop_products(kw)
+        # 순차 모드도 남은 배치 한도에 맞춰 우선순위가 높은 작업부터 실행하고 나머지는 다음 실행으로 미룸
+        admitted, _ = plan_tasks(targets, args.max_results)
+        trend_tasks = [t for t in admitted if t["kind"] == "trend"]
+        if args.incremental:
+            print("\n=== 쇼핑 트렌드 증분 수집 시작 ===")
+            for task in trend_tasks:
+                get_shopping_trend_incremental(task["keyword"], task["cat_id"], task.get("end"))
+        elif trend_tasks:
+            print("\n=== 쇼핑 트렌드 배치 수집 시작 ===")
+            get_shopping_trends_batched(trend_tasks)
+        for task in admitted:
+            if task["kind"] == "trend":
+                continue
+            print(f"\n=== {task['keyword']} {'블로그' if task['kind'] == 'blog' else '쇼핑'} 데이터 수집 시작 ===")
+            if task["kind"] == "blog":
+                get_blog_posts(task["keyword"], max_results=args.max_results)
+            else:
+                get_shop_products(task["keyword"], max_results=args.max_results)
         print("\n모든 데이터 수집 작업이 완료되었습니다.")
+
+    if args.metrics_file:
+        instrumentation.write_metrics(args.metrics_file)
+        print(f"측정 결과 저장됨: {args.metrics_file}")
@@ -0,0 +1,124 @@
+import re
+import html
+import numpy as np
+import pandas as pd
+
+# 반복도가 높은 문자열 컬럼 -> category dtype
+CATEGORY_COLUMNS = {
+    "shop_products": ["brand", "maker", "mallName", "category1", "category2", "category3", "category4"],
+    "blog_posts": ["bloggername", "bloggerlink"],
+    "shopping_trend": ["keyword"],
+}
+# 텍스트로 들어오는 수치형 컬럼 -> 값 범위에 맞는 최소 크기 정수 dtype
+INTEGER_COLUMNS = {
+    "shop_products": ["lprice", "hprice", "productId", "productType"],
+    "blog_posts": [],
+    "shopping_trend": [],
+}
+FLOAT_COLUMNS = {
+    "shopping_trend": ["ratio"],
+}
+# HTML 태그(<b> 등) 제거 및 엔티티(&quot; 등) 복원 대상 텍스트 컬럼
+TEXT_COLUMNS = {
+    "shop_products": ["title"],
+    "blog_posts": ["title", "description"],
+}
+DATE_COLUMNS = {
+    "shopping_trend": {"period": None},
+    "blog_posts": {"postdate": "%Y%m%d"},
+}
+
+
+# 태그 또는 엔티티를 한 번의 정규식 스캔으로 찾아 치환
+_MARKUP = re.compile(r"<[^>]*>|&(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);")
+
+
+def _replace_markup(match):
+    token = match.group(0)
+    return "" if token.startswith("<") else html.unescape(token)
+
+
+def clean_text(series):
+    """HTML 태그 제거와 엔티티 복원을 한 번의 벡터화 패스로 처리"""
+    return series.astype("string").str.replace(_MARKUP, _replace_markup, regex=True).str.strip()
+
+
+def add_text_features(df, dataset):
+    """정제된 텍스트 기반 파생 변수 (상품명 길이, 브랜드명 길이/존재 여부)"""
+    if "title" in df.columns:
+        df["title_len"] = df["title"].str.len().fillna(0).astype("int16")
+    if dataset == "shop_products" and "brand" in df.columns:
+        brand_len = df["brand"].astype("string").str.strip().str.len().fillna(0)
+        df["brand_len"] = brand_len.astype("int16")
+        df["has_brand"] = (brand_len > 0).astype(bool)
+    return df
+
+
+def to_sized_int(series):
+    """
+    수치 변환 후 값 범위에 맞는 가장 작은 정수 dtype으로 변환
+    결측치가 있으면 nullable 정수(Int8~Int64), 소수가 섞여 있으면 float 유지
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    present = values.dropna()
+    if present.empty:
+        return values.astype("Int8")
+    if not (present % 1 == 0).all():
+        return values
+    lo, hi = present.min(), present.max()
+    for dtype in ("int8", "int16", "int32", "int64"):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            break
+    return values.astype(dtype.capitalize() if values.isna().any() else dtype)
+
+
+def to_datetime(series, fmt=None):
+    """
+    날짜 변환: 원본 형식(fmt)으로 먼저 파싱하고, 실패한 값은 ISO 형식으로 다시 파싱
+    (정규화 후 CSV로 저장된 값은 '2025-03-19'처럼 ISO 텍스트로 남아 있음)
+    """
+    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+    retry = parsed.isna() & series.notna() & (series.astype("string").str.strip() != "")
+    if fmt and retry.any():
+        parsed[retry] = pd.to_datetime(series[retry], format="ISO8601", errors="coerce")
+    return parsed
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def normalize_frame(df, dataset):
+    """
+    수집 직후 데이터셋 스키마에 맞춰 텍스트 정제, 파생 변수 생성, 타입 정리를 한 번에 수행
+    변환 전후 메모리 사용량(bytes)은 df.attrs['memory']에 기록
+    """
+    before = memory_bytes(df)
+    df = df.copy()
+    for col in TEXT_COLUMNS.get(dataset, []):
+        if col in df.columns:
+            df[col] = clean_text(df[col])
+    df = add_text_features(df, dataset)
+    for col in INTEGER_COLUMNS.get(dataset, []):
+        if col in df.columns:
+            df[col] = to_sized_int(df[col])
+    for col in FLOAT_COLUMNS.get(dataset, []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    for col, fmt in DATE_COLUMNS.get(dataset, {}).items():
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = to_datetime(df[col], fmt)
+    for col in CATEGORY_COLUMNS.get(dataset, []):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    df.attrs["memory"] = {"before_bytes": before, "after_bytes": memory_bytes(df)}
+    return df
+
+
+def memory_summary(df):
+    """'12.3MB → 2.1MB' 형식의 메모리 절감 요약 문자열 (기록이 없으면 빈 문자열)"""
+    report = df.attrs.get("memory")
+    if not report:
+        return ""
+    return f"{report['before_bytes'] / 1e6:.1f}MB → {report['after_bytes'] / 1e6:.1f}MB"
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datalab import fetch_trend_range
+from naver_api import SHOP_URL, BLOG_URL, DEFAULT_RATE_PER_SEC, TokenBucket, get_client, iter_search_pages
+from response_cache import CachedClient, CACHE_PATH
+from instrumentation import timed
+import quota
+import data_manager_universal as dmu
+
+# 대시보드 요청 빈도 기록 (응답 캐시와 같은 위치에 두어 모든 워커 프로세스가 공유)
+PREWARM_PATH = os.getenv("NAVER_PREWARM_PATH", os.path.join(os.path.dirname(CACHE_PATH), "prewarm.sqlite"))
+# 요청 빈도 점수가 절반으로 줄어드는 시간(초): 최근 많이 본 키워드일수록 높은 점수
+HALF_LIFE = 6 * 3600
+# 사전 갱신 대상: 점수 상위 TOP_N개 중 MIN_SCORE 이상 (한 번만 조회된 조합은 제외)
+# 두 번 조회한 조합도 기록 사이에 점수가 조금씩 감쇠하므로 2.0이 아닌 1.5를 기준으로 함
+TOP_N = int(os.getenv("NAVER_PREWARM_TOP_N", "20"))
+MIN_SCORE = 1.5
+# 응답 캐시 TTL 만료 이 시간(초) 전부터 갱신, 갱신 주기는 이보다 짧아야 만료 전에 한 번은 돌아옴
+REFRESH_AHEAD = 600
+INTERVAL = 120
+
+
+@contextmanager
+def _connect(path=PREWARM_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS requests (
+            signature TEXT PRIMARY KEY,
+            keywords TEXT NOT NULL,
+            start TEXT NOT NULL,
+            end TEXT NOT NULL,
+            depth INTEGER NOT NULL,
+            score REAL NOT NULL,
+            updated REAL NOT NULL
+        )""")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _decayed(score, updated, now):
+    return score * 0.5 ** ((now - updated) / HALF_LIFE)
+
+
+def record_request(keywords, start_date, end_date, depth):
+    """대시보드 조회 1회를 (키워드, 기간, 수집 깊이) 조합 단위로 기록"""
+    keywords = list(dict.fromkeys(keywords))
+    signature = json.dumps([keywords, start_date, end_date, depth], ensure_ascii=False)
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute("SELECT score, updated FROM requests WHERE signature = ?", (signature,)).fetchone()
+        score = (_decayed(*row, now) if row else 0.0) + 1.0
+        conn.execute("INSERT OR REPLACE INTO requests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (signature, json.dumps(keywords, ensure_ascii=False), start_date, end_date, depth, score, now))
+
+
+def hot_requests(limit=TOP_N, min_score=MIN_SCORE):
+    """현재 점수 기준 상위 조합 목록 (점수가 거의 사라진 기록은 정리)"""
+    now = time.time()
+    with _connect() as conn:
+        rows = conn.execute("SELECT signature, keywords, start, end, depth, score, updated FROM requests").fetchall()
+        conn.executemany("DELETE FROM requests WHERE signature = ?",
+                         [(row[0],) for row in rows if _decayed(row[5], row[6], now) < 0.01])
+    ranked = sorted(({"keywords": json.loads(row[1]), "start": row[2], "end": row[3], "depth": row[4],
+                      "score": _decayed(row[5], row[6], now)} for row in rows), key=lambda r: r["score"], reverse=True)
+    return [r for r in ranked if r["score"] >= min_score][:limit]
+
+
+@timed("prewarm")
+def warm(client, request, limiter=None):
+    """
+    load_all_dashboard_data와 같은 API 요청을 재생해 디스크 응답 캐시를 갱신
+    (요청 본문이 같아야 캐시 키가 일치하므로 트렌드 그룹/검색 파라미터를 대시보드와 동일하게 구성)
+    멀티 키워드 비교는 모든 키워드의 쇼핑/블로그를 조회하므로 키워드마다 검색 응답을 갱신
+    """
+    keywords = request["keywords"]
+    fetch_trend_range(client, dmu.trend_groups(keywords), request["start"], request["end"], limiter=limiter,
+                      priority=quota.BATCH)
+    for kw in dict.fromkeys(keywords):
+        for url, dedup_key in ((SHOP_URL, "productId"), (BLOG_URL, "link")):
+            for _ in iter_search_pages(client, url, kw, max_results=request["depth"], dedup_key=dedup_key,
+                                       limiter=limiter, priority=quota.BATCH):
+                pass
+
+
+def prewarm_client():
+    """만료 임박 항목을 호출 스레드에서 바로 갱신하는 캐시 클라이언트"""
+    return CachedClient(get_client(dmu.CLIENT_ID, dmu.CLIENT_SECRET), dmu.response_cache, refresh_ahead=REFRESH_AHEAD)
+
+
+def run_once(client=None):
+    """
+    인기 조합을 한 번씩 갱신하고 처리한 조합 수를 반환 (개별 실패는 다음 주기에 재시도)
+    사전 갱신은 배치 우선순위로 한도를 쓰며, 배치 잔여 한도가 부족하면 건너뜀
+    """
+    if quota.budget_low():
+        return 0
+    client = client or prewarm_client()
+    limiter = TokenBucket(DEFAULT_RATE_PER_SEC)
+    warmed = 0
+    for request in hot_requests():
+        try:
+            warm(client, request, limiter)
+            warmed += 1
+        except Exception as e:
+            print(f"사전 갱신 실패 ({', '.join(request['keywords'])}): {e}")
+    return warmed
+
+
+def run_cycle():
+    """
+    주기 1회 실행: 한도 확인/저장소 잠금/네트워크 오류 등 어떤 예외도 주기 밖으로 전파하지 않고 기록만 함
+    (예외가 전파되면 스케줄러 스레드가 조용히 종료되어 이후 갱신이 모두 멈춤)
+    """
+    try:
+        warmed = run_once()
+    except Exception as e:
+        print(f"[{time.strftime('%H:%M:%S')}] 사전 갱신 주기 실패 ({type(e).__name__}): {e}")
+        return None
+    if warmed:
+        print(f"[{time.strftime('%H:%M:%S')}] 사전 갱신: {warmed}개 조합")
+    return warmed
+
+
+def start_scheduler(interval=INTERVAL):
+    """interval초마다 run_once를 실행하는 데몬 스레드 시작 (Streamlit 서버 프로세스당 1회)"""
+    def loop():
+        while True:
+            run_cycle()
+            time.sleep(interval)
+    thread = threading.Thread(target=loop, name="naver-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인기 키워드 대시보드 데이터 사전 갱신 워커")
+    parser.add_argument("--interval", type=int, default=INTERVAL, help="갱신 주기(초)")
+    parser.add_argument("--once", action="store_true", help="한 번만 갱신하고 종료")
+    args = parser.parse_args()
+
+    if args.once:
+        print(f"사전 갱신 완료: {run_once()}개 조합")
+    else:
+        print(f"사전 갱신 워커 실행 중 (주기 {args.interval}초, 대상 상위 {TOP_N}개)")
+        while True:
+            run_cycle()
+            time.sleep(args.interval)
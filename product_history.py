@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import argparse
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import manifest
+from data_manager import load_entry
+from instrumentation import timed
+from snapshot_store import DATA_DIR
+
+# 상품별 가격 이력 저장소: data 디렉터리 mtime을 건드리지 않도록 하위 디렉터리에 둠
+HISTORY_PATH = os.path.join(DATA_DIR, ".history", "products.sqlite")
+# 수집일마다 거의 바뀌지 않는 상품 속성 (상품당 한 행만 유지, 바뀐 경우에만 갱신)
+STATIC_COLUMNS = ["title", "link", "image", "brand", "maker", "mallName",
+                  "category1", "category2", "category3", "category4", "productType"]
+# 수집일마다 바뀔 수 있는 관측값 (변경 시점마다 한 행으로 기록)
+OBSERVED_COLUMNS = ["lprice", "hprice", "mallName", "brand", "rank"]
+# 직전 관측과 하나라도 다르면 행을 추가하는 값 (검색 순위는 매일 조금씩 흔들리므로 제외)
+CHANGE_COLUMNS = ["lprice", "hprice", "mallName", "brand"]
+# 순위는 마지막으로 기록된 순위보다 이 값을 넘게 움직였을 때만 행 추가
+RANK_THRESHOLD = 10
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+    conn = sqlite3.connect(HISTORY_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS products (
+            productId INTEGER PRIMARY KEY,
+            {", ".join(f"{col} TEXT" for col in STATIC_COLUMNS)}
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS products_brand ON products (brand)")
+    # 키워드 검색 결과에 노출된 기간 (첫/마지막 수집일)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS listings (
+            productId INTEGER NOT NULL,
+            keyword TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            PRIMARY KEY (productId, keyword)
+        )""")
+    # 가격/판매처/브랜드 변경 또는 큰 순위 변동 시점만 기록 (다음 변경 전까지 같은 값이 유지된 것으로 간주)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS observations (
+            productId INTEGER NOT NULL,
+            keyword TEXT NOT NULL,
+            collected TEXT NOT NULL,
+            lprice INTEGER,
+            hprice INTEGER,
+            mallName TEXT,
+            brand TEXT,
+            rank INTEGER,
+            PRIMARY KEY (productId, keyword, collected)
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS observations_keyword ON observations (keyword, collected)")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _records(df, columns):
+    """sqlite 바인딩용 파이썬 기본형 튜플 목록 (결측은 None)"""
+    frame = df[columns].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def _same(a, b):
+    return (a == b) | (a.isna() & b.isna())
+
+
+@timed("save")
+def record_snapshot(df, keyword, collected):
+    """
+    쇼핑 검색 스냅샷 1회분을 이력 저장소에 반영하고 (신규 상품 수, 추가된 관측 수) 반환
+    - 상품 속성: 새 상품은 추가, 기존 상품은 값이 바뀐 경우에만 갱신
+    - 관측값: 같은 키워드의 직전 관측과 가격/판매처/브랜드가 다르거나, 순위가 RANK_THRESHOLD를 넘게 움직였을 때만 추가
+    같은 날 다시 수집하면 그날 기록을 덮어씀
+    """
+    if df is None or df.empty or "productId" not in df.columns:
+        return 0, 0
+    frame = df.drop_duplicates("productId").copy()
+    frame["productId"] = pd.to_numeric(frame["productId"], errors="coerce")
+    frame = frame.dropna(subset=["productId"])
+    frame["productId"] = frame["productId"].astype("int64")
+    # 스냅샷은 검색 순위 순으로 저장되어 있음
+    frame["rank"] = np.arange(1, len(frame) + 1)
+    for col in STATIC_COLUMNS + OBSERVED_COLUMNS:
+        if col not in frame.columns:
+            frame[col] = None
+    frame["productType"] = frame["productType"].astype("string")
+    for col in ("lprice", "hprice"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("Int64")
+    for col in ("mallName", "brand"):
+        frame[col] = frame[col].astype("string")
+
+    with _connect() as conn:
+        known = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        columns = ", ".join(STATIC_COLUMNS)
+        changed = " OR ".join(f"products.{col} IS NOT excluded.{col}" for col in STATIC_COLUMNS)
+        conn.executemany(
+            f"INSERT INTO products (productId, {columns}) VALUES ({', '.join('?' * (len(STATIC_COLUMNS) + 1))}) "
+            f"ON CONFLICT (productId) DO UPDATE SET "
+            f"{', '.join(f'{col} = excluded.{col}' for col in STATIC_COLUMNS)} WHERE {changed}",
+            _records(frame, ["productId"] + STATIC_COLUMNS))
+        added_products = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] - known
+
+        previous = pd.read_sql_query("""
+            SELECT o.productId, o.lprice, o.hprice, o.mallName, o.brand, o.rank
+            FROM observations o
+            JOIN (SELECT productId, MAX(collected) AS collected FROM observations
+                  WHERE keyword = ? AND collected < ? GROUP BY productId) p
+              ON o.productId = p.productId AND o.collected = p.collected
+            WHERE o.keyword = ?""", conn, params=(keyword, collected, keyword))
+        merged = frame[["productId"] + OBSERVED_COLUMNS].merge(
+            previous.astype({"lprice": "Int64", "hprice": "Int64", "mallName": "string", "brand": "string",
+                             "rank": "Int64"}),
+            on="productId", how="left", suffixes=("", "_prev"))
+        unchanged = np.logical_and.reduce([_same(merged[col], merged[f"{col}_prev"]).fillna(False).to_numpy(bool)
+                                           for col in CHANGE_COLUMNS])
+        # 처음 보는 상품(직전 순위 없음)은 항상 기록, 순위는 큰 변동만 새 관측으로 봄
+        rank_moved = (merged["rank"] - merged["rank_prev"]).abs().gt(RANK_THRESHOLD).fillna(True).to_numpy(bool)
+        deltas = merged.loc[~unchanged | rank_moved, ["productId"] + OBSERVED_COLUMNS].assign(
+            keyword=keyword, collected=collected)
+
+        conn.execute("DELETE FROM observations WHERE keyword = ? AND collected = ?", (keyword, collected))
+        conn.executemany("INSERT INTO observations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         _records(deltas, ["productId", "keyword", "collected"] + OBSERVED_COLUMNS))
+        conn.executemany(
+            "INSERT INTO listings VALUES (?, ?, ?, ?) ON CONFLICT (productId, keyword) DO UPDATE SET "
+            "first_seen = MIN(first_seen, excluded.first_seen), last_seen = MAX(last_seen, excluded.last_seen)",
+            [(pid, keyword, collected, collected) for pid in frame["productId"].tolist()])
+    return added_products, len(deltas)
+
+
+def backfill(keyword):
+    """기존 쇼핑 스냅샷(CSV/Parquet)을 수집일 순으로 이력 저장소에 반영 (같은 날짜는 Parquet 우선)"""
+    done = set()
+    for entry in manifest.snapshots("shop_products", keyword):
+        if entry["collected"] in done:
+            continue
+        done.add(entry["collected"])
+        record_snapshot(load_entry(entry, "shop_products"), keyword, entry["collected"])
+    return len(done)
+
+
+def _intervals(where, params):
+    """
+    변경 시점 관측을 [valid_from, valid_to] 구간으로 변환
+    다음 변경 전날까지, 마지막 관측은 마지막 노출일까지 같은 값이 유지된 것으로 봄
+    """
+    with _connect() as conn:
+        frame = pd.read_sql_query(f"""
+            SELECT o.productId, o.keyword, o.collected, o.lprice, o.hprice, o.mallName, o.brand, o.rank,
+                   LEAD(o.collected) OVER (PARTITION BY o.productId, o.keyword ORDER BY o.collected) AS next_change,
+                   l.last_seen
+            FROM observations o
+            JOIN listings l ON l.productId = o.productId AND l.keyword = o.keyword
+            JOIN products p ON p.productId = o.productId
+            WHERE {where}""", conn, params=params)
+    frame["valid_from"] = pd.to_datetime(frame["collected"], format="%Y%m%d")
+    next_change = pd.to_datetime(frame["next_change"], format="%Y%m%d") - pd.Timedelta(days=1)
+    frame["valid_to"] = next_change.fillna(pd.to_datetime(frame["last_seen"], format="%Y%m%d"))
+    return frame
+
+
+def _expand(intervals, days):
+    """구간을 일자별 행으로 펼친 뒤 마지막 days일만 반환"""
+    if intervals.empty:
+        return pd.DataFrame(columns=["date", "productId", "keyword"] + OBSERVED_COLUMNS)
+    lengths = ((intervals["valid_to"] - intervals["valid_from"]).dt.days + 1).clip(lower=1).to_numpy()
+    daily = intervals.loc[intervals.index.repeat(lengths), ["productId", "keyword"] + OBSERVED_COLUMNS]
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    daily.insert(0, "date", np.repeat(intervals["valid_from"].to_numpy(), lengths) + pd.to_timedelta(offsets, unit="D"))
+    cutoff = daily["date"].max() - pd.Timedelta(days=days - 1)
+    return daily[daily["date"] >= cutoff].reset_index(drop=True)
+
+
+@timed("load")
+def product_history(product_id, keyword=None, days=90):
+    """상품 하나의 일자별 가격/판매처/브랜드 이력과 대략적인 순위 (keyword를 주면 해당 검색 결과 기준)"""
+    where, params = "o.productId = ?", [int(product_id)]
+    if keyword:
+        where += " AND o.keyword = ?"
+        params.append(keyword)
+    return _expand(_intervals(where, params), days).sort_values(["keyword", "date"], ignore_index=True)
+
+
+@timed("load")
+def brand_history(brand, keyword=None, days=90):
+    """브랜드의 일자별 노출 상품 수와 최저가 통계 (평균/최소/중앙값)"""
+    where, params = "p.brand = ?", [brand]
+    if keyword:
+        where += " AND o.keyword = ?"
+        params.append(keyword)
+    daily = _expand(_intervals(where, params), days)
+    return (daily.groupby("date")
+            .agg(products=("productId", "nunique"), mean_lprice=("lprice", "mean"),
+                 min_lprice=("lprice", "min"), median_lprice=("lprice", "median"))
+            .reset_index())
+
+
+def storage_stats():
+    """저장소 행 수 요약 (상품 수, 노출 기록 수, 관측값 변경 기록 수)"""
+    with _connect() as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("products", "listings", "observations")}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상품 가격 이력 저장소")
+    parser.add_argument("--backfill", nargs="+", metavar="KEYWORD", help="기존 쇼핑 스냅샷을 이력으로 반영")
+    parser.add_argument("--product", help="상품 ID의 가격 이력 출력")
+    parser.add_argument("--brand", help="브랜드의 일자별 가격 통계 출력")
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    for kw in args.backfill or []:
+        print(f"{kw}: 스냅샷 {backfill(kw)}개 반영")
+    if args.product:
+        print(product_history(args.product, days=args.days).to_string(index=False))
+    if args.brand:
+        print(brand_history(args.brand, days=args.days).to_string(index=False))
+    print(storage_stats())
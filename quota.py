@@ -0,0 +1,155 @@
+import os
+import json
+import math
+import sqlite3
+import requests
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+
+# 일일 호출 한도 (검색 API와 데이터랩은 별도 한도, 자정(KST) 초기화)
+DAILY_LIMITS = {
+    "search": int(os.getenv("NAVER_QUOTA_SEARCH", "25000")),
+    "datalab": int(os.getenv("NAVER_QUOTA_DATALAB", "1000")),
+}
+# 대시보드(interactive) 전용으로 남겨둘 한도 비율: 배치 작업은 나머지 한도까지만 사용
+INTERACTIVE_RESERVE = float(os.getenv("NAVER_QUOTA_RESERVE", "0.2"))
+# 배치 잔여 한도가 이 비율 미만이면 우선순위 0(최우선) 작업만 실행하고 나머지는 다음 날로 미룸
+LOW_BUDGET_SHARE = 0.1
+# 사용량 기록은 응답 캐시와 같은 위치에 두어 같은 호스트의 모든 프로세스가 공유
+QUOTA_PATH = os.getenv("NAVER_QUOTA_PATH", os.path.join(
+    os.path.dirname(os.getenv("NAVER_CACHE_PATH", os.path.join("data", ".cache", "responses.sqlite"))),
+    "quota.sqlite"))
+KST = ZoneInfo("Asia/Seoul")
+
+# 요청 우선순위: 호출하는 쪽이 NaverClient.request(priority=...)로 지정 (없으면 interactive)
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class QuotaExceeded(requests.RequestException):
+    """일일 한도(또는 배치 몫)를 넘어 요청을 보내지 않음"""
+
+
+def endpoint_group(url):
+    return "datalab" if urlparse(url).path.startswith("/v1/datalab") else "search"
+
+
+def today():
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(QUOTA_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(QUOTA_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS usage (
+            day TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            calls INTEGER NOT NULL,
+            PRIMARY KEY (day, endpoint, priority)
+        )""")
+    conn.execute("CREATE TABLE IF NOT EXISTS deferred (id INTEGER PRIMARY KEY, task TEXT NOT NULL UNIQUE)")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _batch_limit(endpoint):
+    return int(DAILY_LIMITS[endpoint] * (1 - INTERACTIVE_RESERVE))
+
+
+def consume(url, priority=None, calls=1):
+    """
+    요청 전 호출 수를 차감 (여러 프로세스가 동시에 차감해도 한도를 넘지 않도록 쓰기 잠금 안에서 확인)
+    interactive는 전체 한도까지, batch는 예약분을 뺀 한도까지만 허용하며 넘으면 QuotaExceeded
+    """
+    priority = priority or INTERACTIVE
+    endpoint = endpoint_group(url)
+    day = today()
+    limit = DAILY_LIMITS[endpoint] if priority == INTERACTIVE else _batch_limit(endpoint)
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            used = conn.execute("SELECT COALESCE(SUM(calls), 0) FROM usage WHERE day = ? AND endpoint = ?",
+                                (day, endpoint)).fetchone()[0]
+            if used + calls > limit:
+                conn.execute("ROLLBACK")
+                raise QuotaExceeded(f"{endpoint} 일일 한도 초과 ({priority}: {used}/{limit})")
+            conn.execute("INSERT INTO usage VALUES (?, ?, ?, ?) ON CONFLICT (day, endpoint, priority) "
+                         "DO UPDATE SET calls = calls + excluded.calls", (day, endpoint, priority, calls))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def usage(day=None):
+    """엔드포인트별 오늘 사용량/한도/잔여량 (batch_remaining은 배치 작업이 더 쓸 수 있는 호출 수)"""
+    day = day or today()
+    with _connect() as conn:
+        rows = conn.execute("SELECT endpoint, priority, calls FROM usage WHERE day = ?", (day,)).fetchall()
+    report = {}
+    for endpoint, limit in DAILY_LIMITS.items():
+        calls = {priority: n for ep, priority, n in rows if ep == endpoint}
+        used = sum(calls.values())
+        report[endpoint] = {
+            "limit": limit,
+            "used": used,
+            "interactive": calls.get(INTERACTIVE, 0),
+            "batch": calls.get(BATCH, 0),
+            "remaining": max(0, limit - used),
+            "batch_remaining": max(0, _batch_limit(endpoint) - used),
+        }
+    return report
+
+
+def plan(tasks):
+    """
+    배치 작업을 우선순위(작을수록 먼저) 순으로 남은 배치 한도에 맞춰 선별
+    tasks: {"priority", "endpoint", "calls"(예상 호출 수), ...} 목록
+    반환: (지금 실행할 작업, 미룬 작업) - 잔여 한도가 LOW_BUDGET_SHARE 미만이면 우선순위 0만 실행
+    """
+    budget = {endpoint: info["batch_remaining"] for endpoint, info in usage().items()}
+    low = {endpoint: budget[endpoint] < DAILY_LIMITS[endpoint] * LOW_BUDGET_SHARE for endpoint in budget}
+    admitted, deferred = [], []
+    for task in sorted(tasks, key=lambda t: t["priority"]):
+        endpoint = task["endpoint"]
+        if (low[endpoint] and task["priority"] > 0) or task["calls"] > budget[endpoint]:
+            deferred.append(task)
+            continue
+        budget[endpoint] -= task["calls"]
+        admitted.append(task)
+    return admitted, deferred
+
+
+def budget_low():
+    """어느 엔드포인트든 배치 잔여 한도가 LOW_BUDGET_SHARE 미만인지 여부 (낮은 우선순위 작업 보류 기준)"""
+    return any(info["batch_remaining"] < DAILY_LIMITS[endpoint] * LOW_BUDGET_SHARE
+               for endpoint, info in usage().items())
+
+
+def estimate_search_calls(max_results):
+    return math.ceil(max(1, min(int(max_results), 1000)) / 100)
+
+
+def defer(tasks):
+    """미룬 작업을 다음 실행 때 먼저 처리하도록 보관 (같은 작업은 한 번만)"""
+    with _connect() as conn:
+        conn.executemany("INSERT OR IGNORE INTO deferred (task) VALUES (?)",
+                         [(json.dumps(task, ensure_ascii=False, sort_keys=True),) for task in tasks])
+
+
+def pop_deferred():
+    """보관된 미룬 작업을 꺼내고 목록에서 제거"""
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        tasks = [json.loads(row[0]) for row in conn.execute("SELECT task FROM deferred ORDER BY id")]
+        conn.execute("DELETE FROM deferred")
+        conn.execute("COMMIT")
+    return tasks
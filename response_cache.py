@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from snapshot_store import DATA_DIR
+
+# 같은 호스트의 모든 Streamlit 워커 프로세스가 공유하는 응답 캐시
+CACHE_PATH = os.getenv("NAVER_CACHE_PATH", os.path.join(DATA_DIR, ".cache", "responses.sqlite"))
+CACHE_MAX_BYTES = int(os.getenv("NAVER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 엔드포인트별 신선도 유지 시간(초): DataLab은 일 단위 데이터라 더 길게 유지
+ENDPOINT_TTLS = {
+    "/v1/search/shop.json": 3600,
+    "/v1/search/blog.json": 3600,
+    "/v1/datalab/shopping/categories": 6 * 3600,
+}
+DEFAULT_TTL = 3600
+# TTL이 지난 뒤에도 이 시간 동안은 기존 응답을 즉시 반환하고 백그라운드에서 갱신
+STALE_WINDOW = 24 * 3600
+# 다른 프로세스가 갱신 중인 항목을 다시 갱신하지 않도록 잡아두는 시간(초)
+REFRESH_LEASE = 60
+
+
+def cache_key(method, url, params=None, body=None):
+    """엔드포인트 + 정규화된 파라미터(키 정렬 JSON)로 캐시 키 생성"""
+    payload = json.dumps({"params": params or {}, "body": body or {}}, sort_keys=True, ensure_ascii=False)
+    return f"{method.upper()} {urlparse(url).path} {payload}"
+
+
+def request_keywords(params=None, body=None):
+    """키워드 단위 무효화를 위해 요청에 포함된 키워드 추출"""
+    if params and "query" in params:
+        return [params["query"]]
+    if body and "category" in body:
+        return [group["name"] for group in body["category"]]
+    return []
+
+
+class ResponseCache:
+    """
+    SQLite 기반 디스크 응답 캐시
+    - 엔드포인트별 TTL + stale-while-revalidate
+    - 전체 크기가 max_bytes를 넘으면 마지막 접근 시각 기준 LRU 삭제
+    - 키워드 단위 무효화 지원
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES, ttls=None, stale_window=STALE_WINDOW):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(ENDPOINT_TTLS, **(ttls or {}))
+        self.stale_window = stale_window
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    refreshing REAL NOT NULL DEFAULT 0
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entry_keywords (
+                    key TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    PRIMARY KEY (keyword, key)
+                )""")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, url):
+        return self.ttls.get(urlparse(url).path, DEFAULT_TTL)
+
+    def get(self, key):
+        """(JSON 본문, 저장 후 경과 초) 반환, 없으면 None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0])), time.time() - row[1]
+
+    def put(self, key, url, data, keywords=()):
+        payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, 0)",
+                         (key, urlparse(url).path, payload, len(payload), now, now))
+            conn.executemany("INSERT OR IGNORE INTO entry_keywords VALUES (?, ?)",
+                             [(key, kw) for kw in keywords])
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        conn.executemany("DELETE FROM entry_keywords WHERE key = ?", victims)
+
+    def claim_refresh(self, key):
+        """갱신 권한 획득 (다른 프로세스/스레드가 이미 갱신 중이면 False)"""
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute("UPDATE entries SET refreshing = ? WHERE key = ? AND refreshing < ?",
+                               (now, key, now - REFRESH_LEASE))
+            return cur.rowcount == 1
+
+    def invalidate(self, keywords=None):
+        """지정 키워드가 포함된 응답만 삭제 (None이면 전체 삭제)"""
+        with self._connect() as conn:
+            if keywords is None:
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM entry_keywords")
+                return
+            for kw in keywords:
+                keys = [row for row in conn.execute("SELECT key FROM entry_keywords WHERE keyword = ?", (kw,))]
+                conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+                conn.executemany("DELETE FROM entry_keywords WHERE key = ?", keys)
+
+
+class CachedClient:
+    """
+    NaverClient.fetch_json을 디스크 캐시로 감싼 클라이언트 (동일 인터페이스)
+    refresh_ahead(초)를 주면 TTL 만료 전 그 시간 안에 들어온 항목을 호출한 스레드에서 미리 갱신 (사전 갱신 워커용)
+    """
+
+    def __init__(self, client, cache, refresh_ahead=0):
+        self.client = client
+        self.cache = cache
+        self.refresh_ahead = refresh_ahead
+
+    def _refresh(self, key, method, url, params, body, limiter, priority):
+        data = self.client.fetch_json(method, url, params=params, body=body, limiter=limiter, priority=priority)
+        self.cache.put(key, url, data, request_keywords(params, body))
+        return data
+
+    def _refresh_in_background(self, *args):
+        def run():
+            try:
+                self._refresh(*args)
+            except Exception:
+                # 갱신 실패 시 기존 응답을 계속 제공하고 다음 요청에서 재시도
+                pass
+        threading.Thread(target=run, daemon=True).start()
+
+    def fetch_json(self, method, url, params=None, body=None, limiter=None, priority=None):
+        key = cache_key(method, url, params, body)
+        hit = self.cache.get(key)
+        if hit is not None:
+            data, age = hit
+            ttl = self.cache.ttl_for(url)
+            if age < ttl - self.refresh_ahead:
+                return data
+            if age < ttl:
+                # 만료 임박: 다른 워커가 이미 갱신 중이면 기존 응답 사용
+                if self.cache.claim_refresh(key):
+                    return self._refresh(key, method, url, params, body, limiter, priority)
+                return data
+            if age < ttl + self.cache.stale_window:
+                if self.cache.claim_refresh(key):
+                    self._refresh_in_background(key, method, url, params, body, limiter, priority)
+                return data
+        return self._refresh(key, method, url, params, body, limiter, priority)
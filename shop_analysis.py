@@ -0,0 +1,129 @@
+from functools import cached_property
+import pandas as pd
+from instrumentation import timed
+
+
+class ShopAnalysis:
+    """
+    쇼핑 검색 데이터프레임을 감싸 파생 집계(빈도, 가격 통계, 피봇)를 최초 요청 시 한 번만 계산
+    같은 데이터에 대한 모든 차트/표/인사이트 문구가 이 객체의 결과를 공유
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._top_cache = {}
+
+    @classmethod
+    def of(cls, data):
+        """데이터프레임 또는 ShopAnalysis를 받아 ShopAnalysis로 반환"""
+        return data if isinstance(data, cls) else cls(data)
+
+    @property
+    def empty(self):
+        return self.df.empty
+
+    def __len__(self):
+        return len(self.df)
+
+    # --- 빈도 집계 ---
+    # category dtype의 value_counts는 관측되지 않은 값도 0으로 포함하므로 제외
+    @cached_property
+    @timed("aggregate")
+    def brand_counts(self):
+        counts = self.df['brand'].value_counts()
+        return counts[counts > 0]
+
+    @cached_property
+    @timed("aggregate")
+    def category_counts(self):
+        counts = self.df['category3'].value_counts()
+        return counts[counts > 0]
+
+    @cached_property
+    @timed("aggregate")
+    def brand_nunique(self):
+        """결측치를 하나의 값으로 포함한 브랜드 종류 수"""
+        return self.df['brand'].nunique(dropna=False)
+
+    @cached_property
+    @timed("aggregate")
+    def missing_counts(self):
+        return self.df.isnull().sum()
+
+    def memo(self, key, compute):
+        """임의 파생 결과(차트 등)를 key 단위로 한 번만 계산해 보관"""
+        if key not in self._top_cache:
+            self._top_cache[key] = compute()
+        return self._top_cache[key]
+
+    def top_brands(self, n):
+        return self.brand_counts.head(n).index
+
+    def top_categories(self, n):
+        return self.category_counts.head(n).index
+
+    # --- 가격 통계 ---
+    def _price_stats(self, by):
+        return (self.df.groupby(by, observed=True, sort=False)['lprice']
+                .agg(['count', 'mean', 'min', 'max', 'median']))
+
+    @cached_property
+    @timed("aggregate")
+    def mall_price_stats(self):
+        return self._price_stats('mallName')
+
+    @cached_property
+    @timed("aggregate")
+    def category_price_stats(self):
+        return self._price_stats('category3')
+
+    @cached_property
+    @timed("aggregate")
+    def cheapest(self):
+        return self.df.nsmallest(10, 'lprice')
+
+    # --- 피봇 / 교차표 ---
+    @cached_property
+    @timed("aggregate")
+    def brand_category_price_pivot(self):
+        return self.df.pivot_table(index='brand', columns='category3', values='lprice',
+                                   aggfunc='mean', observed=True)
+
+    @cached_property
+    @timed("aggregate")
+    def mall_brand_count_pivot(self):
+        return self.df.pivot_table(index='mallName', columns='brand', values='productId',
+                                   aggfunc='count', observed=True)
+
+    @timed("aggregate")
+    def top_brand_rows(self, n):
+        """노출 상위 n개 브랜드의 상품 행"""
+        key = ('brand_rows', n)
+        if key not in self._top_cache:
+            self._top_cache[key] = self.df[self.df['brand'].isin(self.top_brands(n))]
+        return self._top_cache[key]
+
+    @timed("aggregate")
+    def category_brand_crosstab(self, n_categories, n_brands):
+        """상위 카테고리 x 상위 브랜드 노출 빈도 교차표"""
+        key = ('crosstab', n_categories, n_brands)
+        if key not in self._top_cache:
+            mask = (self.df['brand'].isin(self.top_brands(n_brands))
+                    & self.df['category3'].isin(self.top_categories(n_categories)))
+            filtered = self.df[mask]
+            table = pd.crosstab(filtered['category3'], filtered['brand'])
+            self._top_cache[key] = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        return self._top_cache[key]
+
+    # --- 파생 변수 ---
+    @cached_property
+    @timed("aggregate")
+    def numeric_features(self):
+        """상관관계 분석용 수치형 파생 변수 (가격, 상품명 길이, 브랜드명 길이)"""
+        if {'title_len', 'brand_len'} <= set(self.df.columns):
+            return self.df[['lprice', 'title_len', 'brand_len']]
+        return pd.DataFrame({
+            'lprice': self.df['lprice'],
+            'title_len': self.df['title'].str.len(),
+            'brand_len': self.df['brand'].str.len().fillna(0),
+        })
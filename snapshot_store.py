@@ -0,0 +1,159 @@
+import os
+import json
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from preprocess import memory_bytes, normalize_frame, to_sized_int
+
+DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+# 저장 중인 임시 파일 위치: 스냅샷/CSV 경로 밖에 두어 매니페스트 스캔과 읽기 경로에 노출되지 않도록 함
+STAGING_DIR = os.path.join(DATA_DIR, ".staging")
+
+
+def safe_keyword(keyword):
+    """키워드 특수문자 제거 (파일/디렉터리명 안전용)"""
+    return keyword.replace("/", "_").replace(" ", "")
+
+
+def partition_dir(dataset, keyword, collected=None):
+    """dataset=/keyword=/date= 형식의 파티션 디렉터리 경로"""
+    path = os.path.join(STORE_DIR, f"dataset={dataset}", f"keyword={safe_keyword(keyword)}")
+    if collected:
+        path = os.path.join(path, f"date={collected}")
+    return path
+
+
+def snapshot_file(dataset, keyword, collected=None):
+    collected = collected or datetime.now().strftime("%Y%m%d")
+    return os.path.join(partition_dir(dataset, keyword, collected), "part-0.parquet")
+
+
+def staging_file(suffix):
+    """임시 파일 경로 (최종 경로와 같은 파일 시스템이어야 rename이 원자적)"""
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    return os.path.join(STAGING_DIR, f"{uuid.uuid4().hex}{suffix}")
+
+
+def publish(tmp, path):
+    """임시 파일을 최종 경로로 원자적으로 교체 (읽는 쪽은 이전 파일 또는 완성된 새 파일만 봄)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    os.replace(tmp, path)
+    return path
+
+
+def write_snapshot(df, dataset, keyword, collected=None):
+    """데이터프레임을 타입이 지정된 zstd 압축 Parquet 파티션으로 저장하고 경로 반환"""
+    tmp = staging_file(".parquet")
+    table = pa.Table.from_pandas(normalize_frame(df, dataset), preserve_index=False)
+    pq.write_table(table, tmp, compression="zstd")
+    return publish(tmp, snapshot_file(dataset, keyword, collected))
+
+
+def _storage_type(arrow_type):
+    """
+    스트리밍 저장용 고정 타입: 페이지마다 달라질 수 있는 크기 지정 정수/사전 인덱스를 가장 넓은 타입으로 통일
+    (정수는 읽을 때 read_parquet에서 다시 값 범위에 맞게 축소)
+    """
+    if pa.types.is_integer(arrow_type):
+        return pa.int64()
+    if pa.types.is_dictionary(arrow_type):
+        return pa.dictionary(pa.int32(), pa.string())
+    if pa.types.is_null(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pa.string()
+    return arrow_type
+
+
+class SnapshotWriter:
+    """
+    검색 결과를 페이지 단위로 받아 도착하는 대로 디스크에 쓰는 스트리밍 저장기
+    - parquet: 페이지마다 row group 하나를 zstd 압축으로 추가
+    - csv: 원본 API 형식 그대로 페이지마다 행을 이어 씀 (첫 페이지만 헤더와 BOM 포함, 정규화는 로드 시 수행)
+      정규화 결과를 CSV 텍스트로 쓰면 날짜/빈 문자열이 다시 읽을 때 원래 값으로 복원되지 않음
+    임시 파일에 쓰다가 close()에서 rename으로 최종 경로에 게시하고, abort()는 임시 파일만 삭제
+    """
+
+    def __init__(self, path, dataset, fmt="parquet"):
+        self.path = path
+        self.dataset = dataset
+        self.fmt = fmt
+        self.rows = 0
+        self.schema = None
+        self.peak_page_bytes = 0
+        self._tmp = staging_file(f".{fmt}")
+        self._writer = None
+        self._columns = None
+
+    def write(self, raw, normalized=None):
+        """
+        원본 페이지 하나를 추가 (컬럼 구성과 타입은 첫 페이지 기준으로 맞춤)
+        normalized: 이미 정규화한 같은 페이지 (여러 저장기가 한 페이지를 공유할 때 정규화를 한 번만 수행)
+        """
+        if raw.empty:
+            return
+        if self.fmt == "csv":
+            df = raw
+        else:
+            df = normalized if normalized is not None else normalize_frame(raw, self.dataset)
+        if self._columns is None:
+            self._columns = list(df.columns)
+            self.schema = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        df = df.reindex(columns=self._columns)
+        self.peak_page_bytes = max(self.peak_page_bytes, memory_bytes(df))
+        if self.fmt == "csv":
+            first = self.rows == 0
+            df.to_csv(self._tmp, mode="w" if first else "a", header=first, index=False,
+                      encoding="utf-8-sig" if first else "utf-8")
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                # 페이지 간 타입이 같은 컬럼(string 등)을 읽을 때 복원하도록 첫 페이지 dtype을 함께 기록
+                schema = pa.schema([pa.field(f.name, _storage_type(f.type)) for f in table.schema],
+                                   metadata={b"dtypes": json.dumps(self.schema).encode()})
+                self._writer = pq.ParquetWriter(self._tmp, schema, compression="zstd")
+            self._writer.write_table(table.cast(self._writer.schema))
+        self.rows += len(df)
+
+    def close(self):
+        """임시 파일을 최종 경로로 게시하고 경로 반환 (페이지가 하나도 없으면 빈 파일을 만들지 않고 None)"""
+        if self._writer is not None:
+            self._writer.close()
+        if not os.path.exists(self._tmp):
+            return None
+        return publish(self._tmp, self.path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def read_parquet(file, columns=None):
+    """Parquet 파일에서 존재하는 컬럼만 골라 읽음"""
+    if columns is not None:
+        available = set(pq.read_schema(file).names)
+        columns = [c for c in columns if c in available]
+    table = pq.read_table(file, columns=columns)
+    if table.schema.pandas_metadata is not None:
+        return table.to_pandas()
+    # 스트리밍 저장 파일(pandas 메타데이터 없음)은 정수가 int64로 저장되어 있으므로 결측을 유지한 채 읽고 축소
+    df = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    dtypes = json.loads((table.schema.metadata or {}).get(b"dtypes", b"{}"))
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.Int64Dtype):
+            df[col] = to_sized_int(df[col])
+        elif dtypes.get(col) == "string":
+            df[col] = df[col].astype("string")
+    return df
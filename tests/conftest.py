@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_naver_server import MockNaverServer
+
+# naver_api는 import 시점에 엔드포인트를 결정하므로 테스트 모듈 import 전에 모의 서버 주소를 지정
+# 응답 캐시도 import 시점에 만들어지므로 저장소의 data/ 대신 임시 디렉터리에 둠
+SERVER = MockNaverServer(latency_ms=0, jitter_ms=0).start()
+os.environ.update({"NAVER_API_BASE": SERVER.url, "NAVER_CLIENT_ID": "test", "NAVER_CLIENT_SECRET": "test",
+                   "NAVER_CACHE_PATH": os.path.join(tempfile.mkdtemp(prefix="naver_test_"), "responses.sqlite")})
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "covers(request_id): 테스트가 검증하는 변경 요청 (예: user-006)")
+
+
+@pytest.fixture
+def server():
+    SERVER.error_rate = 0.0
+    yield SERVER
+    SERVER.error_rate = 0.0
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """data/ 및 한도 기록을 테스트별 임시 디렉터리에 두고 그 안에서 실행 (응답 캐시는 비우고 시작)"""
+    import quota
+    from response_cache import ResponseCache
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(quota, "QUOTA_PATH", str(tmp_path / "quota.sqlite"))
+    ResponseCache().invalidate()
+    return tmp_path
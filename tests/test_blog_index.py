@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+import blog_index
+from mock_naver_server import blog_item
+from preprocess import normalize_frame
+
+
+@pytest.fixture
+def indexed(workdir):
+    df = normalize_frame(pd.DataFrame([blog_item("런닝화", rank) for rank in range(1, 201)]), "blog_posts")
+    assert blog_index.index_posts(df, "런닝화") == 200
+    # 같은 게시물을 다시 넣으면 새로 색인하지 않음
+    assert blog_index.index_posts(df, "런닝화") == 0
+    return (df["title"] + " " + df["description"]).str.lower()
+
+
+@pytest.mark.covers("user-022")
+@pytest.mark.parametrize("query", ["화", "닝", "닝화", "런닝화 후기", '"한 달"', "만족", "없는단어"])
+def test_search_matches_substring_scan(indexed, query):
+    needles = blog_index.parse_query(query)
+    expected = indexed.apply(lambda body: all(n in body for n in needles)).sum()
+    posts, total, _ = blog_index.search(query, limit=500)
+    assert total == expected
+    assert len(posts) == expected
+
+
+@pytest.mark.covers("user-022")
+def test_co_terms_exclude_query_terms(indexed):
+    _, total, co_terms = blog_index.search("후기")
+    assert total == 200
+    assert "후기" not in set(co_terms["term"])
@@ -0,0 +1,97 @@
+import pytest
+
+import collection_jobs
+import naver_data_collector as collector
+
+
+def collect(target, dataset):
+    return collector.collect_target(target, dataset, max_results=100)
+
+
+def write_jobs(workdir):
+    path = workdir / "targets.csv"
+    path.write_text("keyword,cat_id,start,end\n런닝화,50000008,2024-01-01,2024-03-31\n"
+                    "등산화,50000008,2024-01-01,2024-03-31\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.covers("user-024")
+def test_format_duration_keeps_days():
+    assert collection_jobs.format_duration(59) == "00:00:59"
+    assert collection_jobs.format_duration(3 * 3600 + 4 * 60 + 5) == "03:04:05"
+    # 24시간을 넘으면 00시로 돌아가지 않고 일 수를 따로 표시
+    assert collection_jobs.format_duration(2 * 86400 + 3 * 3600 + 4 * 60 + 5) == "2일 03:04:05"
+
+
+@pytest.mark.covers("user-024")
+def test_batched_trend_uses_target_range(server, workdir):
+    targets = [
+        {"keyword": "런닝화", "cat_id": "50000000", "start": "2024-03-01", "end": "2024-05-31"},
+        {"keyword": "운동화", "cat_id": "50000000", "start": "2024-03-01", "end": "2024-05-31"},
+        {"keyword": "등산화", "cat_id": "50000000", "start": "2023-01-01", "end": "2023-02-28"},
+    ]
+    results = collector.get_shopping_trends_batched(targets)
+    assert set(results) == {"런닝화", "운동화", "등산화"}
+    for target in targets:
+        periods = results[target["keyword"]]["period"].astype(str)
+        assert periods.min() >= target["start"] and periods.max() <= target["end"]
+
+
+@pytest.mark.covers("user-024")
+def test_rerun_resumes_from_checkpoints(server, workdir):
+    targets = collection_jobs.load_jobs(str(write_jobs(workdir)))
+    first = []
+
+    def interrupted(target, dataset):
+        first.append((target["keyword"], dataset))
+        if (target["keyword"], dataset) == ("등산화", "blog"):
+            raise RuntimeError("중단")
+        return collect(target, dataset)
+
+    stats = collection_jobs.run_jobs(targets, interrupted, max_workers=2)
+    assert len(first) == 6 and (stats["succeeded"], stats["failed"]) == (5, 1)
+
+    # 다시 실행하면 완료 기록이 없는 작업만 수집
+    second = []
+
+    def resumed(target, dataset):
+        second.append((target["keyword"], dataset))
+        return collect(target, dataset)
+
+    before = server.stats["requests"]
+    stats = collection_jobs.run_jobs(targets, resumed)
+    assert second == [("등산화", "blog")]
+    assert stats["succeeded"] == 1
+    assert server.stats["requests"] - before == 1
+
+    stats = collection_jobs.run_jobs(targets, collect)
+    assert stats["units"] == 0
+
+
+
+@pytest.mark.covers("user-024")
+def test_resume_batches_trend_units(server, workdir):
+    keywords = ["런닝화", "등산화", "운동화", "슬리퍼", "샌들"]
+    targets = [{"keyword": kw, "cat_id": "50000008", "start": "2024-01-01", "end": "2024-03-31",
+                "datasets": ("trend",)} for kw in keywords]
+    fallback = []
+
+    def per_unit(target, dataset):
+        fallback.append(target["keyword"])
+        return collect(target, dataset)
+
+    # 5개 키워드는 앵커를 포함한 3개씩 두 요청으로 수집하고 대상별로 체크포인트 기록
+    before = server.stats["requests"]
+    stats = collection_jobs.run_jobs(targets, per_unit, collect_batch={"trend": collector.collect_trend_targets})
+    assert server.stats["requests"] - before == 2
+    assert fallback == [] and stats["succeeded"] == 5
+    assert collection_jobs.pending_units(targets) == []
+
+
+@pytest.mark.covers("user-024")
+def test_resume_incremental_trend_skips_collected_dates(server, workdir):
+    target = {"keyword": "런닝화", "cat_id": "50000008", "start": None, "end": "2025-03-31", "datasets": ("trend",)}
+    assert collector.collect_target(target, "trend", incremental=True) is not None
+    before = server.stats["requests"]
+    assert collector.collect_target(target, "trend", incremental=True) is not None
+    assert server.stats["requests"] == before
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from datalab import fetch_trend_batched, fetch_trend_range, quarter_chunks, request_trend
+from naver_api import get_client
+
+GROUPS = [{"name": kw, "param": ["50000008"]} for kw in ("런닝화", "등산화", "운동화", "슬리퍼", "샌들")]
+
+
+def by_key(df):
+    df = df.assign(period=pd.to_datetime(df["period"]))
+    return df.set_index(["keyword", "period"])["ratio"].sort_index()
+
+
+@pytest.mark.covers("user-015")
+def test_stitched_range_matches_one_shot_request(server, workdir):
+    client = get_client("test", "test")
+    start, end = "2024-01-01", "2024-12-31"
+    assert len(quarter_chunks(start, end)) == 4
+    stitched = by_key(fetch_trend_range(client, GROUPS[:3], start, end))
+    one_shot = by_key(request_trend(client, GROUPS[:3], start, end))
+    assert stitched.index.equals(one_shot.index)
+    assert (stitched - one_shot).abs().max() < 1e-3
+    assert stitched.max() == 100
+
+
+@pytest.mark.covers("user-003")
+def test_batched_groups_rescale_to_anchor(server, workdir):
+    client = get_client("test", "test")
+    start, end = "2024-01-01", "2024-03-31"
+    # 5개 그룹은 앵커(첫 키워드)를 포함한 3개씩 두 요청으로 나뉨
+    before = server.stats["requests"]
+    batched = by_key(fetch_trend_batched(client, GROUPS, start, end))
+    assert server.stats["requests"] - before == 2
+    one_shot = by_key(request_trend(client, GROUPS, start, end))
+    assert batched.index.equals(one_shot.index)
+    assert (batched - one_shot).abs().max() < 1e-3
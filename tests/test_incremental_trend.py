@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+import naver_data_collector as collector
+from datalab import request_trend
+from naver_api import get_client
+
+
+@pytest.mark.covers("user-006")
+def test_incremental_collection_matches_one_shot_request(server, workdir, monkeypatch):
+    monkeypatch.setattr(collector, "TREND_START_DATE", "2025-01-01")
+    first = collector.get_shopping_trend_incremental("런닝화", "50000008", end_date="2025-06-30")
+    assert first["period"].max() == pd.Timestamp("2025-06-30")
+
+    # 두 번째 수집은 겹치는 구간부터 새 날짜만 요청하고 기존 시계열 척도에 맞춰 이어붙임
+    before = server.stats["requests"]
+    merged = collector.get_shopping_trend_incremental("런닝화", "50000008", end_date="2025-12-31")
+    assert server.stats["requests"] - before == 1
+
+    one_shot = request_trend(get_client("test", "test"), [{"name": "런닝화", "param": ["50000008"]}],
+                             "2025-01-01", "2025-12-31")
+    expected = one_shot.assign(period=pd.to_datetime(one_shot["period"])).set_index("period")["ratio"]
+    actual = merged.set_index("period")["ratio"].sort_index()
+    assert actual.index.equals(expected.index)
+    assert (actual - expected).abs().max() < 1e-3
+
+    # 이미 종료일까지 수집되어 있으면 요청 없이 저장된 시계열 반환
+    before = server.stats["requests"]
+    stored = collector.get_shopping_trend_incremental("런닝화", "50000008", end_date="2025-12-31")
+    assert server.stats["requests"] == before
+    assert len(stored) == len(merged)
@@ -0,0 +1,53 @@
+import threading
+import pytest
+import instrumentation
+
+
+@instrumentation.timed("aggregate", "probe")
+def probe():
+    return None
+
+
+@pytest.mark.covers("user-013")
+def test_run_enable_flag_is_isolated_per_thread():
+    results = {}
+
+    def session(name, enabled):
+        records = instrumentation.start_run(enabled=enabled)
+        probe()
+        results[name] = (instrumentation.is_enabled(), len(records))
+
+    threads = [threading.Thread(target=session, args=("on", True)),
+               threading.Thread(target=session, args=("off", False))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {"on": (True, 1), "off": (False, 0)}
+    # 실행 단위 설정은 프로세스 기본값을 바꾸지 않음
+    assert instrumentation.is_enabled() is False
+
+
+@pytest.mark.covers("user-013")
+def test_run_records_api_calls_from_nested_workers(server, workdir):
+    from datalab import fetch_trend_range
+    from naver_api import SHOP_URL, get_client, iter_search_pages
+
+    client = get_client("test", "test")
+    groups = [{"name": kw, "param": ["50000008"]} for kw in ("런닝화", "등산화", "운동화", "슬리퍼")]
+    results = {}
+
+    def session():
+        records = instrumentation.start_run(enabled=True)
+        before = server.stats["requests"]
+        # 분기 4개 x 앵커 배치 2개 = DataLab 요청 8건, 검색 300건 = 페이지 3건
+        fetch_trend_range(client, groups, "2024-01-01", "2024-12-31")
+        pages = list(iter_search_pages(client, SHOP_URL, "런닝화", max_results=300, dedup_key="productId"))
+        api = [r["name"] for r in records if r["stage"] == "api"]
+        results.update(upstream=server.stats["requests"] - before, pages=len(pages),
+                       datalab=api.count("/v1/datalab/shopping/categories"), search=api.count("/v1/search/shop.json"))
+
+    thread = threading.Thread(target=session)
+    thread.start()
+    thread.join()
+    assert results == {"upstream": 11, "pages": 3, "datalab": 8, "search": 3}
@@ -0,0 +1,16 @@
+import pytest
+from naver_api import get_client
+import prewarm
+
+
+@pytest.mark.covers("user-016")
+def test_combination_viewed_twice_is_prewarmed(server, workdir):
+    prewarm.record_request(["런닝화"], "2024-01-01", "2024-03-31", 100)
+    prewarm.record_request(["런닝화"], "2024-01-01", "2024-03-31", 100)
+    # 한 번만 조회된 조합은 사전 갱신하지 않음
+    prewarm.record_request(["등산화"], "2024-01-01", "2024-03-31", 100)
+
+    before = server.stats["requests"]
+    assert prewarm.run_once(get_client("test", "test")) == 1
+    # 트렌드 1건 + 쇼핑/블로그 검색 각 1페이지
+    assert server.stats["requests"] - before == 3
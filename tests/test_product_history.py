@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import product_history
+
+
+@pytest.fixture
+def history(workdir, monkeypatch):
+    monkeypatch.setattr(product_history, "HISTORY_PATH", str(workdir / "products.sqlite"))
+
+
+def snapshot(order, prices=None, malls=None):
+    """검색 순위 순서대로 나열한 상품 스냅샷"""
+    prices, malls = prices or {}, malls or {}
+    return pd.DataFrame([{"productId": str(pid), "title": f"상품{pid}", "brand": "브랜드", "productType": "1",
+                          "mallName": malls.get(pid, "몰"), "lprice": str(prices.get(pid, 10000 + pid)), "hprice": ""}
+                         for pid in order])
+
+
+@pytest.mark.covers("user-017")
+def test_small_rank_moves_do_not_add_rows(history):
+    order = list(range(1, 41))
+    assert product_history.record_snapshot(snapshot(order), "런닝화", "20250101") == (40, 40)
+
+    # 인접 순위끼리 뒤바뀌는 일상적인 흔들림은 기록하지 않음
+    shuffled = [order[i + 1] if i % 2 == 0 else order[i - 1] for i in range(len(order))]
+    assert product_history.record_snapshot(snapshot(shuffled), "런닝화", "20250102") == (0, 0)
+
+    # 가격 변경, 판매처 변경, 임계값을 넘는 순위 변동만 새 행
+    moved = [40] + [pid for pid in shuffled if pid != 40]
+    changed = snapshot(moved, prices={5: 9000}, malls={7: "다른몰"})
+    assert product_history.record_snapshot(changed, "런닝화", "20250103") == (0, 3)
+
+    history_5 = product_history.product_history(5, "런닝화")
+    assert history_5["lprice"].tolist() == [10005, 10005, 9000]
+    history_7 = product_history.product_history(7, "런닝화")
+    assert history_7["mallName"].tolist() == ["몰", "몰", "다른몰"]
+    history_40 = product_history.product_history(40, "런닝화")
+    assert history_40["rank"].tolist() == [40, 40, 1]
+    assert product_history.storage_stats()["observations"] == 43
+
+
+@pytest.mark.covers("user-017")
+def test_history_uses_the_snapshot_just_collected(server, history, monkeypatch):
+    import naver_data_collector as collector
+
+    # 같은 날 Parquet(100건) 뒤에 CSV(300건)로 다시 수집해도 방금 받은 300건이 반영되어야 함
+    monkeypatch.setattr(collector, "SNAPSHOT_FORMAT", "parquet")
+    assert collector.get_shop_products("런닝화", max_results=100) == 100
+    monkeypatch.setattr(collector, "SNAPSHOT_FORMAT", "csv")
+    assert collector.get_shop_products("런닝화", max_results=300) == 300
+    assert product_history.storage_stats()["products"] == 300
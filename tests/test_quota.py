@@ -0,0 +1,85 @@
+import pytest
+
+import quota
+
+SEARCH_URL = "https://openapi.naver.com/v1/search/shop.json"
+TREND_URL = "https://openapi.naver.com/v1/datalab/shopping/categories"
+
+
+@pytest.fixture
+def limits(workdir, monkeypatch):
+    monkeypatch.setattr(quota, "DAILY_LIMITS", {"search": 100, "datalab": 10})
+    monkeypatch.setattr(quota, "INTERACTIVE_RESERVE", 0.2)
+
+
+@pytest.mark.covers("user-023")
+def test_batch_stops_at_reserve_and_interactive_uses_it(limits):
+    for _ in range(8):
+        quota.consume(TREND_URL, quota.BATCH)
+    with pytest.raises(quota.QuotaExceeded):
+        quota.consume(TREND_URL, quota.BATCH)
+
+    # 예약분은 대시보드 요청만 사용 가능
+    quota.consume(TREND_URL, quota.INTERACTIVE, calls=2)
+    with pytest.raises(quota.QuotaExceeded):
+        quota.consume(TREND_URL, quota.INTERACTIVE)
+
+    usage = quota.usage()
+    assert usage["datalab"] == {"limit": 10, "used": 10, "interactive": 2, "batch": 8,
+                                "remaining": 0, "batch_remaining": 0}
+    # 엔드포인트별 한도는 따로 계산
+    assert usage["search"]["batch_remaining"] == 80
+
+
+@pytest.mark.covers("user-023")
+def test_plan_defers_tasks_beyond_batch_budget(limits):
+    quota.consume(SEARCH_URL, quota.BATCH, calls=70)
+    tasks = [
+        {"kind": "shop", "keyword": "런닝화", "endpoint": "search", "calls": 5, "priority": 1},
+        {"kind": "blog", "keyword": "런닝화", "endpoint": "search", "calls": 6, "priority": 2},
+        {"kind": "trend", "keyword": "런닝화", "endpoint": "datalab", "calls": 1, "priority": 0},
+    ]
+    admitted, deferred = quota.plan(tasks)
+    assert [t["kind"] for t in admitted] == ["trend", "shop"]
+    assert [t["kind"] for t in deferred] == ["blog"]
+
+    # 잔여 배치 한도가 LOW_BUDGET_SHARE 미만이면 우선순위 0만 실행
+    quota.consume(SEARCH_URL, quota.BATCH, calls=2)
+    admitted, deferred = quota.plan(tasks)
+    assert [t["kind"] for t in admitted] == ["trend"]
+    assert quota.budget_low()
+
+
+@pytest.mark.covers("user-023")
+def test_deferred_tasks_are_kept_once_and_popped(limits):
+    task = {"kind": "blog", "keyword": "런닝화", "endpoint": "search", "calls": 1, "priority": 2}
+    quota.defer([task])
+    quota.defer([task])
+    assert quota.pop_deferred() == [task]
+    assert quota.pop_deferred() == []
+
+
+@pytest.mark.covers("user-023")
+def test_collector_requests_are_charged_as_batch(server, limits):
+    import naver_data_collector as collector
+
+    assert collector.get_shop_products("런닝화", max_results=100) == 100
+    assert collector.get_shopping_trend_range("런닝화", "50000008", "2024-01-01", "2024-03-31") is not None
+    usage = quota.usage()
+    assert (usage["search"]["batch"], usage["search"]["interactive"]) == (1, 0)
+    assert (usage["datalab"]["batch"], usage["datalab"]["interactive"]) == (1, 0)
+
+
+@pytest.mark.covers("user-023")
+def test_resume_plan_keeps_only_top_priority_when_budget_is_low(limits):
+    import naver_data_collector as collector
+
+    targets = [{"keyword": kw, "cat_id": "50000008", "start": None, "end": None, "datasets": ("trend", "shop", "blog")}
+               for kw in ("런닝화", "등산화")]
+    assert [t["datasets"] for t in collector.plan_jobs(targets)] == [("trend", "shop", "blog")] * 2
+
+    # 잔여 배치 한도가 LOW_BUDGET_SHARE 미만이면 트렌드(우선순위 0)만 남기고 검색 작업은 다음 실행으로 미룸
+    quota.consume(SEARCH_URL, quota.BATCH, calls=75)
+    planned = collector.plan_jobs(targets)
+    assert [t["datasets"] for t in planned] == [("trend",)] * 2
+    assert [t["keyword"] for t in planned] == ["런닝화", "등산화"]
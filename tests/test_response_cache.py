@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from response_cache import CachedClient, ResponseCache, cache_key
+
+URL = "https://openapi.naver.com/v1/search/shop.json"
+
+
+class CountingClient:
+    """호출 횟수를 응답 본문으로 돌려주는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.calls = 0
+        self.refreshed = threading.Event()
+
+    def fetch_json(self, method, url, params=None, body=None, limiter=None, priority=None):
+        self.calls += 1
+        self.refreshed.set()
+        return {"calls": self.calls, "query": (params or {}).get("query")}
+
+
+def age(cache, key, seconds):
+    with cache._connect() as conn:
+        conn.execute("UPDATE entries SET created = created - ? WHERE key = ?", (seconds, key))
+
+
+@pytest.mark.covers("user-008")
+def test_stale_entry_is_served_while_refreshing(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttls={"/v1/search/shop.json": 60}, stale_window=600)
+    client = CountingClient()
+    cached = CachedClient(client, cache)
+    params = {"query": "런닝화"}
+    assert cached.fetch_json("GET", URL, params=params)["calls"] == 1
+    assert cached.fetch_json("GET", URL, params=params)["calls"] == 1
+
+    # TTL이 지났지만 stale_window 안: 기존 응답을 바로 돌려주고 백그라운드에서 갱신
+    key = cache_key("GET", URL, params)
+    age(cache, key, 120)
+    client.refreshed.clear()
+    assert cached.fetch_json("GET", URL, params=params)["calls"] == 1
+    assert client.refreshed.wait(5)
+    for _ in range(50):
+        if cache.get(key)[0]["calls"] == 2:
+            break
+        time.sleep(0.05)
+    assert cached.fetch_json("GET", URL, params=params)["calls"] == 2
+
+    # stale_window까지 지나면 새로 받아온 응답을 반환
+    age(cache, key, 1000)
+    assert cached.fetch_json("GET", URL, params=params)["calls"] == 3
+
+
+@pytest.mark.covers("user-008")
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+    keys = [cache_key("GET", URL, {"query": f"키워드{i}"}) for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, URL, {"items": ["x" * 50]})
+    with cache._connect() as conn:
+        size = conn.execute("SELECT MAX(size) FROM entries").fetchone()[0]
+        conn.execute("UPDATE entries SET accessed = accessed - 100")
+    cache.get(keys[0])
+
+    # 3개분 용량에서 하나를 더 넣으면 가장 오래 접근하지 않은 항목(keys[1])만 삭제
+    cache.max_bytes = size * 3
+    cache.put(keys[3], URL, {"items": ["x" * 50]}, keywords=["키워드3"])
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+
+    cache.invalidate(["키워드3"])
+    assert cache.get(keys[3]) is None and cache.get(keys[0]) is not None
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+import manifest
+import naver_data_collector as collector
+from data_manager import load_latest
+from snapshot_store import STAGING_DIR
+
+
+@pytest.mark.covers("user-025")
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_streamed_snapshot_round_trip(server, workdir, monkeypatch, fmt):
+    monkeypatch.setattr(collector, "SNAPSHOT_FORMAT", fmt)
+    assert collector.get_blog_posts("런닝화", max_results=200) == 200
+    assert collector.get_shop_products("런닝화", max_results=200) == 200
+
+    if fmt == "csv":
+        # CSV는 원본 API 형식으로 저장되고 정규화는 로드 시 수행
+        on_disk = pd.read_csv(manifest.latest("blog_posts", "런닝화")["path"], dtype=str)
+        assert on_disk["postdate"].str.fullmatch(r"\d{8}").all()
+
+    blog = load_latest("blog_posts", "런닝화")
+    assert blog["postdate"].notna().all()
+    assert pd.api.types.is_datetime64_any_dtype(blog["postdate"])
+    assert not blog["title"].str.contains("<b>").any()
+
+    shop = load_latest("shop_products", "런닝화")
+    # 모의 서버는 브랜드 없는 상품을 빈 문자열로 돌려줌: 결측으로 바뀌지 않아야 함
+    assert shop["brand"].isna().sum() == 0
+    assert (shop["brand"].astype(str) == "").any()
+    assert shop["lprice"].notna().all()
+
+
+@pytest.mark.covers("user-025")
+def test_failed_stream_keeps_previous_snapshot(server, workdir, monkeypatch):
+    monkeypatch.setattr(collector, "SNAPSHOT_FORMAT", "parquet")
+    assert collector.get_blog_posts("스마트워치", max_results=100) == 100
+    server.error_rate = 1.0
+    assert collector.get_blog_posts("스마트워치", max_results=300) is None
+    assert len(load_latest("blog_posts", "스마트워치")) == 100
+    assert not any((workdir / STAGING_DIR).iterdir())
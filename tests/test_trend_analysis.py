@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trend_analysis import ANOMALY_Z, TrendAnalysis
+
+
+@pytest.fixture
+def analysis():
+    """60일째에 수준이 20 -> 60으로 바뀌는 '계단'과 90일째 하루만 튀는 '급등' 시계열"""
+    periods = pd.date_range("2025-01-01", periods=120, freq="D")
+    noise = np.random.default_rng(0).normal(0, 1, (2, len(periods)))
+    step = np.where(np.arange(len(periods)) < 60, 20.0, 60.0) + noise[0]
+    spike = 30.0 + noise[1]
+    spike[90] = 100.0
+    return TrendAnalysis(pd.concat([
+        pd.DataFrame({"period": periods, "ratio": step, "keyword": "계단"}),
+        pd.DataFrame({"period": periods, "ratio": spike, "keyword": "급등"}),
+    ], ignore_index=True)), periods
+
+
+@pytest.mark.covers("user-018")
+def test_change_point_finds_known_step(analysis):
+    trend, periods = analysis
+    point = trend.change_points.loc["계단"]
+    assert point["period"] == periods[60]
+    assert point["before_mean"] == pytest.approx(20, abs=0.5)
+    assert point["shift"] == pytest.approx(40, abs=1)
+
+
+@pytest.mark.covers("user-018")
+def test_zscore_flags_known_spike(analysis):
+    trend, periods = analysis
+    z = trend.zscores["급등"]
+    assert z.idxmax() == periods[90]
+    assert list(z.index[z.abs() >= ANOMALY_Z]) == [periods[90]]
+    assert trend.summary.loc["급등", "anomalies"] == 1
+    assert trend.summary.loc["급등", "peak_period"] == periods[90]
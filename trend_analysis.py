@@ -0,0 +1,116 @@
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from instrumentation import timed
+
+# 주간 비교 및 이상치 판단 기준 구간(일)
+WEEK = 7
+ANOMALY_WINDOW = 28
+ANOMALY_Z = 3.0
+
+
+class TrendAnalysis:
+    """
+    트렌드 데이터(period, ratio, keyword)를 날짜 x 키워드 행렬로 한 번 변환한 뒤
+    정점, 주간 증감, 이상치, 변화 시점을 모든 키워드에 대해 한 번에 계산
+    """
+
+    def __init__(self, df):
+        self.df = df
+
+    @classmethod
+    def of(cls, data):
+        """데이터프레임 또는 TrendAnalysis를 받아 TrendAnalysis로 반환"""
+        return data if isinstance(data, cls) else cls(data)
+
+    @property
+    def empty(self):
+        return self.df.empty
+
+    def __len__(self):
+        return len(self.df)
+
+    # --- 행렬 변환 ---
+    @cached_property
+    @timed("aggregate")
+    def wide(self):
+        """날짜 x 키워드 ratio 행렬 (키워드는 입력 순서 유지, 값이 없는 날은 NaN)"""
+        # pivot_table의 그룹 집계 대신 코드 인덱스로 바로 채움 (같은 날짜/키워드 중복 시 마지막 값)
+        period_codes, periods = pd.factorize(self.df['period'], sort=True)
+        keyword_codes, keywords = pd.factorize(self.df['keyword'])
+        matrix = np.full((len(periods), len(keywords)), np.nan)
+        matrix[period_codes, keyword_codes] = self.df['ratio'].to_numpy(dtype=float)
+        return pd.DataFrame(matrix, index=pd.Index(periods, name='period'),
+                            columns=pd.Index(np.asarray(keywords).astype(str), name='keyword'))
+
+    @cached_property
+    def _filled(self):
+        """구간 통계용으로 결측을 앞/뒤 값으로 채운 행렬"""
+        return self.wide.ffill().bfill()
+
+    # --- 시계열 지표 ---
+    @cached_property
+    @timed("aggregate")
+    def wow_delta(self):
+        """최근 7일 평균 - 직전 7일 평균"""
+        weekly = self.wide.rolling(WEEK, min_periods=1).mean()
+        return weekly - weekly.shift(WEEK)
+
+    @cached_property
+    @timed("aggregate")
+    def zscores(self):
+        """직전 28일 이동 평균/표준편차 대비 z-score (현재 값은 기준 구간에서 제외)"""
+        history = self.wide.shift(1).rolling(ANOMALY_WINDOW, min_periods=WEEK)
+        std = history.std().replace(0, np.nan)
+        return (self.wide - history.mean()) / std
+
+    @cached_property
+    @timed("aggregate")
+    def change_points(self):
+        """
+        키워드별 평균 수준이 가장 크게 바뀌는 한 시점 (누적합 기반 단일 분할, 모든 키워드 동시 계산)
+        분할 전후 평균 차이에 표본 크기 가중치를 곱한 값이 최대인 시점을 선택
+        """
+        values = self._filled.to_numpy(dtype=float)
+        n = len(values)
+        if n < 2:
+            return pd.DataFrame(columns=['period', 'before_mean', 'after_mean', 'shift'],
+                                index=self.wide.columns)
+        csum = np.cumsum(values, axis=0)
+        left = np.arange(1, n)[:, None]
+        before = csum[:-1] / left
+        after = (csum[-1] - csum[:-1]) / (n - left)
+        score = np.abs(after - before) * np.sqrt(left * (n - left) / n)
+        split = np.nanargmax(np.nan_to_num(score, nan=-1.0), axis=0)
+        cols = np.arange(values.shape[1])
+        before_mean, after_mean = before[split, cols], after[split, cols]
+        return pd.DataFrame({'period': self.wide.index[split + 1], 'before_mean': before_mean,
+                             'after_mean': after_mean, 'shift': after_mean - before_mean},
+                            index=self.wide.columns)
+
+    # --- 키워드별 요약 ---
+    @cached_property
+    @timed("aggregate")
+    def latest(self):
+        """키워드별 마지막 값과 직전 값 대비 증감"""
+        filled = self.wide.ffill()
+        current = filled.iloc[-1]
+        previous = filled.iloc[-2] if len(filled) > 1 else current
+        return pd.DataFrame({'current': current, 'delta': (current - previous).fillna(0)})
+
+    @cached_property
+    @timed("aggregate")
+    def summary(self):
+        """키워드별 평균/최고/변동성, 정점 시점, 주간 증감, 이상치 수, 변화 시점"""
+        wide = self.wide
+        return pd.DataFrame({
+            'mean': wide.mean(),
+            'max': wide.max(),
+            'std': wide.std(),
+            'peak_period': wide.idxmax(),
+            'peak_lift': wide.max() / wide.mean() - 1,
+            'wow_delta': self.wow_delta.iloc[-1],
+            'anomalies': (self.zscores.abs() >= ANOMALY_Z).sum(),
+            'change_period': self.change_points['period'],
+            'change_shift': self.change_points['shift'],
+        })
@@ -2,32 +2,84 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from instrumentation import timed
+from shop_analysis import ShopAnalysis
 
 
-def plot_trend_comparison(df):
-    """트렌드 라인 차트 (1/5)"""
+# 전체 포인트 수가 이 값을 넘으면 SVG 대신 WebGL(Scattergl)로 렌더링
+WEBGL_POINT_THRESHOLD = 5000
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링: 시계열 모양(피크/저점)을 보존하는 threshold개 인덱스 반환
+    x, y: 정렬된 1차원 수치 배열
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    # 버킷별 평균점을 한 번에 계산 (i번째 버킷의 다음 버킷 평균 = avg[i + 1], 마지막은 끝점)
+    counts = np.diff(np.append(edges, n - 1))
+    counts[counts == 0] = 1
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts[:-1], x[-1])
+    avg_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts[:-1], y[-1])
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_trend(df, max_points):
+    """키워드별 시계열을 max_points개 이하로 LTTB 다운샘플링"""
+    parts = []
+    for _, series in df.sort_values('period').groupby('keyword', sort=False, observed=True):
+        idx = lttb_indices(series['period'].to_numpy(dtype='datetime64[ns]').astype('int64'),
+                           series['ratio'].to_numpy(), max_points)
+        parts.append(series.iloc[idx])
+    return pd.concat(parts, ignore_index=True)
+
+
+@timed("plot")
+def plot_trend_comparison(df, width_px=1000, raw=False):
+    """
+    트렌드 라인 차트 (1/5)
+    키워드별 포인트를 차트 폭(width_px)에 맞춰 LTTB로 줄이고, 포인트가 많으면 WebGL로 렌더링
+    raw=True이면 원본 해상도 그대로 표시 (확대 구간 등 좁은 범위용)
+    """
     if df.empty: return None
-    fig = px.line(df, x='period', y='ratio', color='keyword',
-                  title='키워드별 쇼핑 검색 트렌드 비교 (2025)',
-                  labels={'ratio': '검색 상대 비율', 'period': '날짜'},
-                  template='plotly_white')
-    fig.update_layout(hovermode='x unified')
+    plotted = df if raw else downsample_trend(df, width_px)
+    trace = go.Scattergl if len(plotted) > WEBGL_POINT_THRESHOLD else go.Scatter
+    fig = go.Figure([trace(x=series['period'], y=series['ratio'], mode='lines', name=str(kw))
+                     for kw, series in plotted.groupby('keyword', sort=False, observed=True)])
+    fig.update_layout(title='키워드별 쇼핑 검색 트렌드 비교', template='plotly_white', hovermode='x unified',
+                      xaxis_title='날짜', yaxis_title='검색 상대 비율', legend_title_text='keyword',
+                      meta={'raw_points': len(df), 'rendered_points': len(plotted)})
     return fig
 
+@timed("plot")
 def plot_price_distribution(df, keyword):
     """가격 분포 히스토그램 (2/5)"""
     if df.empty: return None
-    fig = px.histogram(df, x='lprice', nbins=30,
+    fig = px.histogram(ShopAnalysis.of(df).df, x='lprice', nbins=30,
                        title=f'[{keyword}] 가격 분포 분석',
                        labels={'lprice': '최저가 (원)'},
                        color_discrete_sequence=['#ff7f0e'],
                        template='plotly_white')
     return fig
 
+@timed("plot")
 def plot_brand_share(df, keyword):
     """브랜드 점유율 바 차트 (3/5)"""
     if df.empty: return None
-    brand_counts = df['brand'].value_counts().head(10).reset_index()
+    brand_counts = ShopAnalysis.of(df).brand_counts.head(10).reset_index()
     brand_counts.columns = ['brand', 'count']
     fig = px.bar(brand_counts, x='brand', y='count',
                  title=f'[{keyword}] 상위 10개 브랜드 점유율',
@@ -36,10 +88,11 @@ def plot_brand_share(df, keyword):
                  template='plotly_dark')
     return fig
 
+@timed("plot")
 def plot_category_share(df, keyword):
     """카테고리 구성 파이 차트 (4/5)"""
     if df.empty: return None
-    cat_counts = df['category3'].value_counts().head(5).reset_index()
+    cat_counts = ShopAnalysis.of(df).category_counts.head(5).reset_index()
     cat_counts.columns = ['category', 'count']
     fig = px.pie(cat_counts, values='count', names='category',
                  title=f'[{keyword}] 주요 카테고리 구성 (중분류)',
@@ -47,12 +100,12 @@ def plot_category_share(df, keyword):
                  template='plotly_dark')
     return fig
 
+@timed("plot")
 def plot_brand_price_box(df, keyword):
     """브랜드별 가격 범위 박스 플롯 (5/5)"""
     if df.empty: return None
     # 데이터가 많은 상위 5개 브랜드만 추출
-    top_brands = df['brand'].value_counts().head(5).index
-    filtered_df = df[df['brand'].isin(top_brands)]
+    filtered_df = ShopAnalysis.of(df).top_brand_rows(5)
     fig = px.box(filtered_df, x='brand', y='lprice',
                  title=f'[{keyword}] 주요 브랜드별 가격 범위 (상태 분석)',
                  labels={'lprice': '최저가 (원)', 'brand': '브랜드'},
@@ -62,10 +115,11 @@ def plot_brand_price_box(df, keyword):
 
 # --- 심화 EDA를 위한 추가 시각화 함수 ---
 
+@timed("plot")
 def plot_missing_values(df):
     """컬럼별 결측값 개수 및 비율 시각화 (Bar 2/2)"""
     if df.empty: return None
-    missing_data = df.isnull().sum().reset_index()
+    missing_data = ShopAnalysis.of(df).missing_counts.reset_index()
     missing_data.columns = ['column', 'missing_count']
     missing_data['ratio'] = (missing_data['missing_count'] / len(df)) * 100
     
@@ -78,15 +132,12 @@ def plot_missing_values(df):
     fig.update_traces(textposition='outside')
     return fig
 
+@timed("plot")
 def plot_correlation_heatmap(df):
     """수치형 변수 간 상관관계 분석 (Heatmap 1/2)"""
     # 쇼핑 데이터에서 수치형은 lprice 외에 많지 않으므로 파생 변수 생성
     if df.empty: return None
-    numeric_df = df.copy()
-    numeric_df['title_len'] = numeric_df['title'].str.len()
-    numeric_df['brand_len'] = numeric_df['brand'].astype(str).apply(lambda x: len(x) if x != 'nan' else 0)
-    
-    corr = numeric_df[['lprice', 'title_len', 'brand_len']].corr()
+    corr = ShopAnalysis.of(df).numeric_features.corr()
     
     fig = px.imshow(corr, text_auto=True, aspect="auto",
                     title='주요 수치형 변수 상관관계 (Heatmap 1/2)',
@@ -94,14 +145,11 @@ def plot_correlation_heatmap(df):
                     template='plotly_white')
     return fig
 
+@timed("plot")
 def plot_category_brand_heatmap(df):
     """카테고리 vs 브랜드 빈도 분석 (Heatmap 2/2)"""
     if df.empty: return None
-    top_brands = df['brand'].value_counts().head(8).index
-    top_cats = df['category3'].value_counts().head(8).index
-    
-    filtered = df[df['brand'].isin(top_brands) & df['category3'].isin(top_cats)]
-    pivot = pd.crosstab(filtered['category3'], filtered['brand'])
+    pivot = ShopAnalysis.of(df).category_brand_crosstab(8, 8)
     
     fig = px.imshow(pivot, text_auto=True, aspect="auto",
                     title='카테고리별 브랜드 노출 빈도 (Heatmap 2/2)',
@@ -109,10 +157,12 @@ def plot_category_brand_heatmap(df):
                     template='plotly_white')
     return fig
 
+@timed("plot")
 def plot_mall_price_bar(df):
     """판매처별 평균 가격 비교 (Bar 2/2)"""
     if df.empty: return None
-    mall_stats = df.groupby('mallName')['lprice'].mean().reset_index().sort_values('lprice', ascending=False).head(10)
+    mall_stats = (ShopAnalysis.of(df).mall_price_stats['mean'].rename('lprice').reset_index()
+                  .sort_values('lprice', ascending=False).head(10))
     
     fig = px.bar(mall_stats, x='mallName', y='lprice',
                  title='주요 판매처별 평균가 비교',
@@ -121,3 +171,83 @@ def plot_mall_price_bar(df):
                  color='lprice',
                  color_continuous_scale='Viridis')
     return fig
+
+# --- 키워드 간 시장 비교 (MarketComparison 집계 결과 기반) ---
+
+@timed("plot")
+def plot_market_price_box(comp):
+    """키워드별 가격 범위 비교 (사분위 통계로 그려 원본 행을 차트에 싣지 않음)"""
+    if comp.empty: return None
+    stats = comp.price_stats
+    fig = go.Figure(go.Box(x=stats.index.astype(str), q1=stats['q1'], median=stats['median'], q3=stats['q3'],
+                           lowerfence=stats['min'], upperfence=stats['max'], mean=stats['mean'],
+                           marker_color='#2563eb', name='최저가'))
+    fig.update_layout(title='키워드별 가격 범위 비교', template='plotly_white',
+                      xaxis_title='키워드', yaxis_title='최저가 (원)')
+    return fig
+
+@timed("plot")
+def plot_market_price_histogram(comp):
+    """키워드별 가격 분포 (모든 키워드에 같은 구간을 적용한 상품 비율)"""
+    if comp.empty: return None
+    long = (comp.price_histogram.rename_axis(index='keyword', columns='price')
+            .stack().rename('share').reset_index())
+    fig = px.bar(long, x='price', y='share', color='keyword', barmode='overlay', opacity=0.6,
+                 title='키워드별 가격 분포',
+                 labels={'price': '최저가 구간 (원)', 'share': '상품 비율', 'keyword': '키워드'},
+                 template='plotly_white')
+    fig.update_layout(yaxis_tickformat='.0%')
+    return fig
+
+@timed("plot")
+def plot_market_brand_share(comp, n=5):
+    """키워드별 상위 브랜드 점유율 누적 막대"""
+    if comp.empty: return None
+    share = comp.top_brand_share(n)
+    fig = px.bar(share, x='keyword', y='share', color='brand', text_auto='.0%',
+                 title=f'키워드별 상위 {n}개 브랜드 점유율',
+                 labels={'share': '노출 점유율', 'keyword': '키워드', 'brand': '브랜드'},
+                 template='plotly_white')
+    fig.update_layout(yaxis_tickformat='.0%', barmode='stack')
+    return fig
+
+@timed("plot")
+def plot_market_mall_heatmap(comp, n=10):
+    """키워드 x 주요 판매처 평균가 히트맵"""
+    if comp.empty: return None
+    malls = comp.mall_stats
+    top_malls = malls.groupby('mallName', observed=True)['count'].sum().nlargest(n).index
+    pivot = (malls[malls['mallName'].isin(top_malls)]
+             .pivot_table(index='keyword', columns='mallName', values='mean', observed=True))
+    fig = px.imshow(pivot, text_auto='.0f', aspect='auto',
+                    title='키워드별 주요 판매처 평균가',
+                    labels={'x': '판매처', 'y': '키워드', 'color': '평균 최저가'},
+                    color_continuous_scale='YlGnBu', template='plotly_white')
+    return fig
+
+@timed("plot")
+def plot_market_category_bar(comp, n=8):
+    """키워드별 주요 카테고리(소분류) 상품 수 (막대 위에 평균가 표시)"""
+    if comp.empty: return None
+    cats = comp.category_stats
+    top_cats = cats.groupby('category3', observed=True)['count'].sum().nlargest(n).index
+    top = cats[cats['category3'].isin(top_cats)].copy()
+    top['category3'] = top['category3'].astype(str).replace('', '(미분류)')
+    fig = px.bar(top, x='category3', y='count', color='keyword', barmode='group',
+                 hover_data={'mean': ':,.0f'},
+                 title=f'키워드별 주요 카테고리 상품 수 (상위 {n}개)',
+                 labels={'category3': '카테고리', 'count': '상품 수', 'keyword': '키워드', 'mean': '평균 최저가'},
+                 template='plotly_white')
+    return fig
+
+@timed("plot")
+def plot_market_blog_timeline(comp):
+    """키워드별 주간 블로그 게시물 수 추이"""
+    weekly = comp.blog_weekly
+    if weekly.empty: return None
+    long = weekly.rename_axis(index='week', columns='keyword').stack().rename('posts').reset_index()
+    fig = px.line(long, x='week', y='posts', color='keyword',
+                  title='키워드별 주간 블로그 언급량',
+                  labels={'week': '주', 'posts': '게시물 수', 'keyword': '키워드'},
+                  template='plotly_white')
+    return fig